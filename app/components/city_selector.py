@@ -7,4 +7,13 @@ def city_selector(label, city_names, default_city):
         city_names,
         index=city_names.index(default_city) if default_city in city_names else 0
     )
-    return selected_city
\ No newline at end of file
+    return selected_city
+
+def waypoint_selector(label, city_names, excluded=(), max_waypoints=12):
+    """Componente para escolher as paradas intermediárias de uma rota (até max_waypoints)."""
+    options = [name for name in city_names if name not in excluded]
+    return st.multiselect(
+        label,
+        options,
+        max_selections=max_waypoints
+    )
@@ -588,4 +588,134 @@ def display_graph_visualization(G, cities_df, r=None, d=None):
     
     plt.tight_layout()
     
-    return fig
\ No newline at end of file
+    return fig
+
+
+def isochrone_color(fraction):
+    """Cor de uma fração do orçamento da isócrona: verde (perto) → amarelo → vermelho (limite)."""
+    fraction = min(max(fraction, 0.0), 1.0)
+    red = int(255 * min(1.0, 2 * fraction))
+    green = int(255 * min(1.0, 2 * (1 - fraction)))
+    return f"#{red:02x}{green:02x}00"
+
+
+def display_isochrone_map(geojson, center, title="Cidades alcançáveis"):
+    """
+    Exibe a isócrona de rede como uma única camada GeoJSON: cidades coloridas pela
+    distância (fração do orçamento) e as arestas da árvore de caminhos mínimos.
+    
+    Args:
+        geojson: FeatureCollection gerada por isochrone.isochrone_geojson
+        center: (latitude, longitude) da cidade de origem
+        title: Título a ser exibido no mapa
+        
+    Returns:
+        Objeto mapa do folium
+    """
+    try:
+        m = folium.Map(location=list(center), zoom_start=5, control_scale=True)
+        
+        title_html = f'''
+             <h4 align="center" style="font-size:16px"><b>{title}</b></h4>
+             <p align="center" style="font-size:12px">Cores: verde (perto da origem) → vermelho (limite da distância)</p>
+             '''
+        m.get_root().html.add_child(folium.Element(title_html))
+        
+        def style(feature):
+            color = isochrone_color(feature['properties']['fraction'])
+            if feature['properties']['kind'] == 'tree':
+                return {'color': color, 'weight': 2, 'opacity': 0.6}
+            return {'color': color, 'fillColor': color, 'fillOpacity': 0.9, 'weight': 1}
+        
+        folium.GeoJson(
+            geojson,
+            name="Isócrona",
+            style_function=style,
+            marker=folium.CircleMarker(radius=5),
+            tooltip=folium.GeoJsonTooltip(fields=['city', 'distance'], aliases=['Cidade', 'Distância'],
+                                          localize=True, labels=True)
+            if any(f['properties']['kind'] == 'city' for f in geojson['features']) else None
+        ).add_to(m)
+        
+        folium.Marker(location=list(center), tooltip="Origem",
+                      icon=folium.Icon(color='black', icon='play', prefix='fa')).add_to(m)
+        folium.LayerControl(position='topright', collapsed=False).add_to(m)
+        
+        # Renderizamos o mapa somente se não estivermos em modo de teste
+        try:
+            import inspect
+            caller_module = inspect.currentframe().f_back.f_globals.get('__name__', '')
+            is_test = 'test' in caller_module
+            
+            if not is_test:
+                folium_static(m, width=800, height=600)
+        except Exception:
+            folium_static(m, width=800, height=600)
+        
+        return m
+        
+    except Exception as e:
+        st.error(f"Erro ao criar o mapa: {str(e)}")
+        return None
+
+
+def display_steiner_tree_map(graph, tree, title="Árvore de Steiner"):
+    """
+    Exibe a árvore de Steiner aproximada: arestas da árvore, cidades a conectar
+    (terminais) e cidades intermediárias usadas pela árvore.
+    
+    Args:
+        graph: Grafo NetworkX (coordenadas e nomes das cidades)
+        tree: resultado de steiner_tree.steiner_tree
+        title: Título a ser exibido no mapa
+        
+    Returns:
+        Objeto mapa do folium
+    """
+    try:
+        m = folium.Map(location=[39.8, -98.5], zoom_start=4, control_scale=True)
+        
+        title_html = f'''
+             <h4 align="center" style="font-size:16px"><b>{title}</b></h4>
+             <p align="center" style="font-size:12px">Vermelho: cidades a conectar · Cinza: cidades intermediárias</p>
+             '''
+        m.get_root().html.add_child(folium.Element(title_html))
+        
+        def location(node):
+            return [graph.nodes[node]['latitude'], graph.nodes[node]['longitude']]
+        
+        edges_layer = folium.FeatureGroup(name="Arestas da árvore").add_to(m)
+        for u, v in tree['edges']:
+            weight = graph[u][v]['weight']
+            folium.PolyLine(
+                locations=[location(u), location(v)],
+                color='purple', weight=3, opacity=0.8,
+                tooltip=f"{graph.nodes[u].get('city', u)} – {graph.nodes[v].get('city', v)}: {weight:.2f}"
+            ).add_to(edges_layer)
+        
+        nodes_layer = folium.FeatureGroup(name="Cidades").add_to(m)
+        for nodes, color, radius in ((tree['steiner_nodes'], 'gray', 4), (tree['terminals'], 'red', 6)):
+            for node in nodes:
+                folium.CircleMarker(
+                    location=location(node), radius=radius, color=color, fill=True, fill_opacity=0.9,
+                    tooltip=f"{graph.nodes[node].get('city', node)}, {graph.nodes[node].get('state', '')}"
+                ).add_to(nodes_layer)
+        
+        folium.LayerControl(position='topright', collapsed=False).add_to(m)
+        
+        # Renderizamos o mapa somente se não estivermos em modo de teste
+        try:
+            import inspect
+            caller_module = inspect.currentframe().f_back.f_globals.get('__name__', '')
+            is_test = 'test' in caller_module
+            
+            if not is_test:
+                folium_static(m, width=800, height=600)
+        except Exception:
+            folium_static(m, width=800, height=600)
+        
+        return m
+        
+    except Exception as e:
+        st.error(f"Erro ao criar o mapa: {str(e)}")
+        return None
@@ -17,7 +17,16 @@ from streamlit_option_menu import option_menu
 
 # Local application imports
 from app.components import city_selector, map_display, progress_bar, report_viewer
-from app.utils import data_loader, graph_utils
+from app.utils import data_loader, graph_utils, nearest_targets
+from app.utils.corridor_graph import build_radius_graph, corridor_graph_with_path
+from app.utils.edge_pruning import benchmark_edge_pruning, prune_dominated_edges
+from app.utils.isochrone import isochrone_geojson, reachable_within
+from app.utils.k_shortest import k_shortest_paths
+from app.utils.query_planner import query_planner
+from app.utils.spanner_graph import measure_stretch
+from app.utils.sssp_cache import spt_cache
+from app.utils.steiner_tree import largest_city_per_state, steiner_tree
+from app.utils.state_overlay import state_overlay
 
 
 def app():
@@ -267,6 +276,11 @@ def app():
         - Posição no ranking: {cidade_destino['rank']}
         """)
     
+    # Paradas intermediárias opcionais (usadas no planejamento de rota com paradas)
+    waypoint_names = city_selector.waypoint_selector(
+        "Paradas (até 12 com ordem exata)", city_names, excluded=(start_city, end_city)
+    )
+
     # Calcular distância direta entre origem e destino
     dist_direta = algorithms.calculate_distance_from_df(cities_df, start_city, end_city)
     dist_haversine = graph_utils.calculate_haversine_distance(
@@ -368,6 +382,15 @@ def app():
                 value=st.session_state.use_dijkstra,
                 help="Encontra o caminho de menor distância preferindo cidades menos populosas em caso de empate"
             )
+            use_state_overlay = st.checkbox(
+                "Dijkstra em dois níveis (por estados)",
+                value=False,
+                key="use_state_overlay",
+                disabled=not st.session_state.use_dijkstra,
+                help="Pré-calcula, por estado, as distâncias entre as cidades de fronteira e responde a consulta "
+                     "percorrendo por completo apenas os estados de origem e destino. O resultado é o mesmo do "
+                     "Dijkstra; ao mudar o grafo, só os estados afetados são recalculados."
+            )
             
         # Botão para selecionar todos
         if st.button("Selecionar Todos"):
@@ -483,6 +506,76 @@ def app():
           help="Quando marcado, o slider de distância em km será automaticamente atualizado para corresponder ao valor do raio em graus (1° ≈ 111 km)."
        )
        st.session_state.link_sliders = link_sliders
+
+       # Modo corredor: o grafo inclui apenas as cidades próximas da rota direta
+       use_corridor = st.checkbox(
+          "🛣️ Modo corredor (grafo apenas ao redor da rota direta)",
+          value=False,
+          key="use_corridor",
+          help="Seleciona apenas as cidades dentro de uma faixa ao redor da geodésica entre origem e destino "
+               "(índice espacial) e cria as conexões somente entre elas. Se não houver caminho, a faixa é "
+               "alargada automaticamente. Com a faixa larga o suficiente, o resultado é o mesmo do grafo completo."
+       )
+
+       # Poda de arestas dominadas (desvio por outra cidade tão curto quanto a conexão direta)
+       prune_edges = st.checkbox(
+          "✂️ Remover arestas dominadas",
+          value=False,
+          key="prune_edges",
+          help="Remove a conexão direta u–v quando existe uma cidade w com d(u,w) + d(w,v) ≤ fator × d(u,v). "
+               "Com fator 1.00 a remoção é exata (todas as distâncias mínimas são preservadas), mas em distâncias "
+               "geográficas isso só ocorre com cidades exatamente alinhadas; fatores um pouco maiores removem a "
+               "maior parte das arestas de grafos densos, limitando o alongamento das rotas a esse fator. "
+               "As arestas removidas continuam na visualização do grafo."
+       )
+       prune_stretch = 1.0
+       if prune_edges:
+          prune_stretch = st.slider("Fator de alongamento máximo", min_value=1.0, max_value=1.2,
+                                    value=1.05, step=0.01, key="prune_stretch")
+
+       # Grafo esparso (t-spanner): apenas a cidade mais próxima em cada direção
+       use_spanner = st.checkbox(
+          "🕸️ Grafo esparso (t-spanner de Yao)",
+          value=False,
+          key="use_spanner",
+          help="Em vez de conectar todas as cidades dentro do raio, divide o entorno de cada cidade em setores "
+               "(cones) e conecta apenas a mais próxima de cada setor. O número de arestas passa a crescer "
+               "linearmente com o número de cidades, e as rotas ficam no máximo pelo fator escolhido mais longas "
+               "que no grafo completo. O alongamento medido pode ser exibido junto aos resultados."
+       )
+       spanner_stretch = 1.5
+       measure_spanner = False
+       if use_spanner:
+          spanner_stretch = st.slider("Alongamento máximo do spanner", min_value=1.1, max_value=3.0,
+                                      value=1.5, step=0.1, key="spanner_stretch")
+          measure_spanner = st.checkbox(
+             "Medir o alongamento em relação ao grafo completo",
+             value=False,
+             key="measure_spanner_stretch",
+             help="Constrói também o grafo de raio completo para comparar as distâncias. O resultado é "
+                  "guardado por quantidade de cidades, raio e número de cones."
+          )
+
+       # Conexão pelos k vizinhos mais próximos (grau limitado, independente da densidade)
+       use_knn = st.checkbox(
+          "📍 Conectar pelos k vizinhos mais próximos (kNN)",
+          value=False,
+          key="use_knn",
+          help="Cada cidade é conectada às k cidades mais próximas (índice espacial), em vez de a todas dentro do "
+               "raio. Regiões densas deixam de ter grau explosivo e regiões esparsas continuam conectadas. No modo "
+               "mútuo, a conexão exige que cada cidade esteja entre as k mais próximas da outra (grau máximo k)."
+       )
+       knn_k, knn_mutual, knn_within_radius = 6, False, False
+       if use_knn:
+          knn_k = st.slider("Número de vizinhos (k)", min_value=1, max_value=30, value=6, step=1, key="knn_k")
+          knn_mutual = st.radio("Variante", ["kNN", "kNN mútuo"], horizontal=True, key="knn_variant") == "kNN mútuo"
+          knn_within_radius = st.checkbox(
+             "Respeitar também o limite de raio/distância (kNN ∩ raio)",
+             value=False,
+             key="knn_within_radius",
+             help="Quando desmarcado, os limites r/d abaixo são ignorados e o peso das arestas é a distância "
+                  "angular; quando marcado, só são mantidos os vizinhos que também respeitam os limites."
+          )
        
        # Configuração baseada no tipo de conexão
        col1, col2 = st.columns(2)
@@ -619,6 +712,65 @@ def app():
              # Adicionar nota explicativa quando o slider estiver desativado
              if st.session_state.link_sliders and connection_type == "Ambos":
                 st.caption("⚠️ Slider desativado porque a sincronização está ativa. Ajuste o raio para alterar a distância.")
+    # Parâmetros das consultas complementares exibidas junto com a rota. Ficam fora do
+    # bloco do botão: widgets dentro dele somem (e perdem o valor) no rerun seguinte
+    with st.expander("🧩 Parâmetros das consultas complementares", expanded=False):
+        st.markdown("**🎯 Cidades mais próximas da origem que atendem a um critério**")
+        target_col1, target_col2, target_col3 = st.columns(3)
+        with target_col1:
+            target_min_population = st.number_input("População mínima", min_value=0, value=500000,
+                                                    step=50000, key="target_min_population")
+        with target_col2:
+            target_states = st.multiselect("Estados (opcional)", sorted(cities_df['state'].dropna().unique()),
+                                           key="target_states")
+        with target_col3:
+            target_k = st.slider("Quantidade", min_value=1, max_value=10, value=3, key="target_k")
+
+        st.markdown("**🗺️ Cidades alcançáveis a partir da origem (isócrona)**")
+        iso_budget_km = st.number_input("Distância máxima pela rede (km)", min_value=0.0, value=1000.0,
+                                        step=100.0, key="iso_budget")
+
+        st.markdown("**📈 Comprimento da rota em função do raio de conexão**")
+        sweep_unit = "graus" if connection_type == "Raio em graus (r)" else "km"
+        current_radius = r if sweep_unit == "graus" else d
+        sweep_limit = float(max_theoretical_r if sweep_unit == "graus" else max_theoretical_km)
+        sweep_max = st.number_input(
+            f"Raio máximo da varredura ({sweep_unit})", min_value=float(current_radius),
+            max_value=max(sweep_limit, float(current_radius)),
+            value=min(max(sweep_limit, float(current_radius)), 2.0 * float(current_radius)),
+            key="sweep_max_radius"
+        )
+
+        st.markdown("**🔢 Menor rota com limite de paradas**")
+        max_stops = st.slider("Máximo de cidades intermediárias", min_value=0, max_value=30, value=5,
+                              key="hop_max_stops")
+
+        st.markdown("**🌳 Conectar várias cidades (árvore de Steiner aproximada)**")
+        steiner_preset = st.checkbox("Maior cidade de cada estado", value=True, key="steiner_preset")
+        if not steiner_preset:
+            steiner_names = st.multiselect("Cidades a conectar", city_names,
+                                           default=[start_city, end_city], key="steiner_names")
+
+        st.markdown("**⚙️ Motores de busca: Python x scipy (C)**")
+        compare_search_engines = st.checkbox(
+            "Comparar motores a cada busca",
+            value=False,
+            key="compare_search_engines",
+            help="Executa todos os motores selecionados sobre a mesma consulta; alguns (sobreposição por "
+                 "estados, DFS) têm custo alto na primeira execução."
+        )
+        engine_tasks = {
+            "Menor distância": 'shortest_path',
+            "Menos saltos": 'min_hops',
+            "Maior certeza (fuzzy)": 'max_certainty',
+            "Componentes conexos": 'components'
+        }
+        engine_task = engine_tasks[st.radio("Tarefa", list(engine_tasks), horizontal=True, key="engine_task")]
+        engine_names = st.multiselect(
+            "Motores", algorithms.find_engines(task=engine_task),
+            default=algorithms.find_engines(task=engine_task, certainty='exact'), key=f"engine_names_{engine_task}"
+        )
+
     # Adicionar botão para procurar rota
     col_button = st.columns(3)
     with col_button[1]:
@@ -644,20 +796,60 @@ def app():
             # Atualizar barra de progresso
             progress_bar.progress(10)
             
+            # Grafo completo, esparso (spanner) ou restrito ao corredor da rota direta
+            def build_connectivity_graph(r_build, d_build):
+                corridor_start, corridor_end = name_to_id.get(start_city), name_to_id.get(end_city)
+                if use_knn:
+                    return graph_utils.build_graph(cities_df, r=r_build if knn_within_radius else None,
+                                                   d=d_build if knn_within_radius else None,
+                                                   name_to_id=name_to_id, id_to_name=id_to_name,
+                                                   mode='knn', k=knn_k, mutual=knn_mutual)
+                if use_spanner:
+                    return graph_utils.build_graph(cities_df, r=r_build, d=d_build, name_to_id=name_to_id,
+                                                   id_to_name=id_to_name, mode='yao', stretch=spanner_stretch)
+                if use_corridor and corridor_start is not None and corridor_end is not None:
+                    return corridor_graph_with_path(cities_df, corridor_start, corridor_end, r=r_build, d=d_build,
+                                                    name_to_id=name_to_id, id_to_name=id_to_name)
+                return graph_utils.build_graph(cities_df, r=r_build, d=d_build, name_to_id=name_to_id,
+                                               id_to_name=id_to_name)
+
             # Construir grafo baseado no tipo de conexão selecionado
             if connection_type == "Raio em graus (r)":
-                G = graph_utils.build_graph(cities_df, r=r, name_to_id=name_to_id, id_to_name=id_to_name)
+                G = build_connectivity_graph(r, None)
                 connection_parameter = r
                 connection_unit = "graus"
             elif connection_type == "Distância em km (d)":
                 d_km = d  # Já está em km
-                G = graph_utils.build_graph(cities_df, d=d_km, name_to_id=name_to_id, id_to_name=id_to_name)
+                G = build_connectivity_graph(None, d_km)
                 connection_parameter = d_km
                 connection_unit = "km"
             else:  # Ambos
-                G = graph_utils.build_graph(cities_df, r=r, d=d, name_to_id=name_to_id, id_to_name=id_to_name)
+                G = build_connectivity_graph(r, d)
                 connection_parameter = f"{r} graus / {d} km"
                 connection_unit = "mistos"
+
+            if 'knn' in G.graph:
+                knn_stats = G.graph['knn']
+                st.caption(
+                    f"Conexão kNN{' mútua' if knn_stats['mutual'] else ''} (k={knn_stats['k']}): "
+                    f"grau máximo {knn_stats['max_degree']}, grau médio {knn_stats['mean_degree']:.1f}"
+                )
+
+            if 'corridor' in G.graph:
+                corridor = G.graph['corridor']
+                st.caption(
+                    f"Modo corredor: faixa de {corridor['buffer_km']:.0f} km, "
+                    f"{corridor['cities']} de {corridor['total_cities']} cidades "
+                    f"({corridor['widenings']} alargamentos)"
+                )
+
+            if prune_edges:
+                G = prune_dominated_edges(G, stretch=prune_stretch)
+                pruning_stats = G.graph['edge_pruning']
+                st.caption(
+                    f"Arestas dominadas removidas: {pruning_stats['removed']:,} de {pruning_stats['edges_before']:,} "
+                    f"({pruning_stats['reduction']*100:.1f}%, fator {prune_stretch:.2f})".replace(",", ".")
+                )
             
             # Verificar se as cidades estão no grafo
             start_city_id = name_to_id.get(start_city)
@@ -759,7 +951,10 @@ def app():
                 
             if st.session_state.use_dijkstra:
                 status_text.text("Executando Dijkstra...")
-                dijkstra_result = algorithms.dijkstra_search(G, cities_df, start_id, end_id)
+                if use_state_overlay:
+                    dijkstra_result = algorithms.dijkstra_search(G, cities_df, start_id, end_id, use_overlay=True)
+                else:
+                    dijkstra_result = algorithms.dijkstra_search(G, cities_df, start_id, end_id, use_tree_cache=True)
                 if dijkstra_result and len(dijkstra_result) >= 2:
                     path_ids = dijkstra_result[0]
                     path_names = convert_path_to_names(path_ids)
@@ -797,7 +992,9 @@ def app():
             d_param = d if connection_type in ["Distância em km (d)", "Ambos"] else None
             r_param = r if connection_type in ["Raio em graus (r)", "Ambos"] else None
             
-            fig = map_display.display_graph_visualization(G, cities_df, r=r_param, d=d_param)
+            # Arestas removidas pela poda continuam disponíveis apenas para a visualização
+            display_graph = G.graph.get('full_graph', G)
+            fig = map_display.display_graph_visualization(display_graph, cities_df, r=r_param, d=d_param)
 
                 
             # --- SEÇÃO DE COMPARAÇÃO VISUAL ENTRE ALGORITMOS ---
@@ -822,7 +1019,7 @@ def app():
                 "**Arestas**: Representam conexões diretas possíveis - **Tamanho dos nós**: Proporcional à população da cidade")
                 # Define figure size to match the map dimensions (using the same height/width ratio)
                 graph_fig = map_display.display_graph_visualization(
-                    G, 
+                    display_graph, 
                     cities_df, 
                     r if connection_type in ["Raio em graus (r)", "Ambos"] else None,
                     d if connection_type in ["Distância em km (d)", "Ambos"] else None
@@ -830,9 +1027,9 @@ def app():
                 st.pyplot(graph_fig)
                                
                 st.markdown(f"""
-                - Número de cidades (nós): {len(G.nodes())}
-                - Número de conexões (arestas): {len(G.edges())}
-                - Densidade da rede: {nx.density(G):.4f}
+                - Número de cidades (nós): {len(display_graph.nodes())}
+                - Número de conexões (arestas): {len(display_graph.edges())}
+                - Densidade da rede: {nx.density(display_graph):.4f}
                 """)
                 
             # --- SEÇÃO DE ESTATÍSTICAS COMPARATIVAS ---
@@ -882,6 +1079,309 @@ def app():
             # Mostrar tabela comparativa
             st.table(pd.DataFrame(comparison_data))
 
+            # Planejador adaptativo: o motor exato mais barato para esta consulta
+            planned_path, planned_dist, planned_elapsed, plan = algorithms.planned_search(G, start_id, end_id)
+            if plan is not None:
+                st.caption(
+                    f"Planejador adaptativo: motor **{plan['engine']}** ({plan['reason']}), "
+                    f"{planned_elapsed:.2f} ms"
+                    + (f", distância {planned_dist:.2f}" if planned_path is not None else ", sem rota")
+                )
+                with st.expander("🧠 Histórico do planejador de consultas", expanded=False):
+                    st.table(pd.DataFrame([
+                        {
+                            "Origem": convert_path_to_names([record['start']])[0],
+                            "Destino": convert_path_to_names([record['end']])[0],
+                            "Motor": record['engine'],
+                            "Motivo": record['reason'],
+                            "Tempo": f"{record['ms']:.2f} ms"
+                        }
+                        for record in reversed(list(query_planner.history)[-10:])
+                    ]))
+                    st.caption("Latência média por motor: " + ", ".join(
+                        f"{engine} {entry['mean_ms']:.2f} ms ({entry['queries']} consultas)"
+                        for engine, entry in query_planner.stats().items()
+                    ))
+
+            # Métricas do cache de árvores de caminhos mínimos (usado pelo Dijkstra)
+            if st.session_state.use_dijkstra:
+                cache_stats = spt_cache.stats()
+                st.caption(
+                    f"Cache de árvores (Dijkstra): {cache_stats['entries']} árvores, "
+                    f"{cache_stats['bytes'] / 1024:.1f} KB, taxa de acerto {cache_stats['hit_rate']*100:.1f}% "
+                    f"({cache_stats['hits']} acertos / {cache_stats['misses']} falhas)"
+                )
+                if use_state_overlay:
+                    overlay_stats = state_overlay.stats()
+                    st.caption(
+                        f"Sobreposição por estados: {overlay_stats['states']} estados, "
+                        f"{overlay_stats['border_nodes']} cidades de fronteira, {overlay_stats['shortcuts']} atalhos; "
+                        f"pré-processamento {overlay_stats['preprocess_ms']:.0f} ms "
+                        f"({overlay_stats['cells_built']} estados calculados, "
+                        f"{overlay_stats['cells_reused']} reaproveitados)"
+                    )
+
+            # Rotas alternativas: k menores caminhos simples (Yen com árvores compartilhadas)
+            with st.expander("🔀 Rotas alternativas (5 menores caminhos)", expanded=False):
+                k_start = time.perf_counter()
+                alternatives = k_shortest_paths(G, start_id, end_id, k=5)
+                k_elapsed = (time.perf_counter() - k_start) * 1000
+                st.table(pd.DataFrame([
+                    {
+                        "Rota": i + 1,
+                        "Distância": f"{alt['cost']:.2f}",
+                        "Cidades": len(alt['path']),
+                        "População Total": f"{alt['population']:,}".replace(",", "."),
+                        "Caminho": " → ".join(convert_path_to_names(alt['path']))
+                    }
+                    for i, alt in enumerate(alternatives)
+                ]))
+                st.caption(f"Calculado em {k_elapsed:.2f} ms")
+
+            # Cidades mais próximas da origem que atendem a um critério (uma única busca)
+            with st.expander("🎯 Cidades mais próximas da origem que atendem a um critério", expanded=False):
+                target_predicates = [nearest_targets.population_at_least(target_min_population)]
+                if target_states:
+                    target_predicates.append(nearest_targets.in_state(*target_states))
+                nearest_results, nearest_elapsed = algorithms.nearest_city_search(
+                    G, start_id, nearest_targets.all_of(*target_predicates), k=target_k
+                )
+                if not nearest_results:
+                    st.info("Nenhuma cidade alcançável a partir da origem atende ao critério.")
+                else:
+                    st.table(pd.DataFrame([
+                        {
+                            "Cidade": convert_path_to_names([result['node']])[0],
+                            "Distância": f"{result['distance']:.2f}",
+                            "Cidades no caminho": len(result['path']),
+                            "Caminho": " → ".join(convert_path_to_names(result['path']))
+                        }
+                        for result in nearest_results
+                    ]))
+                st.caption(f"Calculado em {nearest_elapsed:.2f} ms (uma única busca a partir da origem)")
+
+            # Isócrona de rede: cidades alcançáveis a partir da origem dentro de uma distância
+            with st.expander("🗺️ Cidades alcançáveis a partir da origem (isócrona)", expanded=False):
+                # Sem 'd' os pesos do grafo são graus: o orçamento em km vira o ângulo central equivalente
+                iso_budget = iso_budget_km if G.graph.get('d') is not None else float(np.degrees(iso_budget_km / 6371.0))
+                iso_start = time.perf_counter()
+                iso = reachable_within(G, start_id, iso_budget)
+                iso_elapsed = (time.perf_counter() - iso_start) * 1000
+                st.caption(
+                    f"{len(iso)} cidades alcançáveis em {iso_elapsed:.2f} ms "
+                    f"({'árvore do cache' if iso.from_cache else f'busca limitada, {iso.settled} nós estabilizados'})"
+                )
+                map_display.display_isochrone_map(
+                    isochrone_geojson(G, iso),
+                    (G.nodes[start_id]['latitude'], G.nodes[start_id]['longitude']),
+                    f"Alcançáveis a partir de {start_city} em até {iso_budget_km:g} km"
+                )
+
+            # Menor rota em função do raio de conexão (uma varredura em vez de uma busca por raio)
+            with st.expander("📈 Comprimento da rota em função do raio de conexão", expanded=False):
+                breakpoints, sweep_elapsed = algorithms.parametric_radius_search(
+                    cities_df, start_id, end_id, sweep_max, unit=sweep_unit
+                )
+                if not breakpoints:
+                    st.info(f"As cidades não se conectam com raio de até {sweep_max:g} {sweep_unit}.")
+                else:
+                    radii = [point['radius'] for point in breakpoints] + [sweep_max]
+                    lengths = [point['distance'] for point in breakpoints]
+                    fig_sweep, ax_sweep = plt.subplots(figsize=(6, 3))
+                    ax_sweep.step(radii, lengths + [lengths[-1]], where='post', color='purple')
+                    ax_sweep.axvline(current_radius, color='gray', linestyle='--', label='Raio atual')
+                    ax_sweep.set_xlabel(f"Raio de conexão ({sweep_unit})")
+                    ax_sweep.set_ylabel(f"Comprimento da rota ({sweep_unit})")
+                    ax_sweep.set_title(f"{start_city} → {end_city}")
+                    ax_sweep.legend()
+                    plt.tight_layout()
+                    st.pyplot(fig_sweep)
+                    st.table(pd.DataFrame([
+                        {
+                            f"A partir de ({sweep_unit})": f"{point['radius']:.2f}",
+                            "Comprimento": f"{point['distance']:.2f}",
+                            "Cidades": len(point['path']),
+                            "Arestas no grafo": f"{point['edges']:,}".replace(",", ".")
+                        }
+                        for point in breakpoints
+                    ]))
+                    caption = (f"{len(breakpoints)} mudanças de rota calculadas em {sweep_elapsed:.2f} ms "
+                               f"(uma única varredura em ordem crescente de comprimento das arestas)")
+                    if connection_type == "Ambos":
+                        caption += "; varredura apenas pela distância em km"
+                    st.caption(caption)
+
+            # Menor rota com limite de cidades intermediárias (Bellman-Ford em camadas)
+            with st.expander("🔢 Menor rota com limite de paradas", expanded=False):
+                hop_path, hop_dist, hop_elapsed, hop_layers = algorithms.hop_limited_search(
+                    G, start_id, end_id, max_stops
+                )
+                if hop_path is None:
+                    st.info(f"Não há rota entre as cidades selecionadas com até {max_stops} cidades intermediárias.")
+                else:
+                    st.markdown(
+                        f"**Distância:** {hop_dist:.2f} · **Cidades intermediárias:** {len(hop_path) - 2}"
+                    )
+                    st.write(" → ".join(convert_path_to_names(hop_path)))
+                st.caption(f"Calculado em {hop_elapsed:.2f} ms em {len(hop_layers)} camadas")
+                if hop_layers:
+                    st.table(pd.DataFrame([
+                        {
+                            "Camada": layer['layer'],
+                            "Nós expandidos": layer['frontier'],
+                            "Arestas relaxadas": layer['relaxed'],
+                            "Nós melhorados": layer['improved'],
+                            "Tempo": f"{layer['ms']:.2f} ms"
+                        }
+                        for layer in hop_layers
+                    ]))
+
+            # Rota com paradas intermediárias: ordem de visita ótima (Held-Karp) ou 2-opt
+            with st.expander("🧭 Rota com paradas intermediárias", expanded=False):
+                waypoint_ids = [name_to_id.get(name) for name in waypoint_names]
+                if not waypoint_names:
+                    st.info("Escolha ao menos uma parada (abaixo da origem e do destino).")
+                elif any(node is None or node not in G.nodes for node in waypoint_ids):
+                    st.warning("Alguma parada não está no grafo atual (aumente a quantidade de cidades).")
+                else:
+                    plan, plan_elapsed = algorithms.waypoint_search(G, start_id, end_id, waypoint_ids)
+                    if plan is None or plan['path'] is None:
+                        st.warning("Não há rota que passe por todas as paradas com o raio de conexão atual.")
+                    else:
+                        stop_names = convert_path_to_names([start_id] + plan['stops'] + [end_id])
+                        st.markdown(
+                            f"**Ordem de visita{' (ótima)' if plan['exact'] else ' (2-opt)'}:** "
+                            f"{' → '.join(stop_names)} · **Distância total:** {plan['distance']:.2f}"
+                        )
+                        st.table(pd.DataFrame([
+                            {"Trecho": f"{a} → {b}", "Distância": f"{leg:.2f}"}
+                            for a, b, leg in zip(stop_names[:-1], stop_names[1:], plan['legs'])
+                        ]))
+                        timings = plan['timings']
+                        st.caption(
+                            f"Planejado em {plan_elapsed:.2f} ms: distâncias entre paradas "
+                            f"{timings['matrix']:.2f} ms, ordem de visita {timings['order']:.2f} ms, "
+                            f"junção dos trechos {timings['stitch']:.2f} ms"
+                        )
+
+            # Árvore de Steiner aproximada ligando um conjunto de cidades (Mehlhorn)
+            with st.expander("🌳 Conectar várias cidades (árvore de Steiner aproximada)", expanded=False):
+                if steiner_preset:
+                    steiner_terminals = largest_city_per_state(cities_df)
+                else:
+                    steiner_terminals = [name_to_id.get(name) for name in steiner_names]
+                steiner_terminals = [node for node in steiner_terminals if node is not None and node in G.nodes]
+                if len(steiner_terminals) < 2:
+                    st.info("Escolha ao menos duas cidades presentes no grafo atual.")
+                else:
+                    steiner_start = time.perf_counter()
+                    tree = steiner_tree(G, steiner_terminals)
+                    steiner_elapsed = (time.perf_counter() - steiner_start) * 1000
+                    st.markdown(
+                        f"**Custo total:** {tree['cost']:.2f} · **Arestas:** {len(tree['edges'])} · "
+                        f"**Cidades intermediárias:** {len(tree['steiner_nodes'])}"
+                    )
+                    if tree['components'] > 1:
+                        st.warning(f"Com o raio atual, as cidades ficam em {tree['components']} componentes "
+                                   f"desconectados; o resultado é uma floresta.")
+                    timings = tree['timings']
+                    st.caption(
+                        f"Calculado em {steiner_elapsed:.2f} ms: regiões de Voronoi {timings['voronoi']:.2f} ms, "
+                        f"ligações entre regiões {timings['bridges']:.2f} ms, árvore geradora {timings['mst']:.2f} ms, "
+                        f"expansão dos caminhos {timings['expand']:.2f} ms, poda {timings['prune']:.2f} ms"
+                    )
+                    map_display.display_steiner_tree_map(
+                        G, tree, f"Árvore de Steiner ligando {len(tree['terminals'])} cidades"
+                    )
+
+            # Critério lexicográfico exato: menor distância e, no empate, menor população total
+            with st.expander("⚖️ Rota lexicográfica exata (distância, depois população)", expanded=False):
+                lex_path, lex_dist, lex_elapsed, lex_population = algorithms.lexicographic_search(G, start_id, end_id)
+                if lex_path is None:
+                    st.info("Não há rota entre as cidades selecionadas.")
+                else:
+                    st.markdown(
+                        f"**Distância:** {lex_dist:.2f} · **População total da rota:** "
+                        f"{lex_population:,} · **Cidades:** {len(lex_path)}".replace(",", ".")
+                    )
+                    st.write(" → ".join(convert_path_to_names(lex_path)))
+                    st.caption(
+                        f"Calculado em {lex_elapsed:.2f} ms. Os empates de distância (em ponto fixo, "
+                        f"resolução de 0,001) são desfeitos pela população somada de toda a rota."
+                    )
+
+            # Motores registrados: implementações em Python x scipy.sparse.csgraph (C)
+            with st.expander("⚙️ Motores de busca: Python x scipy (C)", expanded=False):
+                if not compare_search_engines:
+                    st.info("Marque 'Comparar motores a cada busca' nos parâmetros das consultas complementares.")
+                elif engine_names:
+                    engine_rows = []
+                    for record in algorithms.compare_engines(G, start_id, end_id, task=engine_task,
+                                                             names=engine_names):
+                        row = {
+                            "Motor": record['engine'],
+                            "Backend": record['backend'],
+                            "Pesos": record['weights'] or "-",
+                            "Desempate": record['tie_break'] or "-",
+                            "Garantia": record['certainty'],
+                            "Tempo": f"{record['ms']:.2f} ms"
+                        }
+                        if engine_task == 'components':
+                            row["Componentes"] = record['components']
+                        else:
+                            row["Distância"] = f"{record['distance']:.2f}"
+                            row["Saltos"] = record['hops'] if record['hops'] is not None else "-"
+                        row["Confere"] = "✅" if record['agrees'] else "❌"
+                        engine_rows.append(row)
+                    st.table(pd.DataFrame(engine_rows))
+                    st.caption("'Confere' compara com o primeiro motor exato da lista. Os motores scipy usam a "
+                               "matriz esparsa exportada da estrutura CSR do grafo (montada uma vez por grafo).")
+
+            # Relatório da poda: redução de arestas e ganho de tempo por algoritmo
+            if prune_edges:
+                with st.expander("✂️ Poda de arestas dominadas: redução e ganho de tempo", expanded=False):
+                    pruning_records = benchmark_edge_pruning(
+                        G.graph['full_graph'], G,
+                        {
+                            "BFS": lambda g, s, e: algorithms.breadth_first_search(g, s, e, log_metrics=False),
+                            "DFS": lambda g, s, e: algorithms.depth_first_search(g, s, e),
+                            "A*": lambda g, s, e: algorithms.a_star_search(g, cities_df, s, e),
+                            "Fuzzy": lambda g, s, e: algorithms.fuzzy_search(g, cities_df, s, e),
+                            "Dijkstra": lambda g, s, e: algorithms.dijkstra_search(g, cities_df, s, e),
+                        },
+                        [(start_id, end_id)]
+                    )
+                    st.table(pd.DataFrame([
+                        {
+                            "Algoritmo": record['algorithm'],
+                            "Arestas (antes → depois)": f"{record['edges_before']} → {record['edges_after']}",
+                            "Tempo grafo completo": f"{record['full_ms']:.2f} ms",
+                            "Tempo grafo podado": f"{record['pruned_ms']:.2f} ms",
+                            "Ganho": f"{record['speedup']:.2f}x"
+                        }
+                        for record in pruning_records
+                    ]))
+
+            # Alongamento medido do spanner em relação ao grafo de raio completo
+            # (só sob demanda: o grafo completo tem O(n²) pares; resultado guardado por cidades, raio e cones)
+            if 'spanner' in G.graph and measure_spanner:
+                stretch_key = (len(cities_df), G.graph['r'], G.graph['d'], G.graph['spanner']['cones'])
+                stretch_cache = st.session_state.setdefault('spanner_stretch_cache', {})
+                if stretch_key not in stretch_cache:
+                    full_graph = build_radius_graph(cities_df, r=G.graph['r'], d=G.graph['d'],
+                                                    name_to_id=name_to_id, id_to_name=id_to_name)
+                    nodes = sorted(G.nodes())
+                    stretch_cache[stretch_key] = measure_stretch(full_graph, G, nodes[::max(1, len(nodes) // 5)])
+                stretch_stats = stretch_cache[stretch_key]
+                edges_spanner, edges_full, pairs = (f"{stretch_stats[key]:,}".replace(",", ".")
+                                                    for key in ('edges_spanner', 'edges_full', 'pairs'))
+                st.caption(
+                    f"Spanner de Yao ({G.graph['spanner']['cones']} cones, alvo {spanner_stretch:.1f}): "
+                    f"{edges_spanner} de {edges_full} arestas; "
+                    f"alongamento medido máximo {stretch_stats['max_stretch']:.3f} e médio "
+                    f"{stretch_stats['mean_stretch']:.3f} em {pairs} pares"
+                )
+
                         # Adicionar um expander para explicar o que é eficiência
             with st.expander("ℹ️ Entendendo a medida de Eficiência"):
                 st.markdown("""
@@ -1062,7 +1562,9 @@ def app():
                 'connection_type': connection_type,
                 'connection_parameter': connection_parameter,
                 'connection_unit': connection_unit,
-                'algorithms': {}
+                'algorithms': {},
+                'planner': {'engine': plan['engine'], 'reason': plan['reason'], 'elapsed_time': plan['ms']}
+                if plan is not None else None
             }
             
             for algo, resultado in results.items():
@@ -1100,6 +1602,9 @@ def app():
                         st.markdown(f"#### Busca {i+1}: {search['start_city']} → {search['end_city']} ({search['timestamp']})")
                         st.write(f"**Tipo de conexão**: {search['connection_type']}")
                         st.write(f"**Parâmetro de conexão**: {search['connection_parameter']} {search['connection_unit']}")
+                        if search.get('planner'):
+                            st.write(f"**Planejador**: {search['planner']['engine']} "
+                                     f"({search['planner']['elapsed_time']:.2f} ms)")
                         
                         # Mostrar resultados resumidos para cada algoritmo
                         for alg_name, alg_results in search['algorithms'].items():
@@ -177,6 +177,20 @@ class TestAStarAlgorithm(unittest.TestCase):
             print(f"Não existe caminho entre {self.city1_name} e {self.city2_name} no grafo. Teste ignorado.")
             self.skipTest("Não existe caminho entre as cidades selecionadas no grafo")
     
+    def test_a_star_optimality_angular_weights(self):
+        """
+        Com apenas r, os pesos são distâncias em graus: a heurística padrão deve
+        usar a mesma unidade e o A* continuar ótimo.
+        """
+        df, _, _ = load_data(os.path.join(project_root, 'data', 'cities.json'))
+        graph = build_graph(df.head(300), r=4.0)
+        self.assertIsNone(graph.graph['d'])
+        component = sorted(max(nx.connected_components(graph), key=len))
+        for start, end in zip(component[:15], reversed(component[-15:])):
+            _, total_dist, _ = a_star_search(graph, None, start, end)
+            self.assertAlmostEqual(total_dist, nx.shortest_path_length(graph, start, end, weight='weight'),
+                                   places=9)
+    
     def test_a_star_performance(self):
         """
         Testa o desempenho do algoritmo A* em comparação com o algoritmo de caminho mais curto do NetworkX.
@@ -0,0 +1,134 @@
+import sys
+import os
+import unittest
+import networkx as nx
+import numpy as np
+
+# Adiciona o diretório raiz do projeto ao caminho do Python
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, '../..'))
+sys.path.append(project_root)
+
+from app.utils.data_loader import load_data
+from app.utils.graph_utils import build_graph
+from app.utils.graph_arrays import get_graph_arrays
+from app.utils.bfs_engine import (
+    ParallelFrontierExpander,
+    benchmark_parallel_expansion,
+    calibrated_parallel_threshold,
+    frontier_expander,
+    level_synchronous_bfs,
+    min_hop_parents,
+    min_hop_path,
+    suggest_parallel_threshold,
+)
+from app.utils.algorithms import breadth_first_search
+
+
+class TestBFSEngine(unittest.TestCase):
+    """
+    Verifica a BFS sincronizada por nível (top-down/bottom-up) contra o NetworkX.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cities_path = os.path.join(project_root, 'data', 'cities.json')
+        cls.df, cls.name_to_id, cls.id_to_name = load_data(cities_path)
+        cls.df = cls.df.head(300)
+        cls.graph = build_graph(cls.df, r=3.0)
+        cls.arrays = get_graph_arrays(cls.graph)
+
+    def test_hops_match_networkx(self):
+        """As distâncias em saltos devem coincidir com as do NetworkX para todos os nós."""
+        source = self.arrays.index[0]
+        hops, stats = level_synchronous_bfs(self.arrays, source)
+        expected = nx.single_source_shortest_path_length(self.graph, 0)
+        for node, i in self.arrays.index.items():
+            self.assertEqual(hops[i], expected.get(node, -1))
+        self.assertEqual(stats['visited'], len(expected))
+
+    def test_both_directions_used_on_dense_graph(self):
+        """Em um grafo denso, a heurística de Beamer deve acionar a expansão bottom-up."""
+        dense = get_graph_arrays(build_graph(self.df, r=15.0))
+        hops, stats = level_synchronous_bfs(dense, 0)
+        self.assertIn('bottom-up', stats['directions'])
+        expected = nx.single_source_shortest_path_length(build_graph(self.df, r=15.0), 0)
+        self.assertEqual(int((hops >= 0).sum()), len(expected))
+
+    def test_parents_prefer_less_populous(self):
+        """O pai de cada nó está no nível anterior e é o vizinho menos populoso desse nível."""
+        hops, _ = level_synchronous_bfs(self.arrays, 0)
+        parents = min_hop_parents(self.arrays, hops)
+        for child in np.flatnonzero(hops > 0):
+            parent = parents[child]
+            self.assertEqual(hops[parent], hops[child] - 1)
+            neighbors = self.arrays.indices[self.arrays.indptr[child]:self.arrays.indptr[child + 1]]
+            candidates = neighbors[hops[neighbors] == hops[child] - 1]
+            self.assertEqual(self.arrays.population[parent], self.arrays.population[candidates].min())
+
+        reachable = np.flatnonzero(hops > 0)
+        target = int(reachable[-1])
+        path = min_hop_path(self.arrays, hops, 0, target)
+        self.assertEqual(len(path) - 1, hops[target])
+        self.assertEqual(path[-2], parents[target])
+
+    def test_breadth_first_search_min_hops(self):
+        """breadth_first_search deve retornar uma rota com o menor número de saltos."""
+        lengths = nx.single_source_shortest_path_length(self.graph, 0)
+        start, end = 0, max(lengths, key=lengths.get)
+        path, total_dist, elapsed_time, info = breadth_first_search(self.graph, start, end, log_metrics=False)
+        self.assertEqual(path[0], start)
+        self.assertEqual(path[-1], end)
+        self.assertEqual(len(path) - 1, nx.shortest_path_length(self.graph, start, end))
+        self.assertEqual(info['hops'][end], len(path) - 1)
+        self.assertGreater(total_dist, 0)
+
+    def test_parallel_expansion_matches_sequential(self):
+        """A expansão particionada entre processos deve produzir os mesmos saltos."""
+        dense = get_graph_arrays(build_graph(self.df, r=15.0))
+        expected, _ = level_synchronous_bfs(dense, 0)
+        with ParallelFrontierExpander(dense, threads=2, parallel_threshold=1) as expander:
+            hops, _ = level_synchronous_bfs(dense, 0, expander=expander)
+            self.assertGreater(expander.parallel_calls, 0)
+        np.testing.assert_array_equal(hops, expected)
+
+    def test_speedup_records(self):
+        """O benchmark deve registrar uma medida por tamanho de fronteira e nº de processos."""
+        records = benchmark_parallel_expansion(self.arrays, [10, 100], threads_options=(2,), repeats=1)
+        self.assertEqual(len(records), 2)
+        for record in records:
+            self.assertGreater(record['speedup'], 0)
+        threshold = suggest_parallel_threshold(records)
+        self.assertTrue(threshold is None or threshold in (10, 100))
+
+    def test_expander_reused_and_threshold_calibrated(self):
+        """O expansor é criado uma vez por grafo e o limiar vem da curva medida."""
+        self.assertIs(frontier_expander(self.arrays, 2), frontier_expander(self.arrays, 2))
+        threshold, records = calibrated_parallel_threshold(self.arrays, 2)
+        self.assertEqual(threshold, suggest_parallel_threshold(records))
+        self.assertEqual(max(record['frontier_size'] for record in records), self.arrays.n)
+        self.assertIs(calibrated_parallel_threshold(self.arrays, 2)[1], records)
+
+        lengths = nx.single_source_shortest_path_length(self.graph, 0)
+        end = max(lengths, key=lengths.get)
+        expander = frontier_expander(self.arrays, 2)
+        calls = expander.parallel_calls
+        for _ in range(2):
+            path, _, _, _ = breadth_first_search(self.graph, 0, end, threads=2, parallel_threshold=1,
+                                                 log_metrics=False)
+            self.assertEqual(len(path) - 1, lengths[end])
+        self.assertGreater(expander.parallel_calls, calls)
+        self.assertIs(frontier_expander(self.arrays, 2), expander)
+
+        # Sem limiar explícito a busca é sequencial (sem calibração nem processos)
+        calls = expander.parallel_calls
+        path, _, _, _ = breadth_first_search(self.graph, 0, end, threads=2, log_metrics=False)
+        self.assertEqual(len(path) - 1, lengths[end])
+        self.assertEqual(expander.parallel_calls, calls)
+        path, _, _, _ = breadth_first_search(self.graph, 0, end, threads=2, parallel_threshold='auto',
+                                             log_metrics=False)
+        self.assertEqual(len(path) - 1, lengths[end])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import sys
+import os
+import unittest
+import networkx as nx
+import numpy as np
+
+# Adiciona o diretório raiz do projeto ao caminho do Python
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, '../..'))
+sys.path.append(project_root)
+
+from app.utils.data_loader import load_data
+from app.utils.graph_utils import build_graph, haversine_distances
+from app.utils.corridor_graph import (
+    EARTH_RADIUS_KM,
+    build_corridor_graph,
+    corridor_candidates,
+    corridor_graph_with_path,
+    unit_vectors,
+)
+from app.utils.algorithms import a_star_search, dijkstra_search
+
+
+class TestCorridorGraph(unittest.TestCase):
+    """
+    Verifica o grafo restrito ao corredor da geodésica origem–destino.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cities_path = os.path.join(project_root, 'data', 'cities.json')
+        cls.df, cls.name_to_id, cls.id_to_name = load_data(cities_path)
+        cls.df = cls.df.head(300)
+        cls.graph = build_graph(cls.df, r=4.0, d=400)
+        component = sorted(nx.node_connected_component(cls.graph, 0))
+        cls.start, cls.end = component[0], component[-1]
+
+    def test_full_corridor_matches_build_graph(self):
+        """Com um corredor que cobre todas as cidades, o grafo é idêntico ao de build_graph."""
+        G = build_corridor_graph(self.df, self.start, self.end, r=4.0, d=400, buffer_km=np.pi * EARTH_RADIUS_KM)
+        self.assertEqual(list(G.nodes()), list(self.graph.nodes()))
+        self.assertEqual(sorted(G.edges()), sorted(self.graph.edges()))
+        for u, v, data in self.graph.edges(data=True):
+            self.assertEqual(G[u][v], data)
+        for search in (lambda g: a_star_search(g, {}, self.start, self.end),
+                       lambda g: dijkstra_search(g, self.df, self.start, self.end)):
+            self.assertEqual(search(G)[0], search(self.graph)[0])
+
+    def test_candidates_within_buffer(self):
+        """Exatamente as cidades a até buffer_km de algum ponto do arco são selecionadas."""
+        buffer_km = 150.0
+        selected = corridor_candidates(self.df, self.start, self.end, buffer_km)
+        self.assertIn(self.start, set(selected['city_id']))
+        self.assertIn(self.end, set(selected['city_id']))
+        rows = self.df.set_index('city_id')
+        a, b = rows.loc[self.start], rows.loc[self.end]
+        # Amostragem densa da geodésica (interpolação esférica) como referência
+        pa, pb = unit_vectors([a['latitude'], b['latitude']], [a['longitude'], b['longitude']])
+        arc = np.arccos(np.clip(pa @ pb, -1, 1))
+        t = np.linspace(0, 1, 2000)[:, None]
+        arc_points = (np.sin((1 - t) * arc) * pa + np.sin(t * arc) * pb) / np.sin(arc)
+        lat = np.degrees(np.arcsin(arc_points[:, 2]))
+        lon = np.degrees(np.arctan2(arc_points[:, 1], arc_points[:, 0]))
+        inside = self.df[self.df['city_id'].isin(selected['city_id'])]
+        for _, row in inside.iterrows():
+            self.assertLessEqual(haversine_distances(row['latitude'], row['longitude'], lat, lon).min(),
+                                 buffer_km + 1.0)
+        outside = self.df[~self.df['city_id'].isin(selected['city_id'])]
+        for _, row in outside.iterrows():
+            self.assertGreater(haversine_distances(row['latitude'], row['longitude'], lat, lon).min(),
+                               buffer_km - 1.0)
+
+    def test_endpoint_outside_subset_gives_empty_graph(self):
+        """Origem fora das cidades usadas: grafo vazio (cidade isolada), sem KeyError."""
+        outside = int(self.df['city_id'].max()) + 1  # cidade do conjunto completo, fora das 300 usadas
+        for G in (corridor_graph_with_path(self.df, self.start, outside, r=4.0, d=400),
+                  build_corridor_graph(self.df, outside, self.end, r=4.0, d=400)):
+            self.assertEqual(G.number_of_nodes(), 0)
+            self.assertNotIn(outside, G)
+            self.assertEqual(G.graph['corridor']['cities'], 0)
+        self.assertFalse(corridor_graph_with_path(self.df, outside, self.end, d=400).graph['corridor']['has_path'])
+
+    def test_widening_finds_path(self):
+        """Um corredor estreito demais é alargado até existir caminho."""
+        G = corridor_graph_with_path(self.df, self.start, self.end, r=4.0, d=400, buffer_km=20.0)
+        self.assertTrue(nx.has_path(G, self.start, self.end))
+        self.assertGreater(G.graph['corridor']['widenings'], 0)
+        self.assertLess(G.number_of_nodes(), self.graph.number_of_nodes())
+        _, cost, _ = a_star_search(G, {}, self.start, self.end)
+        _, full_cost, _ = a_star_search(self.graph, {}, self.start, self.end)
+        self.assertGreaterEqual(cost, full_cost - 1e-9)
+
+
+if __name__ == "__main__":
+    unittest.main()
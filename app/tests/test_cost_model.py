@@ -0,0 +1,83 @@
+import sys
+import os
+import unittest
+import networkx as nx
+
+# Adiciona o diretório raiz do projeto ao caminho do Python
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, '../..'))
+sys.path.append(project_root)
+
+from app.utils.data_loader import load_data
+from app.utils.graph_utils import build_graph
+from app.utils.graph_arrays import get_graph_arrays
+from app.utils.cost_model import get_edge_cost_model, node_penalties
+from app.utils.algorithms import a_star_search
+
+
+class TestCostModel(unittest.TestCase):
+    """
+    Verifica a compilação das penalidades por cidade em custos por aresta e o A* com elas.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cities_path = os.path.join(project_root, 'data', 'cities.json')
+        cls.df, cls.name_to_id, cls.id_to_name = load_data(cities_path)
+        cls.df = cls.df.head(150).copy()
+        cls.graph = build_graph(cls.df, d=500)
+        cls.nodes = list(cls.graph.nodes())
+
+    def _penalized_df(self):
+        df = self.df.copy()
+        df['criminalidade'] = [(i % 7) * 10.0 for i in range(len(df))]
+        df['infraestrutura_ruim'] = [(i % 3) * 5.0 for i in range(len(df))]
+        df.loc[df.index[0], 'criminalidade'] = -50.0
+        return df
+
+    def test_penalties_from_dataframe_and_dict(self):
+        arrays = get_graph_arrays(self.graph)
+        self.assertFalse(node_penalties(arrays, self.df).any())
+
+        df = self._penalized_df()
+        penalties = node_penalties(arrays, df)
+        by_id = dict(zip(df['city_id'], df['criminalidade'] + df['infraestrutura_ruim']))
+        for node, value in zip(arrays.nodes, penalties):
+            self.assertEqual(value, max(by_id[node], 0.0))
+
+        as_dict = {node: {'criminalidade': by_id[node]} for node in self.nodes}
+        self.assertTrue((node_penalties(arrays, as_dict) == penalties).all())
+
+    def test_compiled_costs(self):
+        df = self._penalized_df()
+        model = get_edge_cost_model(self.graph, df)
+        self.assertIs(get_edge_cost_model(self.graph, df), model)
+        arrays = model.arrays
+        for u in range(0, arrays.n, 10):
+            for pos in range(arrays.indptr[u], arrays.indptr[u + 1]):
+                v = arrays.indices[pos]
+                self.assertEqual(model.costs[pos], arrays.weights[pos] + model.penalties[v])
+        # Sem penalidades, os custos são os próprios pesos
+        self.assertIs(get_edge_cost_model(self.graph, self.df).costs, arrays.weights)
+
+    def test_astar_matches_reference_cost(self):
+        """A* com o modelo compilado = Dijkstra do NetworkX com o mesmo custo por aresta."""
+        df = self._penalized_df()
+        penalties = dict(zip(get_graph_arrays(self.graph).nodes, get_edge_cost_model(self.graph, df).penalties))
+        start = self.nodes[0]
+        for end in self.nodes[5::30]:
+            path, cost, _ = a_star_search(self.graph, df, start, end)
+            if not nx.has_path(self.graph, start, end):
+                self.assertIsNone(path)
+                continue
+            expected = nx.dijkstra_path_length(self.graph, start, end,
+                                               weight=lambda u, v, data: data['weight'] + penalties[v])
+            self.assertAlmostEqual(cost, expected, places=6)
+
+            # Custo customizado continua disponível e ignora as penalidades compiladas
+            _, plain_cost, _ = a_star_search(self.graph, df, start, end, cost_fn=lambda u, v, data: data['weight'])
+            self.assertAlmostEqual(plain_cost, nx.dijkstra_path_length(self.graph, start, end), places=6)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import sys
+import os
+import unittest
+import networkx as nx
+
+# Adiciona o diretório raiz do projeto ao caminho do Python
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, '../..'))
+sys.path.append(project_root)
+
+from app.utils.data_loader import load_data
+from app.utils.graph_utils import build_graph
+from app.utils.edge_pruning import benchmark_edge_pruning, prune_dominated_edges
+from app.utils.algorithms import a_star_search
+
+
+class TestEdgePruning(unittest.TestCase):
+    """
+    Verifica a remoção de arestas dominadas e a preservação das distâncias.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cities_path = os.path.join(project_root, 'data', 'cities.json')
+        cls.df, cls.name_to_id, cls.id_to_name = load_data(cities_path)
+        cls.df = cls.df.head(150)
+        cls.graph = build_graph(cls.df, d=1500)
+
+    def _assert_distances(self, graph, pruned, factor):
+        for source in list(graph.nodes())[:20]:
+            full = nx.single_source_dijkstra_path_length(graph, source)
+            reduced = nx.single_source_dijkstra_path_length(pruned, source)
+            self.assertEqual(full.keys(), reduced.keys())
+            for node, dist in full.items():
+                self.assertLessEqual(reduced[node], dist * factor + 1e-9)
+                self.assertGreaterEqual(reduced[node], dist - 1e-9)
+
+    def test_exact_removal(self):
+        """Arestas com desvio de mesmo custo ou menor são removidas; desvios por peso zero não contam."""
+        G = nx.Graph()
+        G.add_edge('a', 'b', weight=1.0)
+        G.add_edge('b', 'c', weight=1.0)
+        G.add_edge('a', 'c', weight=2.0)
+        G.add_edge('c', 'd', weight=1.5)
+        G.add_edge('e', 'f', weight=0.0)
+        G.add_edge('e', 'g', weight=5.0)
+        G.add_edge('f', 'g', weight=5.0)
+        pruned = prune_dominated_edges(G)
+        self.assertFalse(pruned.has_edge('a', 'c'))
+        self.assertTrue(pruned.has_edge('e', 'g') and pruned.has_edge('f', 'g'))
+        self.assertEqual(pruned.graph['edge_pruning']['removed'], 1)
+        self.assertIs(pruned.graph['full_graph'], G)
+        self._assert_distances(G, pruned, 1.0)
+
+    def test_exact_preserves_geometric_distances(self):
+        """No grafo geométrico, a remoção exata preserva todas as distâncias mínimas."""
+        pruned = prune_dominated_edges(self.graph)
+        self._assert_distances(self.graph, pruned, 1.0)
+
+    def test_stretch_bounds_distances(self):
+        """Com fator 1.05, a maior parte das arestas some e as distâncias crescem no máximo 5%."""
+        pruned = prune_dominated_edges(self.graph, stretch=1.05)
+        self.assertGreater(pruned.graph['edge_pruning']['reduction'], 0.5)
+        self._assert_distances(self.graph, pruned, 1.05)
+
+        records = benchmark_edge_pruning(
+            self.graph, pruned, {'A*': lambda g, s, e: a_star_search(g, {}, s, e)}, [(0, 100)]
+        )
+        self.assertEqual(records[0]['edges_after'], pruned.number_of_edges())
+        self.assertGreater(records[0]['speedup'], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
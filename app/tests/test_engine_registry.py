@@ -0,0 +1,85 @@
+import sys
+import os
+import unittest
+import networkx as nx
+
+# Adiciona o diretório raiz do projeto ao caminho do Python
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, '../..'))
+sys.path.append(project_root)
+
+from app.utils.data_loader import load_data
+from app.utils.graph_utils import build_graph
+from app.utils import algorithms
+
+
+class TestEngineRegistry(unittest.TestCase):
+    """
+    Verifica o registro de motores e o backend scipy.sparse.csgraph contra as
+    implementações em Python.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cities_path = os.path.join(project_root, 'data', 'cities.json')
+        cls.df, cls.name_to_id, cls.id_to_name = load_data(cities_path)
+        cls.df = cls.df.head(300)
+        cls.graph = build_graph(cls.df, d=300)
+        cls.component = sorted(max(nx.connected_components(cls.graph), key=len))
+        cls.pairs = [(cls.component[i], cls.component[-1 - i]) for i in range(5)]
+
+    def test_capabilities_and_selection(self):
+        scipy_engines = algorithms.find_engines(backend='scipy')
+        self.assertEqual(set(scipy_engines), {'scipy_dijkstra', 'scipy_bfs', 'scipy_components'})
+        self.assertIn('scipy_dijkstra', algorithms.find_engines(task='shortest_path', certainty='exact'))
+        self.assertNotIn('dijkstra_bidirectional', algorithms.find_engines(certainty='exact'))
+        self.assertEqual(algorithms.ENGINE_REGISTRY['dijkstra'].tie_break, 'population')
+        self.assertFalse(algorithms.ENGINE_REGISTRY['scipy_components'].path_recovery)
+        with self.assertRaises(ValueError):
+            algorithms.run_engine('inexistente', self.graph, *self.pairs[0])
+
+    def test_scipy_dijkstra_matches_python(self):
+        for start, end in self.pairs:
+            expected = nx.dijkstra_path_length(self.graph, start, end)
+            (path, dist), elapsed = algorithms.run_engine('scipy_dijkstra', self.graph, start, end)
+            self.assertAlmostEqual(dist, expected, places=6)
+            self.assertEqual((path[0], path[-1]), (start, end))
+            self.assertAlmostEqual(nx.path_weight(self.graph, path, 'weight'), expected, places=6)
+            records = algorithms.compare_engines(self.graph, start, end,
+                                                 names=['dijkstra', 'a_star', 'scipy_dijkstra'])
+            self.assertTrue(all(record['agrees'] for record in records))
+
+    def test_scipy_bfs_matches_python(self):
+        for start, end in self.pairs:
+            (path, dist), _ = algorithms.run_engine('scipy_bfs', self.graph, start, end)
+            self.assertEqual(len(path) - 1, nx.shortest_path_length(self.graph, start, end))
+            self.assertAlmostEqual(dist, nx.path_weight(self.graph, path, 'weight'), places=6)
+            records = algorithms.compare_engines(self.graph, start, end, task='min_hops')
+            self.assertTrue(all(record['agrees'] for record in records))
+
+    def test_dfs_and_fuzzy_engines(self):
+        self.assertEqual(algorithms.ENGINE_REGISTRY['dfs'].certainty, 'approximate')
+        self.assertEqual(algorithms.find_engines(task='max_certainty', certainty='exact'), ['fuzzy'])
+        for start, end in self.pairs[:2]:
+            (path, dist), _ = algorithms.run_engine('dfs', self.graph, start, end)
+            self.assertEqual((path[0], path[-1]), (start, end))
+            self.assertGreaterEqual(dist, nx.dijkstra_path_length(self.graph, start, end) - 1e-6)
+            records = algorithms.compare_engines(self.graph, start, end, task='max_certainty')
+            self.assertEqual([record['engine'] for record in records], ['fuzzy', 'fuzzy_bidirectional'])
+            expected = algorithms.fuzzy_search(self.graph, None, start, end, d=300, method='exact')
+            self.assertAlmostEqual(records[0]['distance'], expected[1], places=6)
+
+    def test_components_and_missing_route(self):
+        records = algorithms.compare_engines(self.graph, task='components')
+        expected = nx.number_connected_components(self.graph)
+        self.assertTrue(all(record['components'] == expected and record['agrees'] for record in records))
+        isolated = next((node for node in self.graph if node not in set(self.component)), None)
+        if isolated is not None:
+            for name in ('scipy_dijkstra', 'scipy_bfs'):
+                (path, dist), _ = algorithms.run_engine(name, self.graph, self.component[0], isolated)
+                self.assertIsNone(path)
+                self.assertEqual(dist, float('inf'))
+
+
+if __name__ == '__main__':
+    unittest.main()
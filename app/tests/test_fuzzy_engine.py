@@ -0,0 +1,149 @@
+import sys
+import os
+import unittest
+import networkx as nx
+import numpy as np
+
+# Adiciona o diretório raiz do projeto ao caminho do Python
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, '../..'))
+sys.path.append(project_root)
+
+from app.utils.data_loader import load_data
+from app.utils.graph_utils import build_graph
+from app.utils.fuzzy_engine import (
+    DEFAULT_FUZZY_PARAMS,
+    get_fuzzy_edge_model,
+    get_widest_path_oracle,
+    membership_values,
+)
+from app.utils.algorithms import fuzzy_search
+
+
+class TestFuzzyEngine(unittest.TestCase):
+    """
+    Verifica as certezas fuzzy pré-calculadas por aresta e a busca fuzzy que as utiliza.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cities_path = os.path.join(project_root, 'data', 'cities.json')
+        cls.df, cls.name_to_id, cls.id_to_name = load_data(cities_path)
+        cls.df = cls.df.head(200)
+        cls.graph = build_graph(cls.df, r=5.0)
+
+    def test_membership_matches_scalar_rule(self):
+        """A pertinência vetorizada deve seguir a mesma regra por faixas da versão escalar."""
+        params = DEFAULT_FUZZY_PARAMS
+        max_distance = 5.0
+        distances = np.array([0.5, 5.0 / 3, 2.0, 4.9, 5.0, 7.0])
+        values = membership_values(distances, max_distance, params['alpha'],
+                                   params['min_certainty'], params['decay_factor'])
+        for dist, value in zip(distances, values):
+            if dist <= max_distance / params['alpha']:
+                expected = 1.0
+            elif dist >= max_distance:
+                expected = params['min_certainty']
+            else:
+                expected = 1.0 - (dist / max_distance) * params['decay_factor']
+            self.assertAlmostEqual(value, expected)
+
+    def test_model_cached_per_parameters(self):
+        """O modelo é calculado uma vez por grafo e conjunto de parâmetros."""
+        model = get_fuzzy_edge_model(self.graph, r=5.0)
+        self.assertIs(model, get_fuzzy_edge_model(self.graph, r=5.0))
+        self.assertIsNot(model, get_fuzzy_edge_model(self.graph, r=5.0, params={'alpha': 2.0}))
+        self.assertEqual(len(model.certainty), len(model.arrays.indices))
+
+    def test_fuzzy_search_certainty_is_path_minimum(self):
+        """A certeza retornada é a menor certeza entre as arestas do caminho."""
+        start, end = 0, 1
+        if not nx.has_path(self.graph, start, end):
+            self.skipTest("Cidades não conectadas no grafo de teste")
+        path, total_dist, elapsed_time, certainty = fuzzy_search(self.graph, self.df, start, end, r=5.0)
+        self.assertEqual(path[0], start)
+        self.assertEqual(path[-1], end)
+        model = get_fuzzy_edge_model(self.graph, r=5.0)
+        arrays = model.arrays
+        edge_certainties = [
+            model.certainty[arrays.edge_position(arrays.index[u], arrays.index[v])]
+            for u, v in zip(path, path[1:])
+        ]
+        self.assertAlmostEqual(certainty, min(edge_certainties))
+
+    def test_default_method_matches_original_search(self):
+        """O método padrão continua sendo a busca bidirecional original (rotas e certezas fixadas)."""
+        expected = {
+            (0, 1): ([0, 102, 115, 11, 57, 147, 26, 119, 31, 18, 32, 148, 70, 99, 1],
+                     44.09012145354571, 0.2970102497619993),
+            (2, 30): ([2, 30], 1.1785972772898266, 1.0),
+            (10, 60): ([10, 196, 69, 166, 26, 48, 192, 167, 41, 103, 198, 163, 168, 11, 60],
+                       23.40706882491327, 0.5710780703826643),
+        }
+        for (start, end), (route, distance, route_certainty) in expected.items():
+            path, total_dist, _, certainty = fuzzy_search(self.graph, self.df, start, end, r=5.0)
+            self.assertEqual(path, route)
+            self.assertAlmostEqual(total_dist, distance, places=9)
+            self.assertAlmostEqual(certainty, route_certainty, places=9)
+
+    def test_km_membership_uses_km_threshold(self):
+        """Com d, a distância das arestas (km) é comparada com d em km."""
+        graph = build_graph(self.df, d=300)
+        model = get_fuzzy_edge_model(graph, d=300)
+        params = DEFAULT_FUZZY_PARAMS
+        expected = membership_values(model.arrays.km_dist, 300, params['alpha'],
+                                     params['min_certainty'], params['decay_factor'])
+        np.testing.assert_allclose(model.certainty, expected)
+        self.assertTrue(np.all(model.certainty[model.arrays.km_dist <= 100] == 1.0))
+
+    def _brute_force_widest(self, model, source):
+        """Certeza máxima (max-min) da origem para todos os nós, por busca de gargalo."""
+        import heapq
+        arrays = model.arrays
+        best = np.zeros(arrays.n)
+        best[source] = 1.0
+        heap = [(-1.0, source)]
+        while heap:
+            neg, node = heapq.heappop(heap)
+            if -neg < best[node]:
+                continue
+            for pos in range(arrays.indptr[node], arrays.indptr[node + 1]):
+                neighbor = arrays.indices[pos]
+                value = min(-neg, model.certainty[pos])
+                if value > best[neighbor]:
+                    best[neighbor] = value
+                    heapq.heappush(heap, (-value, neighbor))
+        return best
+
+    def test_oracle_matches_brute_force(self):
+        """O oráculo (árvore geradora máxima + LCA) deve coincidir com a busca de gargalo exaustiva."""
+        graph = build_graph(self.df, r=6.0)
+        oracle = get_widest_path_oracle(graph, r=6.0)
+        model = oracle.model
+        for source in (0, 5, 17):
+            expected = self._brute_force_widest(model, source)
+            for target in range(model.arrays.n):
+                self.assertAlmostEqual(oracle.best_certainty(source, target), expected[target])
+
+    def test_exact_fuzzy_is_optimal(self):
+        """A busca exata maximiza a certeza e, entre as rotas com essa certeza, minimiza a distância."""
+        graph = build_graph(self.df, r=6.0)
+        model = get_fuzzy_edge_model(graph, r=6.0)
+        for start, end in ((0, 1), (2, 30), (4, 99)):
+            if not nx.has_path(graph, start, end):
+                continue
+            path, total_dist, _, certainty = fuzzy_search(graph, self.df, start, end, r=6.0, method='exact')
+            _, _, _, heuristic_certainty = fuzzy_search(graph, self.df, start, end, r=6.0)
+            self.assertGreaterEqual(certainty, heuristic_certainty)
+
+            allowed = nx.Graph()
+            for u, v, data in graph.edges(data=True):
+                pos = model.arrays.edge_position(model.arrays.index[u], model.arrays.index[v])
+                if model.certainty[pos] >= certainty:
+                    allowed.add_edge(u, v, weight=data['angular_dist'])
+            expected = nx.shortest_path_length(allowed, start, end, weight='weight')
+            self.assertAlmostEqual(total_dist, expected, places=6)
+
+
+if __name__ == "__main__":
+    unittest.main()
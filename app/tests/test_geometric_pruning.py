@@ -0,0 +1,89 @@
+import sys
+import os
+import unittest
+import networkx as nx
+import numpy as np
+
+# Adiciona o diretório raiz do projeto ao caminho do Python
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, '../..'))
+sys.path.append(project_root)
+
+from app.utils.data_loader import load_data
+from app.utils.graph_utils import build_graph
+from app.utils.geometric_pruning import EllipsePruner
+from app.utils.algorithms import a_star_search, depth_first_search, dijkstra_search
+
+
+class TestEllipsePruning(unittest.TestCase):
+    """
+    Verifica a poda geométrica por elipse nas buscas ponto a ponto.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cities_path = os.path.join(project_root, 'data', 'cities.json')
+        cls.df, cls.name_to_id, cls.id_to_name = load_data(cities_path)
+        cls.df = cls.df.head(300)
+        cls.km_graph = build_graph(cls.df, d=600)
+        cls.deg_graph = build_graph(cls.df, r=6.0)
+
+    def _pairs(self, graph):
+        component = sorted(nx.node_connected_component(graph, 0))
+        return [(component[0], component[-1]), (component[3], component[len(component) // 2])]
+
+    def test_results_preserved(self):
+        """Com a poda, Dijkstra e A* retornam as mesmas rotas (pesos em km e em graus)."""
+        for graph in (self.km_graph, self.deg_graph):
+            for start, end in self._pairs(graph):
+                expected = dijkstra_search(graph, self.df, start, end)
+                result = dijkstra_search(graph, self.df, start, end, pruning=True)
+                self.assertEqual(result[0], expected[0])
+                self.assertAlmostEqual(result[1], expected[1], places=6)
+                expected = a_star_search(graph, {}, start, end)
+                result = a_star_search(graph, {}, start, end, pruning=True)
+                self.assertEqual(result[0], expected[0])
+                self.assertAlmostEqual(result[1], expected[1], places=6)
+
+    def test_results_preserved_with_penalties(self):
+        """Com penalidades, o limite superior usa o custo penalizado e o A* podado acha a mesma rota."""
+        penalties = {node: {'criminalidade': 500.0} for node in self.km_graph.nodes}
+        for start, end in self._pairs(self.km_graph):
+            expected = a_star_search(self.km_graph, penalties, start, end)
+            result = a_star_search(self.km_graph, penalties, start, end, pruning=True)
+            self.assertIsNotNone(result[0])
+            self.assertEqual(result[0], expected[0])
+            self.assertAlmostEqual(result[1], expected[1], places=6)
+
+            def penalized(u, v, data):
+                return data['weight'] + 500.0
+            expected = a_star_search(self.km_graph, {}, start, end, cost_fn=penalized)
+            result = a_star_search(self.km_graph, {}, start, end, cost_fn=penalized, pruning=True)
+            self.assertAlmostEqual(result[1], expected[1], places=6)
+
+    def test_pruned_nodes_are_outside_ellipse(self):
+        """Nós podados têm limite inferior start -> n -> end maior que U; o ótimo nunca é podado."""
+        start, end = self._pairs(self.km_graph)[1]
+        pruner = EllipsePruner(self.km_graph, start, end)
+        path, cost, _ = a_star_search(self.km_graph, {}, start, end, pruning=pruner)
+        stats = pruner.stats()
+        self.assertLessEqual(stats['upper_bound'], stats['initial_upper_bound'])
+        self.assertAlmostEqual(stats['upper_bound'], cost, places=6)
+        self.assertGreater(stats['pruned_fraction'], 0.0)
+        arrays = pruner.arrays
+        for node in path:
+            self.assertLessEqual(pruner.through[arrays.index[node]], cost * (1 + 1e-9))
+        self.assertTrue(np.all(pruner.through[pruner.through > cost * (1 + 1e-9)] > cost))
+
+    def test_dfs_respects_upper_bound(self):
+        """O DFS com poda retorna uma rota com custo até o limite da rota gulosa inicial."""
+        start, end = self._pairs(self.km_graph)[0]
+        pruner = EllipsePruner(self.km_graph, start, end)
+        path, cost, _ = depth_first_search(self.km_graph, start, end, pruning=pruner)
+        self.assertEqual(path[0], start)
+        self.assertEqual(path[-1], end)
+        self.assertLessEqual(cost, pruner.initial_upper_bound * (1 + 1e-9))
+
+
+if __name__ == "__main__":
+    unittest.main()
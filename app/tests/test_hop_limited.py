@@ -0,0 +1,77 @@
+import sys
+import os
+import unittest
+import networkx as nx
+
+# Adiciona o diretório raiz do projeto ao caminho do Python
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, '../..'))
+sys.path.append(project_root)
+
+from app.utils.data_loader import load_data
+from app.utils.graph_utils import build_graph
+from app.utils.algorithms import hop_limited_search, path_distance
+from app.utils.hop_limited import hop_limited_path
+
+
+def reference_costs(graph, start, max_edges):
+    """Bellman-Ford limitado por arestas, laço simples sobre o grafo NetworkX."""
+    dist = {start: 0.0}
+    for _ in range(max_edges):
+        updated = dict(dist)
+        for u, d in dist.items():
+            for v, data in graph[u].items():
+                if d + data['weight'] < updated.get(v, float('inf')):
+                    updated[v] = d + data['weight']
+        dist = updated
+    return dist
+
+
+class TestHopLimited(unittest.TestCase):
+    """
+    Verifica a busca do menor caminho com limite de arestas (Bellman-Ford em camadas).
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cities_path = os.path.join(project_root, 'data', 'cities.json')
+        cls.df, cls.name_to_id, cls.id_to_name = load_data(cities_path)
+        cls.df = cls.df.head(200)
+        cls.graph = build_graph(cls.df, d=400)
+        cls.start = list(cls.graph.nodes())[0]
+
+    def test_matches_reference_per_hop_limit(self):
+        for max_edges in (1, 2, 4, 7):
+            expected = reference_costs(self.graph, self.start, max_edges)
+            for end in list(self.graph.nodes())[1::23]:
+                for frontier in (True, False):
+                    path, dist, _ = hop_limited_path(self.graph, self.start, end, max_edges, frontier=frontier)
+                    if end not in expected:
+                        self.assertIsNone(path)
+                        continue
+                    self.assertAlmostEqual(dist, expected[end], places=6)
+                    self.assertLessEqual(len(path) - 1, max_edges)
+                    self.assertEqual(path[0], self.start)
+                    self.assertEqual(path[-1], end)
+                    self.assertAlmostEqual(path_distance(self.graph, path), dist, places=6)
+
+    def test_large_limit_equals_dijkstra(self):
+        lengths = nx.single_source_dijkstra_path_length(self.graph, self.start)
+        end = max(lengths, key=lengths.get)
+        path, dist, elapsed, layers = hop_limited_search(self.graph, self.start, end, max_stops=self.graph.number_of_nodes())
+        self.assertAlmostEqual(dist, lengths[end], places=6)
+        self.assertGreaterEqual(elapsed, 0)
+        self.assertEqual(layers[-1]['improved'], 0)
+        self.assertLess(len(layers), self.graph.number_of_nodes())
+
+    def test_zero_stops(self):
+        neighbor = next(iter(self.graph[self.start]))
+        path, dist, _, _ = hop_limited_search(self.graph, self.start, neighbor, max_stops=0)
+        self.assertEqual(path, [self.start, neighbor])
+        self.assertAlmostEqual(dist, self.graph[self.start][neighbor]['weight'], places=9)
+        far = next(n for n in self.graph.nodes() if n != self.start and n not in self.graph[self.start])
+        self.assertIsNone(hop_limited_search(self.graph, self.start, far, max_stops=0)[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
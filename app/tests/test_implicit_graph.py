@@ -0,0 +1,82 @@
+import sys
+import os
+import unittest
+
+# Adiciona o diretório raiz do projeto ao caminho do Python
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, '../..'))
+sys.path.append(project_root)
+
+from app.utils.data_loader import load_data
+from app.utils.graph_utils import build_graph
+from app.utils.implicit_graph import build_implicit_graph
+from app.utils import algorithms
+
+
+class TestImplicitGraph(unittest.TestCase):
+    """
+    Verifica que o grafo implícito é equivalente ao grafo materializado por build_graph.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cities_path = os.path.join(project_root, 'data', 'cities.json')
+        cls.df, cls.name_to_id, cls.id_to_name = load_data(cities_path)
+        cls.df = cls.df.head(200)
+
+    def test_same_edges_and_weights(self):
+        """Vizinhos, dados das arestas e contagens coincidem para r, d e ambos."""
+        for r, d in ((5.0, None), (None, 500), (4.0, 400)):
+            materialized = build_graph(self.df, r=r, d=d)
+            implicit = build_implicit_graph(self.df, r=r, d=d)
+            self.assertEqual(list(implicit.nodes()), list(materialized.nodes()))
+            self.assertEqual(implicit.number_of_edges(), materialized.number_of_edges())
+            for node in materialized.nodes():
+                self.assertEqual(list(implicit.neighbors(node)), list(materialized.neighbors(node)))
+                self.assertEqual(implicit.degree[node], materialized.degree[node])
+                self.assertEqual(implicit[node], dict(materialized[node]))
+            self.assertEqual(list(implicit.edges(data=True)), list(materialized.edges(data=True)))
+            self.assertIsNone(implicit.get_edge_data(0, 0))
+
+    def test_searches_match_materialized(self):
+        """As cinco buscas retornam os mesmos caminhos e custos nos dois grafos."""
+        materialized = build_graph(self.df, d=500)
+        implicit = build_implicit_graph(self.df, d=500)
+        start, end = 0, 150
+        searches = {
+            'bfs': lambda g: algorithms.breadth_first_search(g, start, end, log_metrics=False)[:2],
+            'dfs': lambda g: algorithms.depth_first_search(g, start, end)[:2],
+            'astar': lambda g: algorithms.a_star_search(g, {}, start, end)[:2],
+            'dijkstra': lambda g: algorithms.dijkstra_search(g, self.df, start, end)[:2],
+            'fuzzy': lambda g: algorithms.fuzzy_search(g, self.df, start, end, d=500)[:2],
+        }
+        for name, search in searches.items():
+            expected, result = search(materialized), search(implicit)
+            self.assertEqual(result[0], expected[0], name)
+            self.assertAlmostEqual(result[1], expected[1], msg=name)
+
+    def test_a_star_stays_on_demand(self):
+        """O A* no grafo implícito não monta a CSR e respeita as penalidades."""
+        from app.utils import graph_arrays
+
+        materialized = build_graph(self.df, d=500)
+        implicit = build_implicit_graph(self.df, d=500)
+        penalties = {node: {'criminalidade': 50.0} for node in materialized.nodes()}
+        for cities in ({}, penalties):
+            expected = algorithms.a_star_search(materialized, cities, 0, 150)
+            result = algorithms.a_star_search(implicit, cities, 0, 150)
+            self.assertEqual(result[0], expected[0])
+            self.assertAlmostEqual(result[1], expected[1])
+        self.assertNotIn(implicit, graph_arrays._arrays_cache)
+        self.assertLess(len(implicit._neighbor_cache), implicit.number_of_nodes())
+
+    def test_graph_hash_is_deterministic(self):
+        """O hash usado pelos wrappers com cache não depende de percorrer as arestas."""
+        implicit = build_implicit_graph(self.df, r=5.0)
+        self.assertEqual(algorithms.get_graph_hash(implicit), algorithms.get_graph_hash(implicit))
+        other = build_implicit_graph(self.df, r=6.0)
+        self.assertNotEqual(algorithms.get_graph_hash(implicit), algorithms.get_graph_hash(other))
+
+
+if __name__ == "__main__":
+    unittest.main()
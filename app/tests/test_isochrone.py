@@ -0,0 +1,73 @@
+import sys
+import os
+import unittest
+import folium
+import networkx as nx
+
+# Adiciona o diretório raiz do projeto ao caminho do Python
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, '../..'))
+sys.path.append(project_root)
+
+from app.utils.data_loader import load_data
+from app.utils.graph_utils import build_graph
+from app.utils.graph_arrays import get_graph_arrays
+from app.utils.isochrone import isochrone_geojson, reachable_within
+from app.utils.sssp_cache import ShortestPathTreeCache
+from app.components import map_display
+
+
+class TestIsochrone(unittest.TestCase):
+    """
+    Verifica a isócrona de rede (busca limitada por distância) e a camada GeoJSON.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cities_path = os.path.join(project_root, 'data', 'cities.json')
+        cls.df, cls.name_to_id, cls.id_to_name = load_data(cities_path)
+        cls.df = cls.df.head(300)
+        cls.graph = build_graph(cls.df, d=400)
+        cls.source = list(cls.graph.nodes())[20]
+
+    def test_matches_networkx_cutoff(self):
+        for budget in (0.0, 250.0, 900.0):
+            iso = reachable_within(self.graph, self.source, budget, cache=None)
+            expected = nx.single_source_dijkstra_path_length(self.graph, self.source, cutoff=budget)
+            self.assertEqual(set(iso.nodes), set(expected))
+            for node, distance in zip(iso.nodes, iso.distances):
+                self.assertAlmostEqual(distance, expected[node], places=6)
+            self.assertTrue((iso.distances[:-1] <= iso.distances[1:]).all())
+            self.assertFalse(iso.from_cache)
+
+    def test_reuses_cached_tree(self):
+        cache = ShortestPathTreeCache()
+        bounded = reachable_within(self.graph, self.source, 700.0, cache=cache)
+        arrays = get_graph_arrays(self.graph)
+        cache.tree(arrays, arrays.index[self.source])
+        cached = reachable_within(self.graph, self.source, 700.0, cache=cache)
+        self.assertTrue(cached.from_cache)
+        self.assertEqual(cached.settled, 0)
+        self.assertEqual(cached.indices.tolist(), bounded.indices.tolist())
+        self.assertEqual(cached.parents.tolist(), bounded.parents.tolist())
+        self.assertEqual(cached.distances.tolist(), bounded.distances.tolist())
+
+    def test_geojson_layer(self):
+        iso = reachable_within(self.graph, self.source, 600.0, cache=None)
+        geojson = isochrone_geojson(self.graph, iso)
+        cities = [f for f in geojson['features'] if f['properties']['kind'] == 'city']
+        tree = [f for f in geojson['features'] if f['properties']['kind'] == 'tree']
+        self.assertEqual(len(cities), len(iso))
+        self.assertEqual(len(tree), len(iso) - 1)
+        self.assertTrue(all(0.0 <= f['properties']['fraction'] <= 1.0 for f in geojson['features']))
+
+        source = self.graph.nodes[self.source]
+        m = map_display.display_isochrone_map(geojson, (source['latitude'], source['longitude']))
+        self.assertIsNotNone(m)
+        layers = [child for child in m._children.values() if isinstance(child, folium.GeoJson)]
+        self.assertEqual(len(layers), 1)
+        self.assertEqual(layers[0].layer_name, 'Isócrona')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import sys
+import os
+import itertools
+import unittest
+import networkx as nx
+
+# Adiciona o diretório raiz do projeto ao caminho do Python
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, '../..'))
+sys.path.append(project_root)
+
+from app.utils.data_loader import load_data
+from app.utils.graph_utils import build_graph
+from app.utils.k_shortest import benchmark_k_shortest, k_shortest_paths
+
+
+class TestKShortestPaths(unittest.TestCase):
+    """
+    Compara os k menores caminhos simples (Yen com árvores compartilhadas) com o NetworkX.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cities_path = os.path.join(project_root, 'data', 'cities.json')
+        cls.df, cls.name_to_id, cls.id_to_name = load_data(cities_path)
+        cls.df = cls.df.head(200)
+        cls.graph = build_graph(cls.df, r=4.0)
+        component = nx.node_connected_component(cls.graph, 0)
+        cls.targets = sorted(component - {0})[:3]
+
+    def test_costs_match_networkx(self):
+        """Os custos das k rotas devem coincidir com os de nx.shortest_simple_paths."""
+        for end in self.targets:
+            routes = k_shortest_paths(self.graph, 0, end, k=5)
+            expected = [
+                nx.path_weight(self.graph, path, 'weight')
+                for path in itertools.islice(nx.shortest_simple_paths(self.graph, 0, end, weight='weight'), 5)
+            ]
+            self.assertEqual(len(routes), len(expected))
+            for route, cost in zip(routes, expected):
+                self.assertAlmostEqual(route['cost'], cost, places=6)
+
+    def test_routes_are_distinct_simple_paths(self):
+        """As rotas são simples, distintas e ordenadas por (custo, população)."""
+        routes = k_shortest_paths(self.graph, 0, self.targets[-1], k=5)
+        paths = [tuple(route['path']) for route in routes]
+        self.assertEqual(len(set(paths)), len(paths))
+        for route in routes:
+            self.assertEqual(len(set(route['path'])), len(route['path']))
+            self.assertTrue(nx.is_path(self.graph, route['path']))
+        keys = [(route['cost'], route['population']) for route in routes]
+        self.assertEqual(keys, sorted(keys))
+
+    def test_benchmark(self):
+        """O benchmark reporta a latência das consultas."""
+        result = benchmark_k_shortest(self.graph, [(0, end) for end in self.targets], k=5)
+        self.assertEqual(result['queries'], len(self.targets))
+        self.assertGreater(result['mean_ms'], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import sys
+import os
+import unittest
+
+# Adiciona o diretório raiz do projeto ao caminho do Python
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, '../..'))
+sys.path.append(project_root)
+
+from app.utils.data_loader import load_data
+from app.utils.graph_utils import build_graph, calculate_haversine_distance
+from app.utils.knn_graph import build_knn_graph
+
+
+class TestKnnGraph(unittest.TestCase):
+    """
+    Verifica a conexão pelos k vizinhos mais próximos (kNN, kNN mútuo e kNN ∩ raio).
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cities_path = os.path.join(project_root, 'data', 'cities.json')
+        cls.df, cls.name_to_id, cls.id_to_name = load_data(cities_path)
+        cls.df = cls.df.head(300)
+
+    def test_nearest_neighbors_connected(self):
+        """Cada cidade fica conectada às suas k cidades mais próximas (força bruta como referência)."""
+        k = 5
+        G = build_knn_graph(self.df, k=k)
+        nodes = list(G.nodes())
+        for u in nodes[::25]:
+            others = sorted((calculate_haversine_distance(G.nodes[u], G.nodes[v]), v) for v in nodes if v != u)
+            kth = others[k - 1][0]
+            for dist, v in others:
+                if dist < kth - 1e-9:
+                    self.assertTrue(G.has_edge(u, v))
+            self.assertGreaterEqual(G.degree(u), k)
+
+    def test_mutual_bounded_degree(self):
+        k = 4
+        union = build_knn_graph(self.df, k=k)
+        mutual = build_knn_graph(self.df, k=k, mutual=True)
+        self.assertLessEqual(mutual.graph['knn']['max_degree'], k)
+        self.assertTrue(all(union.has_edge(u, v) for u, v in mutual.edges()))
+        self.assertLess(mutual.number_of_edges(), union.number_of_edges())
+
+    def test_intersection_with_radius(self):
+        """kNN ∩ raio: subconjunto do grafo de raio, com os mesmos atributos de aresta."""
+        radius_graph = build_graph(self.df, d=500)
+        G = build_graph(self.df, d=500, mode='knn', k=8)
+        self.assertLess(G.number_of_edges(), radius_graph.number_of_edges())
+        for u, v, data in G.edges(data=True):
+            self.assertEqual(data, radius_graph.get_edge_data(u, v))
+
+    def test_weights_without_radius(self):
+        G = build_graph(self.df, mode='knn', k=3)
+        self.assertIsNone(G.graph['d'])
+        for _, _, data in G.edges(data=True):
+            self.assertEqual(data['weight'], data['angular_dist'])
+        with self.assertRaises(ValueError):
+            build_knn_graph(self.df, k=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import sys
+import os
+import unittest
+import networkx as nx
+
+# Adiciona o diretório raiz do projeto ao caminho do Python
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, '../..'))
+sys.path.append(project_root)
+
+from app.utils.data_loader import load_data
+from app.utils.graph_utils import build_graph
+from app.utils.algorithms import lexicographic_search
+from app.utils.lexicographic_engine import get_lexicographic_model
+
+
+def small_graph(edges, populations):
+    G = nx.Graph()
+    for node, population in populations.items():
+        G.add_node(node, population=population, latitude=0.0, longitude=0.0)
+    for u, v, weight in edges:
+        G.add_edge(u, v, weight=weight)
+    return G
+
+
+class TestLexicographicSearch(unittest.TestCase):
+    """
+    Verifica a busca lexicográfica (distância, população) com chaves inteiras empacotadas.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cities_path = os.path.join(project_root, 'data', 'cities.json')
+        cls.df, cls.name_to_id, cls.id_to_name = load_data(cities_path)
+        cls.df = cls.df.head(200)
+        cls.graph = build_graph(cls.df, d=500)
+
+    def test_population_breaks_distance_ties(self):
+        """Empate de distância: vence a rota com menor população total, não a menor cidade vizinha."""
+        G = small_graph(
+            [('s', 'a', 1.0), ('a', 'b', 1.0), ('b', 't', 1.0), ('s', 'c', 1.0), ('c', 'd', 1.0), ('d', 't', 1.0)],
+            {'s': 0, 'a': 10, 'b': 1000, 'c': 50, 'd': 60, 't': 0}
+        )
+        path, dist, _, population = lexicographic_search(G, 's', 't')
+        self.assertEqual(path, ['s', 'c', 'd', 't'])
+        self.assertEqual(dist, 3.0)
+        self.assertEqual(population, 110)
+
+    def test_fixed_point_ties_are_exact(self):
+        """0.1 + 0.2 e 0.3 empatam em ponto fixo; o desempate é pela população."""
+        edges = [('s', 'a', 0.1), ('a', 't', 0.2), ('s', 'b', 0.15), ('b', 't', 0.15)]
+        G = small_graph(edges, {'s': 5, 'a': 1, 'b': 100, 't': 5})
+        self.assertEqual(lexicographic_search(G, 's', 't')[0], ['s', 'a', 't'])
+        G = small_graph(edges, {'s': 5, 'a': 1000, 'b': 100, 't': 5})
+        self.assertEqual(lexicographic_search(G, 's', 't')[0], ['s', 'b', 't'])
+
+    def test_matches_reference_on_cities(self):
+        model = get_lexicographic_model(self.graph)
+        self.assertLess(model.radix, 2**63)
+        index = model.arrays.index
+        population = dict(zip(model.arrays.nodes, model.population_list))
+
+        def key(u, v, data):
+            pos = model.arrays.edge_position(index[u], index[v])
+            return int(model.fixed_weights[pos]) * model.radix + population[v]
+
+        nodes = list(self.graph.nodes())
+        start = nodes[0]
+        for end in nodes[7::37]:
+            path, dist, _, total_population = lexicographic_search(self.graph, start, end)
+            if not nx.has_path(self.graph, start, end):
+                self.assertIsNone(path)
+                continue
+            expected_key = nx.dijkstra_path_length(self.graph, start, end, weight=key) + population[start]
+            self.assertEqual(total_population, expected_key % model.radix)
+            self.assertEqual(total_population, sum(population[n] for n in path))
+            optimal = nx.dijkstra_path_length(self.graph, start, end)
+            self.assertLessEqual(abs(dist - optimal), len(path) / model.scale)
+
+    def test_scale_reduced_to_fit_int64(self):
+        G = small_graph([('s', 't', 1e9)], {'s': 10**9, 't': 10**9})
+        model = get_lexicographic_model(G)
+        self.assertLess(model.scale, 1000)
+        with self.assertRaises(ValueError):
+            get_lexicographic_model(G, scale=10**6)
+
+
+if __name__ == '__main__':
+    unittest.main()
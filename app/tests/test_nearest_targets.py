@@ -0,0 +1,70 @@
+import sys
+import os
+import unittest
+import networkx as nx
+import numpy as np
+
+# Adiciona o diretório raiz do projeto ao caminho do Python
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, '../..'))
+sys.path.append(project_root)
+
+from app.utils.data_loader import load_data
+from app.utils.graph_utils import build_graph
+from app.utils.algorithms import nearest_city_search, path_distance
+from app.utils.nearest_targets import all_of, in_state, nearest_matching, population_at_least
+
+
+class TestNearestTargets(unittest.TestCase):
+    """
+    Verifica a busca pelas cidades mais próximas que atendem a um predicado.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cities_path = os.path.join(project_root, 'data', 'cities.json')
+        cls.df, cls.name_to_id, cls.id_to_name = load_data(cities_path)
+        cls.df = cls.df.head(300)
+        cls.graph = build_graph(cls.df, d=400)
+        cls.start = list(cls.graph.nodes())[10]
+
+    def _reference(self, qualifies):
+        lengths = nx.single_source_dijkstra_path_length(self.graph, self.start)
+        return sorted((dist, node) for node, dist in lengths.items() if node != self.start and qualifies(node))
+
+    def test_top_k_matches_reference(self):
+        predicate = population_at_least(300000)
+        results = nearest_matching(self.graph, self.start, predicate, k=5)
+        expected = self._reference(lambda n: self.graph.nodes[n]['population'] >= 300000)[:5]
+        self.assertEqual(len(results), len(expected))
+        for result, (dist, _) in zip(results, expected):
+            self.assertAlmostEqual(result['distance'], dist, places=6)
+            self.assertGreaterEqual(self.graph.nodes[result['node']]['population'], 300000)
+            self.assertEqual(result['path'][0], self.start)
+            self.assertEqual(result['path'][-1], result['node'])
+            self.assertAlmostEqual(path_distance(self.graph, result['path']), result['distance'], places=6)
+
+    def test_combined_predicates_and_wrapper(self):
+        state = self.graph.nodes[self.start]['state']
+        predicate = all_of(in_state(state), population_at_least(100000))
+        results, elapsed = nearest_city_search(self.graph, self.start, predicate, k=3)
+        self.assertGreaterEqual(elapsed, 0)
+        expected = self._reference(
+            lambda n: self.graph.nodes[n]['state'] == state and self.graph.nodes[n]['population'] >= 100000
+        )[:3]
+        self.assertEqual(len(results), len(expected))
+        for result, (dist, _) in zip(results, expected):
+            self.assertAlmostEqual(result['distance'], dist, places=6)
+
+    def test_mask_predicate_and_no_match(self):
+        mask = np.zeros(self.graph.number_of_nodes(), dtype=bool)
+        self.assertEqual(nearest_matching(self.graph, self.start, mask), [])
+        mask[list(self.graph.nodes()).index(self.start)] = True
+        self.assertEqual(nearest_matching(self.graph, self.start, mask), [])
+        self.assertEqual(nearest_matching(self.graph, self.start, mask, include_start=True)[0]['path'], [self.start])
+        with self.assertRaises(ValueError):
+            nearest_matching(self.graph, self.start, np.ones(3, dtype=bool))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import sys
+import os
+import unittest
+import networkx as nx
+
+# Adiciona o diretório raiz do projeto ao caminho do Python
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, '../..'))
+sys.path.append(project_root)
+
+from app.utils.data_loader import load_data
+from app.utils.graph_utils import build_graph
+from app.utils.algorithms import parametric_radius_search
+from app.utils.parametric_path import radius_sweep, route_at
+
+
+class TestParametricPath(unittest.TestCase):
+    """
+    Verifica a menor rota em função do raio de conexão contra reconstrução + Dijkstra.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cities_path = os.path.join(project_root, 'data', 'cities.json')
+        cls.df, cls.name_to_id, cls.id_to_name = load_data(cities_path)
+        cls.df = cls.df.head(150)
+        ids = cls.df['city_id'].tolist()
+        cls.start, cls.end = ids[0], ids[9]
+
+    def _check_radii(self, breakpoints, radii, unit):
+        for radius in radii:
+            G = build_graph(self.df, d=radius) if unit == 'km' else build_graph(self.df, r=radius)
+            point = route_at(breakpoints, radius)
+            if not nx.has_path(G, self.start, self.end):
+                self.assertIsNone(point)
+                continue
+            self.assertAlmostEqual(point['distance'], nx.dijkstra_path_length(G, self.start, self.end), places=6)
+            self.assertEqual(point['path'][0], self.start)
+            self.assertEqual(point['path'][-1], self.end)
+            self.assertTrue(all(G.has_edge(a, b) for a, b in zip(point['path'], point['path'][1:])))
+            self.assertLessEqual(point['edges'], G.number_of_edges())
+
+    def test_step_function_matches_rebuild(self):
+        breakpoints, elapsed = parametric_radius_search(self.df, self.start, self.end, 1500, unit='km')
+        self.assertGreater(len(breakpoints), 1)
+        self.assertGreaterEqual(elapsed, 0)
+        radii = [point['radius'] for point in breakpoints]
+        distances = [point['distance'] for point in breakpoints]
+        self.assertEqual(radii, sorted(radii))
+        self.assertTrue(all(a > b for a, b in zip(distances, distances[1:])))
+
+        between = [(a + b) / 2 for a, b in zip(radii, radii[1:])]
+        self._check_radii(breakpoints, [radii[0] * 0.9] + between[:10] + between[-5:] + [1500], 'km')
+
+    def test_degrees(self):
+        breakpoints = radius_sweep(self.df, self.start, self.end, 12, unit='graus')
+        radii = [point['radius'] for point in breakpoints]
+        between = [(a + b) / 2 for a, b in zip(radii, radii[1:])]
+        self._check_radii(breakpoints, [radii[0] * 0.9] + between[:8] + [12], 'graus')
+
+    def test_disconnected_and_same_city(self):
+        self.assertEqual(radius_sweep(self.df, self.start, self.end, 50, unit='km'), [])
+        same = radius_sweep(self.df, self.start, self.start, 50, unit='km')
+        self.assertEqual(same[0]['path'], [self.start])
+        self.assertEqual(same[0]['distance'], 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
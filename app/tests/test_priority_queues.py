@@ -0,0 +1,125 @@
+import sys
+import os
+import random
+import unittest
+import networkx as nx
+
+# Adiciona o diretório raiz do projeto ao caminho do Python
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, '../..'))
+sys.path.append(project_root)
+
+from app.utils.data_loader import load_data
+from app.utils.graph_utils import build_graph
+from app.utils.priority_queues import HeapQueue, IndexedDaryHeap, RadixHeapQueue, benchmark_priority_queues
+from app.utils.algorithms import a_star_search, dijkstra_search, fuzzy_search
+
+
+class TestPriorityQueues(unittest.TestCase):
+    """
+    Verifica que a radix heap preserva a ordem exata da heapq e que as buscas
+    retornam os mesmos resultados com qualquer uma das filas.
+    """
+
+    def test_radix_pop_order_matches_heapq(self):
+        """Com chaves monótonas (estilo Dijkstra), a ordem de remoção é idêntica."""
+        rng = random.Random(7)
+        heap, radix = HeapQueue(), RadixHeapQueue()
+        counter = 0
+        for queue in (heap, radix):
+            queue.push((0.0, 5, 0, 'origem'))
+        popped_heap, popped_radix = [], []
+        while heap:
+            a, b = heap.pop(), radix.pop()
+            popped_heap.append(a)
+            popped_radix.append(b)
+            if counter < 500:
+                for _ in range(rng.randint(0, 3)):
+                    counter += 1
+                    entry = (a[0] + rng.choice([0.0, rng.random() * 10]), rng.randint(0, 3), counter, counter)
+                    heap.push(entry)
+                    radix.push(entry)
+        self.assertEqual(popped_heap, popped_radix)
+        self.assertEqual(len(radix), 0)
+
+    def test_radix_handles_non_monotone_keys(self):
+        """Chaves menores que a última removida continuam sendo removidas em ordem."""
+        radix = RadixHeapQueue()
+        for entry in [(5.0, 0), (9.0, 1), (7.0, 2)]:
+            radix.push(entry)
+        self.assertEqual(radix.pop(), (5.0, 0))
+        radix.push((1.0, 3))
+        self.assertEqual([radix.pop() for _ in range(3)], [(1.0, 3), (7.0, 2), (9.0, 1)])
+        self.assertEqual(radix.peak_size, 3)
+
+    def test_searches_identical_with_radix(self):
+        """Dijkstra, A* e Fuzzy retornam o mesmo caminho com heapq e com radix heap."""
+        cities_path = os.path.join(project_root, 'data', 'cities.json')
+        df, _, _ = load_data(cities_path)
+        df = df.head(200)
+        graph = build_graph(df, d=600)
+        end = max(nx.node_connected_component(graph, 0))
+        for search in (
+            lambda q: dijkstra_search(graph, df, 0, end, queue=q),
+            lambda q: a_star_search(graph, {}, 0, end, queue=q),
+            lambda q: fuzzy_search(graph, df, 0, end, r=5.0, method='bidirectional', queue=q),
+        ):
+            expected, result = search('heapq'), search('radix')
+            self.assertEqual(expected[0], result[0])
+            self.assertAlmostEqual(expected[1], result[1])
+
+        records = benchmark_priority_queues(
+            lambda s, e, q: a_star_search(graph, {}, s, e, queue=q), [(0, end)]
+        )
+        self.assertEqual([r['queue'] for r in records], ['heapq', 'radix'])
+        self.assertEqual(records[0]['pushes'], records[1]['pushes'])
+
+    def test_dary_decrease_key(self):
+        """A heap indexada mantém uma entrada por item e reduz a prioridade no lugar."""
+        heap = IndexedDaryHeap(track_stale=True)
+        for i, key in enumerate([9.0, 4.0, 7.0, 1.0, 8.0, 3.0]):
+            heap.push((key, i))
+        heap.push((0.5, 2))
+        heap.push((10.0, 1))  # prioridade pior: ignorada
+        self.assertEqual(len(heap), 6)
+        self.assertEqual(heap.decrease_keys, 1)
+        self.assertIn(2, heap)
+        self.assertEqual([heap.pop() for _ in range(6)],
+                         [(0.5, 2), (1.0, 3), (3.0, 5), (4.0, 1), (8.0, 4), (9.0, 0)])
+        self.assertEqual(heap.stale_pops, 0)
+
+    def test_stale_pops_only_when_tracked(self):
+        """A contagem de remoções obsoletas é opcional: sem ela, nenhum conjunto é mantido."""
+        for tracked in (False, True):
+            heap = HeapQueue(track_stale=tracked)
+            for entry in [(2.0, 'a'), (1.0, 'a'), (3.0, 'b')]:
+                heap.push(entry)
+            self.assertEqual([heap.pop()[-1] for _ in range(3)], ['a', 'a', 'b'])
+            self.assertEqual(heap.stale_pops, 1 if tracked else 0)
+            self.assertEqual(heap._popped is None, not tracked)
+
+    def test_searches_identical_with_dary(self):
+        """Com a heap indexada, as buscas não têm remoções obsoletas e o pico fica limitado a V."""
+        cities_path = os.path.join(project_root, 'data', 'cities.json')
+        df, _, _ = load_data(cities_path)
+        df = df.head(200)
+        graph = build_graph(df, d=900)
+        end = max(nx.node_connected_component(graph, 0))
+        expected = dijkstra_search(graph, df, 0, end)
+        result = dijkstra_search(graph, df, 0, end, queue='dary')
+        self.assertEqual(expected[0], result[0])
+        self.assertAlmostEqual(expected[1], result[1])
+
+        records = benchmark_priority_queues(
+            lambda s, e, q: a_star_search(graph, {}, s, e, queue=q), [(0, end)], queues=('heapq', 'dary')
+        )
+        heap_record, dary_record = records
+        self.assertLessEqual(dary_record['peak_size'], graph.number_of_nodes())
+        self.assertEqual(dary_record['stale_pops'], 0)
+        self.assertGreaterEqual(heap_record['stale_pops'], dary_record['stale_pops'])
+        self.assertEqual(a_star_search(graph, {}, 0, end, queue='dary')[0],
+                         a_star_search(graph, {}, 0, end)[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+import sys
+import os
+import unittest
+import networkx as nx
+
+# Adiciona o diretório raiz do projeto ao caminho do Python
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, '../..'))
+sys.path.append(project_root)
+
+from app.utils.data_loader import load_data
+from app.utils.graph_utils import build_graph
+from app.utils.graph_arrays import get_graph_arrays
+from app.utils.query_planner import PLAN_ENGINES, QueryPlanner, HOT_SOURCE_QUERIES, weight_unit
+from app.utils.sssp_cache import spt_cache
+from app.utils.state_overlay import state_overlay
+from app.utils import algorithms
+
+
+class TestQueryPlanner(unittest.TestCase):
+    """
+    Verifica o planejador adaptativo: todos os motores são exatos e as regras
+    de escolha (atalhos, reaproveitamento de árvores, latência) são aplicadas.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cities_path = os.path.join(project_root, 'data', 'cities.json')
+        cls.df, cls.name_to_id, cls.id_to_name = load_data(cities_path)
+        cls.df = cls.df.head(300)
+        cls.graph = build_graph(cls.df, d=400)
+        component = max(nx.connected_components(cls.graph), key=len)
+        cls.component = sorted(component)
+        cls.isolated = next((node for node in cls.graph if node not in component), None)
+
+    def setUp(self):
+        spt_cache.clear()
+        state_overlay.clear()
+        self.planner = QueryPlanner()
+
+    def _far_pair(self, offset=0):
+        start = self.component[offset]
+        end = next(node for node in reversed(self.component)
+                   if node != start and not self.graph.has_edge(start, node))
+        return start, end
+
+    def test_engines_are_exact(self):
+        self.assertEqual(weight_unit(get_graph_arrays(self.graph)), 'km')
+        start, end = self._far_pair()
+        expected = nx.dijkstra_path_length(self.graph, start, end)
+        # Decisões do planejador e motores exatos do registro, executados pelo mesmo caminho
+        engines = [engine for engine, name in PLAN_ENGINES.items() if name is not None]
+        engines += algorithms.find_engines(task='shortest_path', certainty='exact')
+        for engine in engines:
+            path, dist, record = self.planner.run(self.graph, start, end, engine=engine)
+            self.assertAlmostEqual(dist, expected, places=6, msg=engine)
+            self.assertEqual((path[0], path[-1]), (start, end))
+            self.assertAlmostEqual(nx.path_weight(self.graph, path, 'weight'), expected, places=6)
+
+    def test_dispatches_through_engine_registry(self):
+        self.assertTrue(all(name is None or name in algorithms.ENGINE_REGISTRY for name in PLAN_ENGINES.values()))
+        start, end = self._far_pair()
+        original = algorithms.ENGINE_REGISTRY['bidirectional_dijkstra']
+        calls = []
+
+        def spy(graph, source, target):
+            calls.append((source, target))
+            return original.run(graph, source, target)
+        algorithms.register_engine('bidirectional_dijkstra', 'shortest_path', 'python', spy, weights='any')
+        try:
+            self.planner.run(self.graph, start, end, engine='bidirectional')
+        finally:
+            algorithms.ENGINE_REGISTRY['bidirectional_dijkstra'] = original
+        self.assertEqual(calls, [(start, end)])
+        with self.assertRaises(ValueError):
+            self.planner.run(self.graph, start, end, engine='inexistente')
+
+    def test_shortcut_rules(self):
+        start = self.component[0]
+        self.assertEqual(self.planner.plan(self.graph, start, start)['engine'], 'trivial')
+        neighbor = next(iter(self.graph[start]))
+        path, dist, record = self.planner.run(self.graph, start, neighbor)
+        self.assertEqual(record['engine'], 'direct')
+        self.assertAlmostEqual(dist, nx.dijkstra_path_length(self.graph, start, neighbor), places=6)
+        if self.isolated is not None:
+            path, dist, record = self.planner.run(self.graph, start, self.isolated)
+            self.assertEqual(record['engine'], 'components')
+            self.assertIsNone(path)
+
+    def test_reuses_trees_for_frequent_cities(self):
+        start, end = self._far_pair()
+        for _ in range(HOT_SOURCE_QUERIES - 1):
+            self.planner.run(self.graph, start, end)
+        path, dist, record = self.planner.run(self.graph, start, end)
+        self.assertEqual(record['engine'], 'hot_source')
+        # A árvore da cidade frequente fica em cache para as próximas consultas
+        other = next(node for node in self.component
+                     if node not in (start, end) and not self.graph.has_edge(node, start))
+        path, dist, record = self.planner.run(self.graph, other, start)
+        self.assertEqual(record['engine'], 'tree_cache')
+        self.assertAlmostEqual(dist, nx.dijkstra_path_length(self.graph, other, start), places=6)
+        self.assertEqual((path[0], path[-1]), (other, start))
+
+    def test_planned_search_and_stats(self):
+        pairs = [self._far_pair(offset) for offset in range(5)]
+        for start, end in pairs:
+            path, dist, elapsed, plan = algorithms.planned_search(self.graph, start, end)
+            self.assertAlmostEqual(dist, nx.dijkstra_path_length(self.graph, start, end), places=6)
+            self.assertIn(plan['engine'], PLAN_ENGINES)
+            self.assertGreaterEqual(elapsed, 0)
+        self.assertIsNone(algorithms.planned_search(self.graph, -1, pairs[0][1])[3])
+        stats = self.planner.stats()
+        self.assertEqual(stats, {})
+        self.planner.run(self.graph, *pairs[0])
+        stats = self.planner.stats()
+        self.assertEqual(sum(entry['queries'] for entry in stats.values()), 1)
+        self.planner.clear()
+        self.assertEqual(len(self.planner.history), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
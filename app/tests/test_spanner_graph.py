@@ -0,0 +1,68 @@
+import sys
+import os
+import unittest
+
+# Adiciona o diretório raiz do projeto ao caminho do Python
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, '../..'))
+sys.path.append(project_root)
+
+from app.utils.data_loader import load_data
+from app.utils.graph_utils import build_graph
+from app.utils.corridor_graph import build_radius_graph
+from app.utils.spanner_graph import build_yao_graph, cones_for_stretch, measure_stretch
+
+
+class TestSpannerGraph(unittest.TestCase):
+    """
+    Verifica o grafo de Yao (t-spanner) e o alongamento medido em relação ao grafo de raio.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cities_path = os.path.join(project_root, 'data', 'cities.json')
+        cls.df, cls.name_to_id, cls.id_to_name = load_data(cities_path)
+        cls.df = cls.df.head(300)
+        cls.full = build_graph(cls.df, d=1200)
+
+    def test_cones_for_stretch(self):
+        self.assertEqual(cones_for_stretch(1.5), 19)
+        self.assertEqual(cones_for_stretch(2.0), 13)
+        self.assertGreaterEqual(cones_for_stretch(100.0), 7)
+        with self.assertRaises(ValueError):
+            cones_for_stretch(1.0)
+
+    def test_radius_graph_matches_build_graph(self):
+        """A construção com a árvore espacial produz o mesmo grafo do laço sobre todos os pares."""
+        fast = build_radius_graph(self.df, d=1200)
+        self.assertEqual(list(fast.nodes()), list(self.full.nodes()))
+        self.assertEqual(sorted(fast.edges()), sorted(self.full.edges()))
+        for u, v, data in fast.edges(data=True):
+            self.assertEqual(data, self.full.get_edge_data(u, v))
+
+    def test_subgraph_of_radius_graph(self):
+        spanner = build_yao_graph(self.df, d=1200, stretch=1.5)
+        self.assertEqual(list(spanner.nodes()), list(self.full.nodes()))
+        self.assertLess(spanner.number_of_edges(), self.full.number_of_edges())
+        self.assertLessEqual(spanner.number_of_edges(), spanner.graph['spanner']['cones'] * len(self.df))
+        for u, v, data in spanner.edges(data=True):
+            self.assertEqual(data, self.full.get_edge_data(u, v))
+
+    def test_measured_stretch(self):
+        for stretch in (1.5, 2.0):
+            spanner = build_yao_graph(self.df, d=1200, stretch=stretch)
+            stats = measure_stretch(self.full, spanner, list(self.full.nodes())[::30])
+            self.assertEqual(stats['disconnected'], 0)
+            self.assertGreater(stats['pairs'], 0)
+            self.assertLessEqual(stats['max_stretch'], stretch)
+            self.assertGreaterEqual(stats['mean_stretch'], 1.0 - 1e-12)
+
+    def test_build_graph_mode(self):
+        spanner = build_graph(self.df, d=1200, mode='yao', cones=10)
+        self.assertEqual(spanner.graph['spanner']['cones'], 10)
+        with self.assertRaises(ValueError):
+            build_graph(self.df, d=1200, mode='foo')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+import sys
+import os
+import unittest
+import networkx as nx
+import numpy as np
+
+# Adiciona o diretório raiz do projeto ao caminho do Python
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, '../..'))
+sys.path.append(project_root)
+
+from app.utils.data_loader import load_data
+from app.utils.graph_utils import build_graph
+from app.utils.graph_arrays import get_graph_arrays, invalidate_graph_arrays
+from app.utils.sssp_cache import ShortestPathTreeCache, shortest_path_tree
+from app.utils.algorithms import dijkstra_search
+
+
+class TestShortestPathTreeCache(unittest.TestCase):
+    """
+    Verifica o cache de árvores de caminhos mínimos por origem/destino.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cities_path = os.path.join(project_root, 'data', 'cities.json')
+        cls.df, cls.name_to_id, cls.id_to_name = load_data(cities_path)
+        cls.df = cls.df.head(200)
+        cls.graph = build_graph(cls.df, r=5.0)
+
+    def test_tree_matches_networkx(self):
+        """As distâncias da árvore devem coincidir com as do Dijkstra do NetworkX."""
+        arrays = get_graph_arrays(self.graph)
+        dist, parent = shortest_path_tree(arrays, arrays.index[0])
+        expected = nx.single_source_dijkstra_path_length(self.graph, 0, weight='weight')
+        for node, i in arrays.index.items():
+            if node in expected:
+                self.assertAlmostEqual(dist[i], expected[node])
+            else:
+                self.assertTrue(np.isinf(dist[i]))
+                self.assertEqual(parent[i], -1)
+
+    def test_forward_and_reverse_hits(self):
+        """Consultas a partir da origem ou com destino nela são respondidas pelo cache."""
+        cache = ShortestPathTreeCache()
+        reachable = [n for n in nx.node_connected_component(self.graph, 0) if n != 0][:3]
+        path, dist, hit = cache.query(self.graph, 0, reachable[0])
+        self.assertFalse(hit)
+        self.assertAlmostEqual(dist, nx.shortest_path_length(self.graph, 0, reachable[0], weight='weight'))
+
+        path, dist, hit = cache.query(self.graph, 0, reachable[1])
+        self.assertTrue(hit)
+        self.assertEqual(path[0], 0)
+
+        path, dist, hit = cache.query(self.graph, reachable[2], 0)
+        self.assertTrue(hit)
+        self.assertEqual(path[0], reachable[2])
+        self.assertEqual(path[-1], 0)
+        self.assertAlmostEqual(dist, nx.shortest_path_length(self.graph, reachable[2], 0, weight='weight'))
+
+        stats = cache.stats()
+        self.assertEqual(stats['hits'], 2)
+        self.assertEqual(stats['misses'], 1)
+        self.assertGreater(stats['bytes'], 0)
+
+    def test_lru_eviction_by_bytes(self):
+        """Ao exceder o limite de bytes, a árvore menos usada recentemente é removida."""
+        arrays = get_graph_arrays(self.graph)
+        tree_bytes = arrays.n * (8 + 4)
+        cache = ShortestPathTreeCache(max_bytes=2 * tree_bytes)
+        cache.tree(arrays, 0)
+        cache.tree(arrays, 1)
+        cache.tree(arrays, 0)
+        cache.tree(arrays, 2)
+        self.assertIsNotNone(cache.get(arrays.fingerprint, 0))
+        self.assertIsNone(cache.get(arrays.fingerprint, 1))
+        self.assertEqual(cache.stats()['evictions'], 1)
+
+    def test_dijkstra_search_with_tree_cache(self):
+        """dijkstra_search com cache retorna a mesma distância que a versão bidirecional."""
+        end = max(nx.node_connected_component(self.graph, 0))
+        _, expected, _ = dijkstra_search(self.graph, self.df, 0, end)
+        path, dist, _ = dijkstra_search(self.graph, self.df, 0, end, use_tree_cache=True)
+        self.assertAlmostEqual(dist, expected)
+        self.assertEqual(path[-1], end)
+
+    def test_in_place_changes_refresh_fingerprint(self):
+        """Religar arestas ou trocar pesos in place não reaproveita arrays (nem árvores) antigos."""
+        graph = self.graph.copy()
+        cache = ShortestPathTreeCache()
+        end = max(nx.node_connected_component(graph, 0))
+        fingerprint = get_graph_arrays(graph).fingerprint
+        _, dist, _ = cache.query(graph, 0, end)
+
+        # Todos os pesos multiplicados: a amostra de arestas percebe a mudança
+        for _, _, data in graph.edges(data=True):
+            data['weight'] *= 2
+        self.assertNotEqual(get_graph_arrays(graph).fingerprint, fingerprint)
+        _, doubled, hit = cache.query(graph, 0, end)
+        self.assertFalse(hit)
+        self.assertAlmostEqual(doubled, 2 * dist)
+
+        # Religação com o mesmo número de arestas
+        fingerprint = get_graph_arrays(graph).fingerprint
+        u, v = next(iter(graph.edges()))
+        w = next(node for node in graph if node not in (u, v) and not graph.has_edge(u, node))
+        data = graph.get_edge_data(u, v)
+        graph.remove_edge(u, v)
+        graph.add_edge(u, w, **data)
+        arrays = get_graph_arrays(graph)
+        self.assertNotEqual(arrays.fingerprint, fingerprint)
+        self.assertGreaterEqual(arrays.edge_position(arrays.index[u], arrays.index[w]), 0)
+
+        # Peso de uma aresta isolada: invalidação explícita
+        fingerprint = arrays.fingerprint
+        graph[u][w]['weight'] += 1.0
+        invalidate_graph_arrays(graph)
+        self.assertNotEqual(get_graph_arrays(graph).fingerprint, fingerprint)
+
+
+if __name__ == "__main__":
+    unittest.main()
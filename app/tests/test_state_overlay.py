@@ -0,0 +1,78 @@
+import sys
+import os
+import random
+import unittest
+
+# Adiciona o diretório raiz do projeto ao caminho do Python
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, '../..'))
+sys.path.append(project_root)
+
+from app.utils.data_loader import load_data
+from app.utils.graph_utils import build_graph
+from app.utils.algorithms import dijkstra_search, path_distance
+from app.utils.state_overlay import StateOverlay
+
+
+class TestStateOverlay(unittest.TestCase):
+    """
+    Verifica o roteamento em dois níveis por estados: resultados iguais ao Dijkstra
+    e pré-processamento incremental.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cities_path = os.path.join(project_root, 'data', 'cities.json')
+        cls.df, cls.name_to_id, cls.id_to_name = load_data(cities_path)
+        cls.df = cls.df.head(300)
+        cls.graph = build_graph(cls.df, d=400)
+
+    def test_matches_dijkstra(self):
+        overlay = StateOverlay()
+        nodes = list(self.graph.nodes())
+        rng = random.Random(7)
+        for _ in range(25):
+            start, end = rng.sample(nodes, 2)
+            expected_path, expected_dist, _ = dijkstra_search(self.graph, self.df, start, end, use_tree_cache=True)
+            path, dist, _ = overlay.query(self.graph, start, end)
+            if expected_path is None:
+                self.assertIsNone(path)
+                continue
+            self.assertEqual(path, expected_path)
+            self.assertAlmostEqual(dist, expected_dist, places=6)
+            self.assertAlmostEqual(path_distance(self.graph, path), dist, places=6)
+
+    def test_same_state_and_trivial_queries(self):
+        overlay = StateOverlay()
+        california = [n for n in self.graph.nodes() if self.graph.nodes[n]['state'] == 'California']
+        start, end = california[0], california[-1]
+        expected_path, _, _ = dijkstra_search(self.graph, self.df, start, end, use_tree_cache=True)
+        self.assertEqual(overlay.query(self.graph, start, end)[0], expected_path)
+        self.assertEqual(overlay.query(self.graph, start, start)[:2], ([start], 0.0))
+
+    def test_incremental_preprocessing(self):
+        """Reconstruir o grafo sem uma cidade recalcula apenas os estados afetados."""
+        overlay = StateOverlay()
+        overlay.prepare(self.graph)
+        states = overlay.stats()['states']
+        self.assertEqual(overlay.cells_built, states)
+
+        # Grafo igual reconstruído: nenhuma célula recalculada
+        overlay.prepare(build_graph(self.df, d=400))
+        self.assertEqual(overlay.cells_built, states)
+
+        texas = [n for n in self.graph.nodes() if self.graph.nodes[n]['state'] == 'Texas']
+        reduced = build_graph(self.df[self.df['city_id'] != texas[3]], d=400)
+        overlay.prepare(reduced)
+        rebuilt = overlay.cells_built - states
+        self.assertGreaterEqual(rebuilt, 1)
+        self.assertLess(rebuilt, states // 2)
+
+        nodes = list(reduced.nodes())
+        start, end = nodes[0], nodes[-1]
+        expected_path, _, _ = dijkstra_search(reduced, self.df, start, end, use_tree_cache=True)
+        self.assertEqual(dijkstra_search(reduced, self.df, start, end, use_overlay=True)[0], expected_path)
+
+
+if __name__ == '__main__':
+    unittest.main()
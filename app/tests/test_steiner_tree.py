@@ -0,0 +1,75 @@
+import sys
+import os
+import itertools
+import unittest
+import folium
+import networkx as nx
+
+# Adiciona o diretório raiz do projeto ao caminho do Python
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, '../..'))
+sys.path.append(project_root)
+
+from app.utils.data_loader import load_data
+from app.utils.graph_utils import build_graph
+from app.utils.steiner_tree import largest_city_per_state, steiner_tree
+from app.components import map_display
+
+
+class TestSteinerTree(unittest.TestCase):
+    """
+    Verifica a árvore de Steiner aproximada (Mehlhorn) e sua exibição no mapa.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cities_path = os.path.join(project_root, 'data', 'cities.json')
+        cls.df, cls.name_to_id, cls.id_to_name = load_data(cities_path)
+        cls.df = cls.df.head(300)
+        cls.graph = build_graph(cls.df, d=500)
+        component = max(nx.connected_components(cls.graph), key=len)
+        cls.terminals = [node for node in largest_city_per_state(cls.df) if node in component]
+
+    def test_tree_connects_terminals(self):
+        result = steiner_tree(self.graph, self.terminals)
+        tree = nx.Graph(result['edges'])
+        self.assertTrue(nx.is_tree(tree))
+        self.assertEqual(result['components'], 1)
+        self.assertTrue(all(node in tree for node in self.terminals))
+        leaves = [node for node in tree if tree.degree(node) == 1]
+        self.assertTrue(set(leaves) <= set(self.terminals))
+        self.assertEqual(set(result['steiner_nodes']), set(tree) - set(self.terminals))
+        cost = sum(self.graph[u][v]['weight'] for u, v in result['edges'])
+        self.assertAlmostEqual(result['cost'], cost, places=6)
+        self.assertEqual(set(result['timings']), {'voronoi', 'bridges', 'mst', 'expand', 'prune'})
+
+        # Não pior que a árvore geradora mínima do fecho métrico dos terminais
+        closure = nx.Graph()
+        for u, v in itertools.combinations(self.terminals, 2):
+            closure.add_edge(u, v, weight=nx.dijkstra_path_length(self.graph, u, v))
+        self.assertLessEqual(result['cost'], nx.minimum_spanning_tree(closure).size(weight='weight') + 1e-6)
+
+    def test_disconnected_terminals(self):
+        isolated = [node for node in self.graph.nodes() if self.graph.degree(node) == 0]
+        if not isolated:
+            self.skipTest("Sem cidades isoladas no grafo de teste")
+        result = steiner_tree(self.graph, self.terminals + isolated[:1])
+        self.assertEqual(result['components'], 2)
+
+    def test_two_terminals_is_shortest_path(self):
+        start, end = self.terminals[0], self.terminals[1]
+        result = steiner_tree(self.graph, [start, end, start])
+        self.assertEqual(len(result['terminals']), 2)
+        self.assertAlmostEqual(result['cost'], nx.dijkstra_path_length(self.graph, start, end), places=6)
+
+    def test_map_layers(self):
+        result = steiner_tree(self.graph, self.terminals[:5])
+        m = map_display.display_steiner_tree_map(self.graph, result)
+        self.assertIsNotNone(m)
+        lines = [child for group in m._children.values() if isinstance(group, folium.FeatureGroup)
+                 for child in group._children.values() if isinstance(child, folium.PolyLine)]
+        self.assertEqual(len(lines), len(result['edges']))
+
+
+if __name__ == '__main__':
+    unittest.main()
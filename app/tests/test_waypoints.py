@@ -0,0 +1,79 @@
+import sys
+import os
+import itertools
+import unittest
+import networkx as nx
+import numpy as np
+
+# Adiciona o diretório raiz do projeto ao caminho do Python
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, '../..'))
+sys.path.append(project_root)
+
+from app.utils.data_loader import load_data
+from app.utils.graph_utils import build_graph
+from app.utils.algorithms import path_distance, waypoint_search
+from app.utils.waypoints import held_karp, plan_route, two_opt
+
+
+def brute_force(matrix):
+    m = len(matrix) - 2
+    return min(
+        sum(matrix[a, b] for a, b in zip((0,) + order, order + (m + 1,)))
+        for order in itertools.permutations(range(1, m + 1))
+    )
+
+
+class TestWaypoints(unittest.TestCase):
+    """
+    Verifica o planejamento de rotas com paradas intermediárias (Held-Karp e 2-opt).
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cities_path = os.path.join(project_root, 'data', 'cities.json')
+        cls.df, cls.name_to_id, cls.id_to_name = load_data(cities_path)
+        cls.df = cls.df.head(300)
+        cls.graph = build_graph(cls.df, d=500)
+        component = max(nx.connected_components(cls.graph), key=len)
+        cls.nodes = [node for node in cls.graph.nodes() if node in component]
+
+    def test_held_karp_matches_brute_force(self):
+        rng = np.random.default_rng(7)
+        for m in (1, 3, 6):
+            points = rng.uniform(0, 100, size=(m + 2, 2))
+            matrix = np.linalg.norm(points[:, None] - points[None, :], axis=2)
+            order, cost = held_karp(matrix)
+            self.assertEqual(sorted(order), list(range(1, m + 1)))
+            self.assertAlmostEqual(cost, brute_force(matrix), places=9)
+            self.assertLessEqual(cost, two_opt(matrix)[1] + 1e-9)
+
+    def test_unreachable_stop(self):
+        matrix = np.ones((4, 4)) - np.eye(4)
+        matrix[2, :] = matrix[:, 2] = np.inf
+        matrix[2, 2] = 0.0
+        self.assertEqual(held_karp(matrix), (None, float('inf')))
+        self.assertEqual(two_opt(matrix), (None, float('inf')))
+
+    def test_plan_visits_all_stops(self):
+        start, end = self.nodes[0], self.nodes[1]
+        waypoints = self.nodes[5:11] + [start]
+        plan, elapsed = waypoint_search(self.graph, start, end, waypoints)
+        self.assertGreaterEqual(elapsed, 0)
+        self.assertTrue(plan['exact'])
+        self.assertEqual(plan['path'][0], start)
+        self.assertEqual(plan['path'][-1], end)
+        self.assertEqual(sorted(plan['stops']), sorted(self.nodes[5:11]))
+        for stop in plan['stops']:
+            self.assertIn(stop, plan['path'])
+        self.assertAlmostEqual(path_distance(self.graph, plan['path']), plan['distance'], places=6)
+        self.assertAlmostEqual(sum(plan['legs']), plan['distance'], places=6)
+        self.assertEqual(set(plan['timings']), {'matrix', 'order', 'stitch'})
+
+        approximate = plan_route(self.graph, start, end, waypoints, exact_limit=0)
+        self.assertFalse(approximate['exact'])
+        self.assertGreaterEqual(approximate['distance'], plan['distance'] - 1e-9)
+
+
+if __name__ == '__main__':
+    unittest.main()
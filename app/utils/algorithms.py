@@ -6,7 +6,28 @@ from collections import deque
 from functools import lru_cache
 
 import networkx as nx
-from app.utils.graph_utils import calculate_haversine_distance  # Corrigido o caminho de importação
+import numpy as np
+from app.utils.graph_utils import calculate_haversine_distance, haversine_distances  # Corrigido o caminho de importação
+from app.utils.graph_arrays import get_graph_arrays
+from app.utils.priority_queues import make_queue_factory
+from app.utils.sssp_cache import shortest_path_tree, spt_cache, walk_parents
+from app.utils.state_overlay import state_overlay
+from app.utils.geometric_pruning import make_pruner
+from app.utils.cost_model import get_edge_cost_model, node_penalties, penalties_for_nodes
+from app.utils.lexicographic_engine import get_lexicographic_model, lexicographic_path
+from app.utils.nearest_targets import nearest_matching
+from app.utils.waypoints import plan_route
+from app.utils.hop_limited import hop_limited_path
+from app.utils.parametric_path import radius_sweep
+from app.utils.query_planner import label_components, query_planner
+from app.utils.csgraph_backend import csgraph_component_labels, csgraph_min_hop_path, csgraph_shortest_path
+from app.utils.fuzzy_engine import certainty_restricted_path, get_fuzzy_edge_model, get_widest_path_oracle
+from app.utils.bfs_engine import (
+    calibrated_parallel_threshold,
+    frontier_expander,
+    level_synchronous_bfs,
+    min_hop_path,
+)
 
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
@@ -79,17 +100,34 @@ def fuzzy(graph, cities_df, start, end):
 
 # DIJKSTRA
 ####################################
-def dijkstra_search(graph, cities_df, start, end):
+def dijkstra_search(graph, cities_df, start, end, use_tree_cache=False, queue=None, pruning=None,
+                    use_overlay=False):
     """
     Dijkstra bidirecional: inicia buscas simultâneas do início e do fim.
     Ultra-eficiente para caminhos ponto-a-ponto.
     Usa critérios plugáveis (população nos desempates) e aproveita cities_df se possível.
 
+    Com use_tree_cache=True, a consulta é respondida pelo cache de árvores de
+    caminhos mínimos (spt_cache): consultas que partem de uma origem já vista,
+    ou que chegam nela, são resolvidas percorrendo os predecessores.
+
+    Com use_overlay=True, a consulta usa o roteamento em dois níveis por estados
+    (state_overlay): busca completa nos estados de origem e destino e, nos demais,
+    apenas pelas distâncias pré-calculadas entre as cidades de fronteira.
+
+    Com pruning, os nós fora da elipse start/end (limite inferior geométrico maior
+    que o custo da melhor rota conhecida) não são relaxados; o limite é reduzido a
+    cada ponto de encontro melhor.
+
     Args:
         graph: NetworkX graph
         cities_df: DataFrame OU dict (nome->dados) com informações relevantes da cidade
         start: origem
         end: destino
+        use_tree_cache: usa o cache de árvores por origem/destino
+        use_overlay: usa a sobreposição por estados (pré-processamento incremental)
+        queue: fila de prioridade ('heapq', 'radix', 'dary', ou fábrica); default: heapq
+        pruning: True ou EllipsePruner para ativar a poda geométrica (ver make_pruner)
 
     Return:
         path: lista de cidades no caminho ótimo, ou None
@@ -117,6 +155,16 @@ def dijkstra_search(graph, cities_df, start, end):
     if start not in graph or end not in graph:
         return None, float('inf'), 0
 
+    if use_tree_cache:
+        path, total_dist, _ = spt_cache.query(graph, start, end)
+        return path, total_dist, (time.perf_counter() - start_time) * 1000
+
+    if use_overlay:
+        path, total_dist, _ = state_overlay.query(graph, start, end)
+        return path, total_dist, (time.perf_counter() - start_time) * 1000
+
+    pruner = make_pruner(graph, start, end, pruning)
+
     # Inicialização para ambas as buscas
     distances_start = {node: float('inf') for node in graph.nodes()}
     distances_end = {node: float('inf') for node in graph.nodes()}
@@ -126,8 +174,11 @@ def dijkstra_search(graph, cities_df, start, end):
     distances_start[start] = 0
     distances_end[end] = 0
 
-    heap_start = [(0, get_population(start), 0, start)]
-    heap_end = [(0, get_population(end), 0, end)]
+    make_queue = make_queue_factory(queue)
+    heap_start = make_queue()
+    heap_end = make_queue()
+    heap_start.push((0, get_population(start), 0, start))
+    heap_end.push((0, get_population(end), 0, end))
 
     visited_start = dict()
     visited_end = dict()
@@ -137,12 +188,12 @@ def dijkstra_search(graph, cities_df, start, end):
 
     while heap_start and heap_end:
         # Expanda pelo lado que tem menor distância somada até agora (melhor balanceamento)
-        if heap_start[0][0] + heap_end[0][0] > best_path_len:
+        if heap_start.peek()[0] + heap_end.peek()[0] > best_path_len:
             break
 
         # Expandir da origem
-        if heap_start[0][0] <= heap_end[0][0]:
-            dist, _, _, u = heapq.heappop(heap_start)
+        if heap_start.peek()[0] <= heap_end.peek()[0]:
+            dist, _, _, u = heap_start.pop()
             if u in visited_start:
                 continue
             visited_start[u] = dist
@@ -153,20 +204,24 @@ def dijkstra_search(graph, cities_df, start, end):
                 if total_length < best_path_len:
                     best_path_len = total_length
                     best_meeting = u
+                    if pruner:
+                        pruner.tighten(best_path_len)
 
             for v in graph.neighbors(u):
                 edge_data = graph.get_edge_data(u, v)
                 weight = edge_data.get('weight', 1)
                 alt = dist + weight
                 if alt < distances_start[v]:
+                    if pruner and not pruner.allows(v):
+                        continue
                     distances_start[v] = alt
                     parents_start[v] = u
                     counter += 1
-                    heapq.heappush(heap_start, (alt, get_population(v), counter, v))
+                    heap_start.push((alt, get_population(v), counter, v))
 
         # Expandir do destino
         else:
-            dist, _, _, u = heapq.heappop(heap_end)
+            dist, _, _, u = heap_end.pop()
             if u in visited_end:
                 continue
             visited_end[u] = dist
@@ -176,6 +231,8 @@ def dijkstra_search(graph, cities_df, start, end):
                 if total_length < best_path_len:
                     best_path_len = total_length
                     best_meeting = u
+                    if pruner:
+                        pruner.tighten(best_path_len)
 
             for v in graph.neighbors(u):
                 # Como é busca reversa, devemos considerar arestas (v, u)
@@ -183,10 +240,12 @@ def dijkstra_search(graph, cities_df, start, end):
                 weight = edge_data.get('weight', 1)
                 alt = dist + weight
                 if alt < distances_end[v]:
+                    if pruner and not pruner.allows(v):
+                        continue
                     distances_end[v] = alt
                     parents_end[v] = u
                     counter += 1
-                    heapq.heappush(heap_end, (alt, get_population(v), counter, v))
+                    heap_end.push((alt, get_population(v), counter, v))
 
     elapsed_time = (time.perf_counter() - start_time) * 1000
 
@@ -198,12 +257,180 @@ def dijkstra_search(graph, cities_df, start, end):
     total_dist = path_distance(graph, path)
     return path, total_dist, elapsed_time
 
+# PLANEJADOR ADAPTATIVO (escolhe o motor por consulta)
+####################################
+def planned_search(graph, start, end, engine=None):
+    """
+    Menor rota entre start e end pelo motor exato mais barato para a consulta,
+    escolhido pelo planejador (ver query_planner.QueryPlanner) a partir das
+    estatísticas do grafo, dos índices já calculados e da latência recente.
+
+    Args:
+        graph: Grafo NetworkX
+        start: origem
+        end: destino
+        engine: força uma decisão de query_planner.PLAN_ENGINES ou um motor de
+            ENGINE_REGISTRY (None: o planejador decide)
+
+    Returns:
+        path: lista de cidades no caminho, ou None
+        total_dist: soma dos pesos das arestas do caminho
+        elapsed_time_ms: duração (ms), incluindo o planejamento
+        plan: registro do plano ('engine', 'reason', 'density', 'ms', 'found', ...)
+    """
+    if start not in graph or end not in graph:
+        return None, float('inf'), 0, None
+    path, total_dist, plan = query_planner.run(graph, start, end, engine=engine)
+    return path, total_dist, plan['ms'], plan
+
+# LEXICOGRÁFICA (distância, população)
+####################################
+def lexicographic_search(graph, start, end, scale=None):
+    """
+    Menor distância total e, entre as rotas de mesma distância, menor população
+    total ao longo da rota (incluindo origem e destino).
+
+    Ao contrário do desempate por população no momento da retirada do heap (usado
+    pelas outras buscas), o critério vale para a rota inteira. Os pesos são
+    convertidos para ponto fixo (ver lexicographic_engine) e os dois critérios são
+    empacotados em uma única chave inteira, então os empates são exatos.
+
+    Args:
+        graph: Grafo NetworkX
+        start: origem
+        end: destino
+        scale: fator do ponto fixo dos pesos (default: 1000, ou menor se necessário)
+
+    Returns:
+        path: lista de cidades no caminho, ou None
+        total_dist: soma dos pesos das arestas do caminho
+        elapsed_time_ms: duração (ms)
+        total_population: população somada das cidades do caminho
+    """
+    start_time = time.perf_counter()
+    if start not in graph or end not in graph:
+        return None, float('inf'), 0, 0
+
+    model = get_lexicographic_model(graph, scale=scale)
+    arrays = model.arrays
+    path_indices, key = lexicographic_path(model, arrays.index[start], arrays.index[end])
+    elapsed_time = (time.perf_counter() - start_time) * 1000
+    if path_indices is None:
+        return None, float('inf'), elapsed_time, 0
+    _, total_population = model.unpack(key)
+    return arrays.path_to_nodes(path_indices), arrays.path_weight(path_indices), elapsed_time, total_population
+
+# CIDADE MAIS PRÓXIMA QUE ATENDE A UM CRITÉRIO (vários destinos)
+####################################
+def nearest_city_search(graph, start, predicate, k=1):
+    """
+    Cidades alcançáveis mais próximas da origem que satisfazem um predicado, com
+    uma única busca a partir da origem (em vez de uma busca por candidata).
+
+    Args:
+        graph: Grafo NetworkX
+        start: origem
+        predicate: função vetorizada (arrays) -> máscara booleana por nó, como
+            nearest_targets.population_at_least(100000) ou nearest_targets.in_state('Texas')
+        k: número de cidades a retornar (em ordem de distância)
+
+    Returns:
+        results: lista de dicionários com 'node', 'path' e 'distance'
+        elapsed_time_ms: duração (ms)
+    """
+    start_time = time.perf_counter()
+    results = nearest_matching(graph, start, predicate, k=k)
+    return results, (time.perf_counter() - start_time) * 1000
+
+# ROTA COM PARADAS INTERMEDIÁRIAS
+####################################
+def waypoint_search(graph, start, end, waypoints):
+    """
+    Rota de start a end passando por todas as paradas, na ordem de visita de menor
+    distância total (exata até waypoints.EXACT_LIMIT paradas, 2-opt acima disso).
+
+    Args:
+        graph: Grafo NetworkX
+        start: origem
+        end: destino
+        waypoints: paradas intermediárias, em qualquer ordem
+
+    Returns:
+        plan: dicionário de waypoints.plan_route ('path', 'distance', 'stops', 'legs',
+            'exact' e 'timings' por etapa), ou None se algum ponto não estiver no grafo
+        elapsed_time_ms: duração total (ms)
+    """
+    start_time = time.perf_counter()
+    if any(node not in graph for node in [start, end, *waypoints]):
+        return None, 0
+    plan = plan_route(graph, start, end, waypoints)
+    return plan, (time.perf_counter() - start_time) * 1000
+
+# MENOR CAMINHO COM LIMITE DE PARADAS
+####################################
+def hop_limited_search(graph, start, end, max_stops, frontier=True):
+    """
+    Rota mais barata com no máximo `max_stops` cidades intermediárias (ou seja, até
+    max_stops + 1 arestas), via Bellman-Ford em camadas (ver hop_limited).
+
+    Args:
+        graph: Grafo NetworkX
+        start: origem
+        end: destino
+        max_stops: número máximo de cidades intermediárias
+        frontier: relaxar, em cada camada, apenas as arestas dos nós melhorados na anterior
+
+    Returns:
+        path: lista de cidades no caminho, ou None se não houver rota dentro do limite
+        total_dist: soma dos pesos das arestas do caminho
+        elapsed_time_ms: duração (ms)
+        layers: métricas por camada ('layer', 'frontier', 'relaxed', 'improved', 'ms')
+    """
+    start_time = time.perf_counter()
+    if start not in graph or end not in graph:
+        return None, float('inf'), 0, []
+    path, total_dist, layers = hop_limited_path(graph, start, end, max_stops + 1, frontier=frontier)
+    return path, total_dist, (time.perf_counter() - start_time) * 1000, layers
+
+# MENOR ROTA EM FUNÇÃO DO RAIO DE CONEXÃO
+####################################
+def parametric_radius_search(cities_df, start, end, max_radius, unit='km'):
+    """
+    Menor rota entre start e end para todos os raios de conexão até max_radius, em
+    uma única varredura (ver parametric_path.radius_sweep), em vez de reconstruir o
+    grafo e refazer a busca para cada raio.
+
+    Args:
+        cities_df: DataFrame com dados das cidades
+        start: id da cidade de origem
+        end: id da cidade de destino
+        max_radius: maior raio considerado
+        unit: 'km' (conexão por d) ou 'graus' (conexão por r)
+
+    Returns:
+        breakpoints: pontos de quebra da função raio -> rota ('radius', 'distance',
+            'path', 'edges'); vazio se as cidades não se conectam até max_radius
+        elapsed_time_ms: duração (ms)
+    """
+    start_time = time.perf_counter()
+    breakpoints = radius_sweep(cities_df, start, end, max_radius, unit=unit)
+    return breakpoints, (time.perf_counter() - start_time) * 1000
+
 # FUZZY
 ####################################
-def fuzzy_search(graph, cities_df, start, end, r=None, d=None):
+def fuzzy_search(graph, cities_df, start, end, r=None, d=None, fuzzy_params=None, method='bidirectional',
+                 queue=None):
     """
-    Implementa busca fuzzy bidirecional aprimorada que balanceia distância e confiabilidade das conexões.
+    Implementa busca fuzzy que balanceia distância e confiabilidade das conexões.
     Utiliza um modelo fuzzy com penalização adaptativa para conexões menos confiáveis.
+    A certeza de cada aresta é pré-calculada (vetorizada) uma vez por grafo e conjunto
+    de parâmetros, de modo que a relaxação é apenas uma consulta a arrays.
+
+    O método 'bidirectional' (padrão) mantém a busca heurística bidirecional original.
+    No método 'exact', a maior certeza alcançável é obtida do oráculo de caminho
+    mais largo (árvore geradora máxima + LCA) e, em seguida, uma busca de menor
+    distância restrita às arestas com essa certeza retorna a rota: a certeza é
+    máxima e, entre as rotas com essa certeza, a distância é mínima.
     
     Args:
         graph: Grafo NetworkX com as cidades e conexões
@@ -212,6 +439,11 @@ def fuzzy_search(graph, cities_df, start, end, r=None, d=None):
         end: Cidade de destino
         r: Raio máximo de conexão em graus (opcional)
         d: Distância máxima em km (opcional)
+        fuzzy_params: parâmetros da função de pertinência (alpha, min_certainty,
+            decay_factor); default: DEFAULT_FUZZY_PARAMS
+        method: 'bidirectional' (busca heurística) ou 'exact' (oráculo de certeza +
+            busca restrita)
+        queue: fila de prioridade ('heapq', 'radix', 'dary', ou fábrica); default: heapq
         
     Returns:
         path: Lista de cidades no caminho encontrado
@@ -219,82 +451,68 @@ def fuzzy_search(graph, cities_df, start, end, r=None, d=None):
         elapsed_time: Tempo de execução em ms
         certainty: Valor de certeza da rota (percentual de confiabilidade)
     """
-    from utils.graph_utils import calculate_haversine_distance
     start_time = time.perf_counter()
     
     if start not in graph or end not in graph:
         return None, float('inf'), 0, 0.0
     
-    # Parâmetros configuráveis para a função de pertinência fuzzy
-    fuzzy_params = {
-        'alpha': 3.0,        # Limiar para certeza máxima (max_distance/alpha)
-        'min_certainty': 0.1, # Valor mínimo de certeza
-        'decay_factor': 0.9  # Fator de decaimento na interpolação
-    }
-    
-    # Função de pertinência fuzzy parametrizada
-    def membership_function(distance, max_distance, params=fuzzy_params):
-        if distance <= max_distance / params['alpha']:
-            return 1.0
-        elif distance >= max_distance:
-            return params['min_certainty']
-        else:
-            return 1.0 - (distance / max_distance) * params['decay_factor']
+    # Certezas e distâncias das arestas (cache por grafo e parâmetros)
+    model = get_fuzzy_edge_model(graph, r=r, d=d, params=fuzzy_params)
+    arrays = model.arrays
+
+    if method == 'exact':
+        oracle = get_widest_path_oracle(graph, r=r, d=d, params=fuzzy_params)
+        s, t = arrays.index[start], arrays.index[end]
+        best_certainty = oracle.best_certainty(s, t)
+        path_indices = None
+        if best_certainty > 0:
+            path_indices, _ = certainty_restricted_path(model, s, t, best_certainty, queue=queue)
+        elapsed_time = (time.perf_counter() - start_time) * 1000
+        if path_indices is None:
+            return None, float('inf'), elapsed_time, 0.0
+        return (arrays.path_to_nodes(path_indices), _fuzzy_path_distance(model, path_indices),
+                elapsed_time, best_certainty)
+
+    indptr, indices = model.indptr_list, model.indices_list
+    edge_dists, edge_certainties = model.edge_dist_list, model.certainty_list
+    populations = arrays.population.tolist()
+    n = arrays.n
+    s, t = arrays.index[start], arrays.index[end]
     
-    # Função heurística para guiar a busca (distância Haversine até o destino)
-    def heuristic(node, target):
-        node_attrs = {'latitude': graph.nodes[node]['latitude'], 'longitude': graph.nodes[node]['longitude']}
-        target_attrs = {'latitude': graph.nodes[target]['latitude'], 'longitude': graph.nodes[target]['longitude']}
-        return calculate_haversine_distance(node_attrs, target_attrs)
-    
-    # Determinar a distância máxima permitida e tipo de distância
-    if r is not None:
-        max_distance = r
-        distance_type = 'angular'
-    elif d is not None:
-        max_distance = d
-        distance_type = 'km'
-    else:
-        max_distance = max([data['weight'] for _, _, data in graph.edges(data=True)], default=10.0)
-        distance_type = 'weight'
-    
-    # Normalizar para distância em graus, se necessário
-    norm_max_distance = max_distance
-    if distance_type == 'km':
-        norm_max_distance = max_distance / 111  # Aproximação km para graus
+    # Heurística (distância Haversine até o destino/origem) calculada de uma vez
+    h_to_end = haversine_distances(arrays.latitude, arrays.longitude,
+                                   arrays.latitude[t], arrays.longitude[t]).tolist()
+    h_to_start = haversine_distances(arrays.latitude, arrays.longitude,
+                                     arrays.latitude[s], arrays.longitude[s]).tolist()
     
     # ----- ESTRUTURAS DE DADOS PARA BUSCA BIDIRECIONAL -----
     
     # Busca da origem
-    certeza_start = {node: 0.0 for node in graph.nodes()}
-    distances_start = {node: float('inf') for node in graph.nodes()}
-    predecessors_start = {node: None for node in graph.nodes()}
+    certeza_start = [0.0] * n
+    distances_start = [float('inf')] * n
+    predecessors_start = [None] * n
     visited_start = set()
-    certeza_start[start] = 1.0
-    distances_start[start] = 0
+    certeza_start[s] = 1.0
+    distances_start[s] = 0
     
     # Busca do destino
-    certeza_end = {node: 0.0 for node in graph.nodes()}
-    distances_end = {node: float('inf') for node in graph.nodes()}
-    predecessors_end = {node: None for node in graph.nodes()}
+    certeza_end = [0.0] * n
+    distances_end = [float('inf')] * n
+    predecessors_end = [None] * n
     visited_end = set()
-    certeza_end[end] = 1.0
-    distances_end[end] = 0
+    certeza_end[t] = 1.0
+    distances_end[t] = 0
     
     # Filas de prioridade para ambas as buscas
     # (-(certeza), distância + heurística, -população, contador, nó)
     # Usando -população para priorizar cidades MENORES
     counter = 0
-    
-    # Calcular heurísticas iniciais
-    h_start = heuristic(start, end)
-    h_end = heuristic(end, start)
-    
-    pq_start = [(-(certeza_start[start]), distances_start[start] + h_start, 
-                 -(graph.nodes[start].get('population', 0)), counter, start)]
+    make_queue = make_queue_factory(queue)
+    pq_start = make_queue()
+    pq_end = make_queue()
+    pq_start.push((-1.0, h_to_end[s], -populations[s], counter, s))
     counter += 1
-    pq_end = [(-(certeza_end[end]), distances_end[end] + h_end, 
-               -(graph.nodes[end].get('population', 0)), counter, end)]
+    pq_end.push((-1.0, h_to_start[t], -populations[t], counter, t))
     
     # Melhor ponto de encontro e suas métricas
     best_meeting_point = None
@@ -304,135 +522,56 @@ def fuzzy_search(graph, cities_df, start, end, r=None, d=None):
     # ----- BUSCA BIDIRECIONAL -----
     while pq_start and pq_end:
         # Critério de parada antecipada
-        if best_meeting_point and (-pq_start[0][0]) + (-pq_end[0][0]) < best_path_certainty:
+        if best_meeting_point is not None and (-pq_start.peek()[0]) + (-pq_end.peek()[0]) < best_path_certainty:
             break
         
         # Decidir qual lado expandir (alternando ou balanceando fronteiras)
-        expand_forward = len(visited_end) > len(visited_start)
+        if len(visited_end) > len(visited_start):
+            pq, visited, other_visited = pq_start, visited_start, visited_end
+            certeza, distances, predecessors, h_target = certeza_start, distances_start, predecessors_start, h_to_end
+        else:
+            pq, visited, other_visited = pq_end, visited_end, visited_start
+            certeza, distances, predecessors, h_target = certeza_end, distances_end, predecessors_end, h_to_start
         
-        # --- Expandir da origem ---
-        if expand_forward:
-            _, f_score, _, _, current = heapq.heappop(pq_start)
-            
-            if current in visited_start:
-                continue
-                
-            visited_start.add(current)
-            
-            # Verificar interseção com a busca reversa
-            if current in visited_end:
-                path_certainty = min(certeza_start[current], certeza_end[current])
-                total_distance = distances_start[current] + distances_end[current]
-                
-                if (path_certainty > best_path_certainty or 
-                    (path_certainty == best_path_certainty and total_distance < best_path_length)):
-                    best_meeting_point = current
-                    best_path_certainty = path_certainty
-                    best_path_length = total_distance
-            
-            # Explorar vizinhos
-            for neighbor in graph.neighbors(current):
-                if neighbor in visited_start:
-                    continue
-                    
-                edge_data = graph.get_edge_data(current, neighbor)
-                edge_dist = edge_data['weight']
-                
-                # Ajustar distância conforme o tipo
-                if distance_type == 'km' and 'km_dist' in edge_data:
-                    edge_dist = edge_data['km_dist']
-                elif distance_type == 'angular' and 'angular_dist' in edge_data:
-                    edge_dist = edge_data['angular_dist']
-                
-                distance = distances_start[current] + edge_dist
-                
-                # Calcular certeza desta conexão
-                edge_certainty = membership_function(edge_dist, norm_max_distance)
-                new_certainty = min(certeza_start[current], edge_certainty)
-                
-                # Verificar se é melhor caminho
-                if (new_certainty > certeza_start[neighbor] or 
-                    (new_certainty == certeza_start[neighbor] and distance < distances_start[neighbor])):
-                    certeza_start[neighbor] = new_certainty
-                    distances_start[neighbor] = distance
-                    predecessors_start[neighbor] = current
-                    
-                    # Calcular f_score (g + h) para priorização A*
-                    h = heuristic(neighbor, end)
-                    f_score = distance + h
-                    counter += 1
-                    
-                    # Priorizar cidades com menor população
-                    population = graph.nodes[neighbor].get('population', 0)
-                    heapq.heappush(pq_start, (
-                        -(new_certainty),   # Certeza (negativa para max heap)
-                        f_score,            # Distância + heurística
-                        -population,        # Prioriza cidades menores
-                        counter,            # Desempate final
-                        neighbor
-                    ))
+        _, _, _, _, current = pq.pop()
+        if current in visited:
+            continue
+        visited.add(current)
         
-        # --- Expandir do destino ---
-        else:
-            _, f_score, _, _, current = heapq.heappop(pq_end)
-            
-            if current in visited_end:
+        # Verificar interseção com a busca do outro lado
+        if current in other_visited:
+            path_certainty = min(certeza_start[current], certeza_end[current])
+            total_distance = distances_start[current] + distances_end[current]
+            if (path_certainty > best_path_certainty or
+                (path_certainty == best_path_certainty and total_distance < best_path_length)):
+                best_meeting_point = current
+                best_path_certainty = path_certainty
+                best_path_length = total_distance
+        
+        # Explorar vizinhos: certeza e distância da aresta são consultas a arrays
+        current_certainty = certeza[current]
+        current_distance = distances[current]
+        for pos in range(indptr[current], indptr[current + 1]):
+            neighbor = indices[pos]
+            if neighbor in visited:
                 continue
-                
-            visited_end.add(current)
-            
-            # Verificar interseção
-            if current in visited_start:
-                path_certainty = min(certeza_start[current], certeza_end[current])
-                total_distance = distances_start[current] + distances_end[current]
-                
-                if (path_certainty > best_path_certainty or 
-                    (path_certainty == best_path_certainty and total_distance < best_path_length)):
-                    best_meeting_point = current
-                    best_path_certainty = path_certainty
-                    best_path_length = total_distance
+            distance = current_distance + edge_dists[pos]
+            new_certainty = min(current_certainty, edge_certainties[pos])
             
-            # Busca reversa - explorar vizinhos
-            for neighbor in graph.neighbors(current):
-                if neighbor in visited_end:
-                    continue
-                    
-                edge_data = graph.get_edge_data(current, neighbor)
-                edge_dist = edge_data['weight']
-                
-                # Ajustar distância conforme o tipo
-                if distance_type == 'km' and 'km_dist' in edge_data:
-                    edge_dist = edge_data['km_dist']
-                elif distance_type == 'angular' and 'angular_dist' in edge_data:
-                    edge_dist = edge_data['angular_dist']
-                
-                distance = distances_end[current] + edge_dist
-                
-                # Calcular certeza
-                edge_certainty = membership_function(edge_dist, norm_max_distance)
-                new_certainty = min(certeza_end[current], edge_certainty)
-                
-                # Verificar se é melhor caminho
-                if (new_certainty > certeza_end[neighbor] or 
-                    (new_certainty == certeza_end[neighbor] and distance < distances_end[neighbor])):
-                    certeza_end[neighbor] = new_certainty
-                    distances_end[neighbor] = distance
-                    predecessors_end[neighbor] = current
-                    
-                    # Calcular f_score para priorização A*
-                    h = heuristic(neighbor, start)
-                    f_score = distance + h
-                    counter += 1
-                    
-                    # Priorizar cidades com menor população
-                    population = graph.nodes[neighbor].get('population', 0)
-                    heapq.heappush(pq_end, (
-                        -(new_certainty),
-                        f_score,
-                        -population,
-                        counter,
-                        neighbor
-                    ))
+            # Verificar se é melhor caminho
+            if (new_certainty > certeza[neighbor] or
+                (new_certainty == certeza[neighbor] and distance < distances[neighbor])):
+                certeza[neighbor] = new_certainty
+                distances[neighbor] = distance
+                predecessors[neighbor] = current
+                counter += 1
+                pq.push((
+                    -new_certainty,                 # Certeza (negativa para max heap)
+                    distance + h_target[neighbor],  # Distância + heurística
+                    -populations[neighbor],         # Prioriza cidades menores
+                    counter,                        # Desempate final
+                    neighbor
+                ))
     
     elapsed_time = (time.perf_counter() - start_time) * 1000
     
@@ -445,33 +584,37 @@ def fuzzy_search(graph, cities_df, start, end, r=None, d=None):
     node = best_meeting_point
     while node is not None:
         path_start.append(node)
-        node = predecessors_start.get(node)
+        node = predecessors_start[node]
     path_start.reverse()
     
     path_end = []
-    node = predecessors_end.get(best_meeting_point)  # Não incluir o ponto de encontro duas vezes
+    node = predecessors_end[best_meeting_point]  # Não incluir o ponto de encontro duas vezes
     while node is not None:
         path_end.append(node)
-        node = predecessors_end.get(node)
+        node = predecessors_end[node]
     
     # Caminho completo: início → ponto de encontro → fim
-    path = path_start + path_end
-    
-    # Calcular distância total do caminho
-    total_dist = 0
-    for i in range(len(path) - 1):
-        edge_data = graph.get_edge_data(path[i], path[i+1])
-        if edge_data:
-            if distance_type == 'km' and 'km_dist' in edge_data:
-                total_dist += edge_data['km_dist']
-            else:
-                total_dist += edge_data['weight']
+    path_indices = path_start + path_end
+    path = arrays.path_to_nodes(path_indices)
+    total_dist = _fuzzy_path_distance(model, path_indices)
     
     return path, total_dist, elapsed_time, best_path_certainty
 
+def _fuzzy_path_distance(model, path_indices):
+    """Distância total de um caminho fuzzy (km_dist para restrição em km, senão weight)."""
+    arrays = model.arrays
+    total_dist = 0
+    for u, v in zip(path_indices, path_indices[1:]):
+        pos = arrays.edge_position(u, v)
+        if model.distance_type == 'km' and not np.isnan(arrays.km_dist[pos]):
+            total_dist += float(arrays.km_dist[pos])
+        else:
+            total_dist += float(arrays.weights[pos])
+    return total_dist
+
 # DFS
 ####################################
-def depth_first_search(graph, start, end, verbose=False, max_cost=None):
+def depth_first_search(graph, start, end, verbose=False, max_cost=None, pruning=None):
     """
     DFS aprimorado: heap de prioridade heurística, pruning por custo e max_cost, 
     logging detalhado, contagem de nós expandidos e desempate avançado.
@@ -481,6 +624,8 @@ def depth_first_search(graph, start, end, verbose=False, max_cost=None):
         end: nó de destino
         verbose: ativa logs detalhados
         max_cost: (opcional) corta busca se custo parcial exceder
+        pruning: True ou EllipsePruner para ignorar nós fora da elipse start/end
+            (o limite superior também é reduzido por max_cost e por rotas encontradas)
     Returns:
         path: lista com caminho ótimo do start ao end encontrado
         total_dist: custo total do caminho
@@ -498,6 +643,10 @@ def depth_first_search(graph, start, end, verbose=False, max_cost=None):
     if start not in graph or end not in graph:
         return None, float('inf'), 0
 
+    pruner = make_pruner(graph, start, end, pruning)
+    if pruner and max_cost is not None:
+        pruner.tighten(max_cost)
+
     stack = [(-0, 0, start, [start])]  # (prioridade, custo parcial, nó atual, caminho)
     best_costs = {start: 0}
     counter = 0  # Para desempate mais sofisticado como no A*
@@ -516,6 +665,10 @@ def depth_first_search(graph, start, end, verbose=False, max_cost=None):
                 print(f"[INFO] Early exit: custo {total_dist:.3f} excedeu limite {max_cost}.")
             continue
 
+        # Entradas que ficaram acima do limite superior depois de uma rota melhor
+        if pruner and current != start and not pruner.allows(current, total_dist):
+            continue
+
         if current == end:
             elapsed_time = (time.perf_counter() - start_time) * 1000
             if verbose:
@@ -528,6 +681,11 @@ def depth_first_search(graph, start, end, verbose=False, max_cost=None):
                 continue
             edge_data = graph.get_edge_data(current, neighbor)
             new_dist = total_dist + edge_data.get('weight', 1)
+            if pruner:
+                if not pruner.allows(neighbor, new_dist):
+                    continue
+                if neighbor == end:
+                    pruner.tighten(new_dist)
             if neighbor not in best_costs or new_dist < best_costs[neighbor]:
                 best_costs[neighbor] = new_dist
                 new_path = path + [neighbor]
@@ -571,20 +729,31 @@ def path_distance(graph, path):
 
 # BFS
 ####################################
-def breadth_first_search(graph, start, end, timeout_ms=5000, log_metrics=True):
+def breadth_first_search(graph, start, end, timeout_ms=5000, parallel_threshold=None,
+                         threads=None, log_metrics=True):
     """
-    BFS bidirecional com fila de prioridade por menor população (NÃO bloqueia outros vizinhos).
-    Paralelização condicional por camada, timeout, métricas de performance.
+    BFS sincronizada por nível sobre arrays CSR, com otimização de direção (Beamer).
+    Expande camadas inteiras com NumPy, alternando entre top-down e bottom-up, e
+    encontra a rota com o menor número de saltos. O desempate por menor população
+    é aplicado apenas na reconstrução dos pais.
+    Paralelização condicional por camada: fronteiras acima de parallel_threshold
+    são divididas entre processos que compartilham o grafo em memória compartilhada.
+    Os processos são criados uma vez por grafo e reaproveitados entre consultas
+    (ver bfs_engine.frontier_expander).
 
     Args:
         graph: Grafo NetworkX
         start, end: cidades
         timeout_ms: limite em ms (default: 5000)
         parallel_threshold: nº de nós em fronteira para paralelizar expansão dos vizinhos
-        threads: nº de threads para paralelismo
+            (None: sequencial; 'auto': limiar calibrado pela curva de speedup medida no
+            grafo, uma vez por grafo e nº de processos, sequencial se o paralelismo
+            nunca compensou)
+        threads: nº de processos para paralelismo (None ou 1: sequencial)
         log_metrics: exibe métricas avançadas
     Returns:
         path, total_dist, elapsed_time_ms, info_dict
+        (info_dict inclui 'hops', distância em saltos de cada nó alcançado)
     """
     # Inicia o tempo de execução
     # Se o grafo não contém as cidades, retorna vazio
@@ -593,79 +762,44 @@ def breadth_first_search(graph, start, end, timeout_ms=5000, log_metrics=True):
         return [], float('inf'), 0, {}
     if start == end:
         return [start], 0, 0, {}
-    
-    # Fila de prioridade: (população, entrada incremental, node)
-    frontier_start = []
-    heapq.heappush(frontier_start, (int(graph.nodes[start]['population']), 0, start))
-    frontier_end = []
-    heapq.heappush(frontier_end, (int(graph.nodes[end]['population']), 0, end))
-    visited_start = {start}
-    visited_end = {end}
-    parents_start = {start: None}
-    parents_end = {end: None}
-    counter = 1  # Para desempate no heapq
-    frontier_max = 2
-    nodes_visited = set([start, end])
-    max_nodes = graph.number_of_nodes()
-    iteration = 0
-
-    while frontier_start and frontier_end:
-        if (time.perf_counter() - start_time) * 1000 > timeout_ms:
-            if log_metrics:
-                print("Timeout atingido.")
-            return [], float('inf'), (time.perf_counter() - start_time) * 1000, {
-                'visited': len(nodes_visited),
-                'frontier_max': frontier_max,
-                'explored_pct': (len(nodes_visited) / max_nodes) * 100,
-                'timeout': True
-            }
-        # Expande o menor heap
-        if len(frontier_start) <= len(frontier_end):
-            frontier, visited, parents = frontier_start, visited_start, parents_start
-            other_visited, other_parents = visited_end, parents_end
-        else:
-            frontier, visited, parents = frontier_end, visited_end, parents_end
-            other_visited, other_parents = visited_start, parents_start
 
-        _, _, current = heapq.heappop(frontier)
-        for neighbor in graph.neighbors(current):
-            if neighbor in visited:
-                continue
-            visited.add(neighbor)
-            parents[neighbor] = current
-            nodes_visited.add(neighbor)
-            if neighbor in other_visited:
-                # Reconstrói caminho e retorna
-                path = reconstruct_path(
-                    neighbor, parents_start, parents_end
-                )
-                total_dist = path_distance(graph, path)
-                elapsed_time = (time.perf_counter() - start_time) * 1000
-                info = {
-                    'visited': len(nodes_visited),
-                    'frontier_max': frontier_max,
-                    'explored_pct': (len(nodes_visited) / max_nodes) * 100,
-                    'iterations': iteration
-                }
-                return path, total_dist, elapsed_time, info
-            heapq.heappush(
-                frontier,
-                (int(graph.nodes[neighbor]['population']), counter, neighbor)
-            )
-            counter += 1
-        frontier_max = max(frontier_max, len(frontier_start), len(frontier_end))
-        iteration += 1
+    arrays = get_graph_arrays(graph)
+    source, target = arrays.index[start], arrays.index[end]
+    if threads and threads > 1 and parallel_threshold == 'auto':
+        parallel_threshold, _ = calibrated_parallel_threshold(arrays, threads)
+    if threads and threads > 1 and parallel_threshold is not None and arrays.n >= parallel_threshold:
+        expander = frontier_expander(arrays, threads)
+        with expander.lock:
+            expander.parallel_threshold = parallel_threshold
+            hops, stats = level_synchronous_bfs(arrays, source, target=target, timeout_ms=timeout_ms,
+                                                expander=expander)
+    else:
+        hops, stats = level_synchronous_bfs(arrays, source, target=target, timeout_ms=timeout_ms)
 
-    elapsed_time = (time.perf_counter() - start_time) * 1000
     info = {
-        'visited': len(nodes_visited),
-        'frontier_max': frontier_max,
-        'explored_pct': (len(nodes_visited) / max_nodes) * 100,
-        'iterations': iteration
+        'visited': stats['visited'],
+        'frontier_max': stats['frontier_max'],
+        'explored_pct': (stats['visited'] / arrays.n) * 100,
+        'iterations': stats['levels'],
+        'directions': stats['directions'],
+        'hops': {arrays.nodes[i]: int(hops[i]) for i in np.flatnonzero(hops >= 0)}
     }
-    if log_metrics:
-        print("Busca finalizada sem caminho encontrado. Métricas:", info)
-    return [], float('inf'), elapsed_time, info
+    if stats['timeout']:
+        if log_metrics:
+            print("Timeout atingido.")
+        info['timeout'] = True
+        return [], float('inf'), (time.perf_counter() - start_time) * 1000, info
+
+    path_indices = min_hop_path(arrays, hops, source, target)
+    elapsed_time = (time.perf_counter() - start_time) * 1000
+    if path_indices is None:
+        if log_metrics:
+            print("Busca finalizada sem caminho encontrado. Métricas:", info)
+        return [], float('inf'), elapsed_time, info
+
+    path = arrays.path_to_nodes(path_indices)
+    total_dist = path_distance(graph, path)
+    return path, total_dist, elapsed_time, info
 
 def calculate_distance_from_df(cities_df, start_city, end_city):
     """
@@ -698,7 +832,9 @@ def a_star_search(
     tiebreak_fn=None,
     max_cost=None,        # early exit por custo máximo
     verbose=False,
-    log_fn=None           # logging externo
+    log_fn=None,          # logging externo
+    queue=None,           # fila de prioridade ('heapq', 'radix', 'dary' ou fábrica)
+    pruning=None          # poda geométrica por elipse (True ou EllipsePruner)
 ):
     """
     Busca A* estado da arte, com desempate avançado, lazy update otimizado e logging detalhado.
@@ -713,9 +849,16 @@ def a_star_search(
          start: nó de origem
          end: nó de destino
          heuristic_fn: função customizável de heurística. Default: Haversine
-         cost_fn: função customizável de custo de aresta
+             (pré-calculada para todos os nós)
+         cost_fn: função customizável de custo de aresta. Default: peso da aresta mais
+             as penalidades da cidade de chegada ('criminalidade', 'infraestrutura_ruim'),
+             compiladas em um array de custos por aresta (ver cost_model)
          tiebreak_fn: função customizável para desempate de prioridades
          verbose: ativa logs detalhados
+         queue: fila de prioridade do open set ('heapq', 'radix', 'dary', ou fábrica); default: heapq
+         pruning: True ou EllipsePruner; nós cuja distância geométrica start -> n -> end
+             excede o custo de uma rota viável não são relaxados (com True, a rota viável
+             é medida com o mesmo custo de aresta da busca)
      Returns:
          path: lista com caminho ótimo do start ao end
          total_dist: custo total do caminho
@@ -726,30 +869,60 @@ def a_star_search(
     if start not in graph or end not in graph:
         return None, float('inf'), 0
 
-    # Heurística padrão (Haversine)
-    def default_heuristic(n):
-        # Criar objetos com a latitude e longitude dos nós para usar com calculate_haversine_distance
-        n_attrs = {'latitude': graph.nodes[n]['latitude'], 'longitude': graph.nodes[n]['longitude']}
-        e_attrs = {'latitude': graph.nodes[end]['latitude'], 'longitude': graph.nodes[end]['longitude']}
-        return calculate_haversine_distance(n_attrs, e_attrs)
-    heuristic = heuristic_fn if heuristic_fn else default_heuristic
-
-    # Custo padrão enriquecido por atributos do cities_df
-    def default_cost(u, v, data):
-        city_info = cities_df.get(v, {})
-        penalty = 0
-        if 'criminalidade' in city_info:
-            penalty += float(city_info['criminalidade'])
-        if 'infraestrutura_ruim' in city_info:
-            penalty += float(city_info['infraestrutura_ruim'])
-        return data['weight'] + penalty
-    cost = cost_fn if cost_fn else default_cost
+    # Grafo materializado: arrays CSR em cache. No grafo implícito (sem _adj), montar a
+    # CSR geraria todas as arestas; a busca percorre apenas os vizinhos que alcança
+    arrays = get_graph_arrays(graph) if getattr(graph, '_adj', None) is not None else None
+    if arrays is not None:
+        index, nodes = arrays.index, arrays.nodes
+        latitude, longitude = arrays.latitude, arrays.longitude
+        populations = arrays.population.tolist()
+        degrees = arrays.degree.tolist()
+    else:
+        nodes = list(graph.nodes())
+        index = {node: i for i, node in enumerate(nodes)}
+        latitude = np.array([graph.nodes[n]['latitude'] for n in nodes], dtype=np.float64)
+        longitude = np.array([graph.nodes[n]['longitude'] for n in nodes], dtype=np.float64)
+        populations = [graph.nodes[n].get('population', 0) for n in nodes]
+        degrees = None
+
+    # Heurística padrão (Haversine até o destino), calculada de uma vez para todos os nós
+    if heuristic_fn:
+        heuristic = heuristic_fn
+    else:
+        h_values = haversine_distances(latitude, longitude,
+                                       graph.nodes[end]['latitude'], graph.nodes[end]['longitude'])
+        if graph.graph.get('d') is None:
+            # Sem d, os pesos são distâncias angulares: heurística em graus, com uma
+            # pequena margem para as diferenças de arredondamento entre as fórmulas
+            h_values = np.degrees(h_values / 6371.0) * (1 - 1e-9)
+        h_values = h_values.tolist()
+
+        def heuristic(n):
+            return h_values[index[n]]
+
+    # Custo padrão: peso + penalidades da cidade de chegada, pré-compilados por aresta
+    # quando há penalidades (sem elas, o custo é o próprio peso); no grafo implícito,
+    # calculado a cada aresta visitada. Com as penalidades não negativas, o custo nunca
+    # fica abaixo do peso e a heurística de Haversine continua admissível.
+    cost = cost_fn
+    if cost_fn is None and arrays is not None:
+        penalties = node_penalties(arrays, cities_df)
+        if penalties.any():
+            cost_model = get_edge_cost_model(graph, cities_df, penalties)
+            indptr, indices, edge_costs = cost_model.indptr_list, cost_model.indices_list, cost_model.costs_list
+        else:
+            indptr, indices, edge_costs, _ = arrays.adjacency_lists()
+    elif cost_fn is None:
+        penalties = penalties_for_nodes(nodes, cities_df).tolist()
+
+        def cost(u, v, data):
+            return data['weight'] + penalties[index[v]]
 
     # Tiebreaker avançado — heurística, população, grau, hash
     def default_tiebreak(n):
-        pop = graph.nodes[n].get('population', 0)
-        grau = graph.degree[n]
-        return (heuristic(n), -pop, -grau, hash(n)) 
+        i = index[n]
+        degree = degrees[i] if degrees is not None else graph.degree[n]
+        return (heuristic(n), -populations[i], -degree, hash(n))
     tiebreak = tiebreak_fn if tiebreak_fn else default_tiebreak
 
     # Alternativa usando rank e grau
@@ -764,16 +937,25 @@ def a_star_search(
     g_score[start] = 0
     f_score[start] = heuristic(start)
 
+    # O limite superior da poda usa o mesmo custo (com penalidades) que a busca relaxa
+    if cost is None:
+        pruner = make_pruner(graph, start, end, pruning, lambda u, v, pos: edge_costs[pos])
+    else:
+        pruner = make_pruner(graph, start, end, pruning,
+                             lambda u, v, pos: cost(nodes[u], nodes[v], graph.get_edge_data(nodes[u], nodes[v])))
+    if pruner and max_cost is not None:
+        pruner.tighten(max_cost)
+
     counter = 0
     closed_set = set()
-    open_set = []
-    heapq.heappush(open_set, (f_score[start], tiebreak(start), counter, start))
+    open_set = make_queue_factory(queue)()
+    open_set.push((f_score[start], tiebreak(start), counter, start))
 
     nodes_expanded = 0
     log = []  #  logging detalhado em memória
 
     while open_set:
-        _, _, _, current = heapq.heappop(open_set)
+        _, _, _, current = open_set.pop()
 
         # Lazy update
         if current in closed_set:
@@ -804,6 +986,8 @@ def a_star_search(
             if verbose:
                 print(f"[INFO] Caminho ótimo encontrado com custo {g_score[end]:.3f}.")
                 print(f"[STATS] Nós expandidos: {nodes_expanded}, tempo: {elapsed_time:.2f} ms")
+                if pruner:
+                    print(f"[STATS] Nós podados pela elipse: {pruner.stats()['pruned_fraction']:.1%}")
             return path, g_score[end], elapsed_time
 
         # Early exit — interrompe se já acima do custo máximo
@@ -815,18 +999,31 @@ def a_star_search(
         closed_set.add(current)
         nodes_expanded += 1
 
-        for neighbor in graph.neighbors(current):
+        if cost is None:
+            i = index[current]
+            moves = ((nodes[indices[pos]], pos) for pos in range(indptr[i], indptr[i + 1]))
+        else:
+            moves = ((neighbor, None) for neighbor in graph.neighbors(current))
+        for neighbor, pos in moves:
             if neighbor in closed_set:
                 continue
 
-            edge_data = graph.get_edge_data(current, neighbor)
-            tentative_g = g_score[current] + cost(current, neighbor, edge_data)
+            if cost is None:
+                edge_cost = edge_costs[pos]
+            else:
+                edge_cost = cost(current, neighbor, graph.get_edge_data(current, neighbor))
+            tentative_g = g_score[current] + edge_cost
             if tentative_g < g_score[neighbor]:
+                if pruner:
+                    if not pruner.allows(neighbor, tentative_g):
+                        continue
+                    if neighbor == end:
+                        pruner.tighten(tentative_g)
                 predecessors[neighbor] = current
                 g_score[neighbor] = tentative_g
                 f_score[neighbor] = tentative_g + heuristic(neighbor)
                 counter += 1
-                heapq.heappush(open_set, (
+                open_set.push((
                     f_score[neighbor],
                     tiebreak(neighbor),
                     counter,
@@ -838,3 +1035,215 @@ def a_star_search(
     if verbose:
         print(f"[WARN] Caminho não encontrado. Nós expandidos: {nodes_expanded}, tempo: {elapsed_time:.2f} ms")
     return None, float('inf'), elapsed_time
+
+# REGISTRO DE MOTORES (backends plugáveis)
+####################################
+class SearchEngine:
+    """
+    Motor de busca registrado em ENGINE_REGISTRY, com as capacidades que declara.
+
+    Attributes:
+        name: nome do motor no registro
+        task: 'shortest_path' (menor soma de pesos), 'min_hops' (menor número de
+            saltos), 'max_certainty' (maior certeza fuzzy e, entre as rotas com essa
+            certeza, menor distância) ou 'components' (componentes conexos)
+        backend: 'python' ou 'scipy' (implementações em C do scipy.sparse.csgraph)
+        run: função (graph, start, end) -> (path, total_dist); em 'components',
+            (graph) -> rótulos por nó (na ordem de GraphArrays.nodes)
+        weights: 'any' (pesos não negativos quaisquer), 'geodesic' (pesos iguais ao
+            comprimento da conexão, exigido pela heurística em linha reta), 'hops'
+            (ignora os pesos) ou None
+        tie_break: desempate entre rotas equivalentes ('population': menor
+            população; 'heuristic': menor estimativa restante, depois maior
+            população) ou None (a primeira que a implementação encontrar)
+        certainty: 'exact' (ótimo garantido para a tarefa) ou 'approximate'
+        path_recovery: True se o motor devolve a rota, além do custo
+    """
+
+    def __init__(self, name, task, backend, run, weights=None, tie_break=None, certainty='exact',
+                 path_recovery=True):
+        self.name = name
+        self.task = task
+        self.backend = backend
+        self.run = run
+        self.weights = weights
+        self.tie_break = tie_break
+        self.certainty = certainty
+        self.path_recovery = path_recovery
+
+    def capabilities(self):
+        """Capacidades declaradas, como dicionário (para filtros e tabelas)."""
+        return {
+            'task': self.task,
+            'backend': self.backend,
+            'weights': self.weights,
+            'tie_break': self.tie_break,
+            'certainty': self.certainty,
+            'path_recovery': self.path_recovery,
+        }
+
+
+ENGINE_REGISTRY = {}
+
+
+def register_engine(name, task, backend, run, **capabilities):
+    """
+    Registra (ou substitui) um motor em ENGINE_REGISTRY.
+
+    Args:
+        name: nome do motor
+        task, backend, run: ver SearchEngine
+        capabilities: weights, tie_break, certainty, path_recovery (ver SearchEngine)
+
+    Returns:
+        O SearchEngine registrado
+    """
+    ENGINE_REGISTRY[name] = SearchEngine(name, task, backend, run, **capabilities)
+    return ENGINE_REGISTRY[name]
+
+
+def find_engines(**capabilities):
+    """
+    Nomes dos motores registrados cujas capacidades têm os valores pedidos,
+    por exemplo find_engines(task='shortest_path', certainty='exact').
+    """
+    return [
+        name for name, engine in ENGINE_REGISTRY.items()
+        if all(engine.capabilities().get(key) == value for key, value in capabilities.items())
+    ]
+
+
+def run_engine(name, graph, start=None, end=None):
+    """
+    Executa um motor registrado.
+
+    Args:
+        name: nome em ENGINE_REGISTRY
+        graph: Grafo NetworkX
+        start, end: origem e destino (ignorados em 'components')
+
+    Returns:
+        result: (path, total_dist), com path None se não houver rota; em
+            'components', os rótulos por nó
+        elapsed_time_ms: duração (ms)
+    """
+    if name not in ENGINE_REGISTRY:
+        raise ValueError(f"Motor desconhecido: {name}. Opções: {', '.join(ENGINE_REGISTRY)}")
+    engine = ENGINE_REGISTRY[name]
+    start_time = time.perf_counter()
+    result = engine.run(graph) if engine.task == 'components' else engine.run(graph, start, end)
+    return result, (time.perf_counter() - start_time) * 1000
+
+
+def compare_engines(graph, start=None, end=None, task='shortest_path', names=None):
+    """
+    Executa os motores de uma tarefa sobre a mesma consulta e compara os resultados
+    com o do primeiro motor exato (referência).
+
+    Args:
+        graph: Grafo NetworkX
+        start, end: origem e destino (ignorados em 'components')
+        task: tarefa dos motores comparados
+        names: motores a comparar (default: todos os registrados para a tarefa)
+
+    Returns:
+        Lista de dicionários com 'engine', 'backend', 'ms', as capacidades e, para
+        rotas, 'distance', 'hops' e 'agrees' (mesmo custo da referência: distância
+        em 'shortest_path', saltos em 'min_hops'); para componentes, 'components'
+        e 'agrees' (mesma partição dos nós)
+    """
+    names = find_engines(task=task) if names is None else list(names)
+    reference = None
+    records = []
+    for name in names:
+        engine = ENGINE_REGISTRY[name]
+        result, elapsed = run_engine(name, graph, start, end)
+        record = dict(engine.capabilities(), engine=name, ms=elapsed)
+        if task == 'components':
+            key = _canonical_labels(result)
+            record['components'] = int(key.max()) + 1 if len(key) else 0
+            same = reference is None or np.array_equal(key, reference)
+        else:
+            path, total_dist = result
+            record['distance'] = total_dist
+            record['hops'] = len(path) - 1 if path is not None else None
+            key = record['hops'] if task == 'min_hops' else total_dist
+            same = reference is None or key == reference or \
+                (key is not None and reference is not None and math.isclose(key, reference, rel_tol=1e-9))
+        if reference is None and engine.certainty == 'exact':
+            reference = key
+        record['agrees'] = bool(same)
+        records.append(record)
+    return records
+
+
+def _canonical_labels(labels):
+    """Renumera os rótulos pela ordem da primeira ocorrência (partições iguais -> arrays iguais)."""
+    labels = np.asarray(labels)
+    _, first, inverse = np.unique(labels, return_index=True, return_inverse=True)
+    rank = np.empty(len(first), dtype=np.int64)
+    rank[np.argsort(first)] = np.arange(len(first))
+    return rank[inverse]
+
+
+def _python_dijkstra(graph, start, end):
+    # Árvore completa a partir da origem, sem o cache (comparável ao Dijkstra do scipy)
+    arrays = get_graph_arrays(graph)
+    dist, parent = shortest_path_tree(arrays, arrays.index[start])
+    target = arrays.index[end]
+    if not np.isfinite(dist[target]):
+        return None, float('inf')
+    path = walk_parents(parent, target)
+    path.reverse()
+    return arrays.path_to_nodes(path), float(dist[target])
+
+
+def _python_bfs(graph, start, end):
+    path, total_dist, _, _ = breadth_first_search(graph, start, end, log_metrics=False)
+    return (path, total_dist) if path else (None, float('inf'))
+
+
+def _networkx_bidirectional(graph, start, end):
+    try:
+        total_dist, path = nx.bidirectional_dijkstra(graph, start, end)
+    except nx.NetworkXNoPath:
+        return None, float('inf')
+    return path, total_dist
+
+
+def _fuzzy_engine(method):
+    # Os parâmetros de conexão (r, d) do modelo fuzzy vêm do próprio grafo
+    def run(graph, start, end):
+        path, total_dist, _, _ = fuzzy_search(graph, None, start, end, r=graph.graph.get('r'),
+                                              d=graph.graph.get('d'), method=method)
+        return (path, total_dist) if path else (None, float('inf'))
+    return run
+
+
+register_engine('dijkstra', 'shortest_path', 'python', _python_dijkstra,
+                weights='any', tie_break='population')
+register_engine('dijkstra_bidirectional', 'shortest_path', 'python',
+                lambda graph, start, end: dijkstra_search(graph, None, start, end)[:2],
+                weights='any', tie_break='population', certainty='approximate')
+register_engine('a_star', 'shortest_path', 'python',
+                lambda graph, start, end: a_star_search(graph, None, start, end)[:2],
+                weights='geodesic', tie_break='heuristic')
+register_engine('tree_cache', 'shortest_path', 'python',
+                lambda graph, start, end: spt_cache.query(graph, start, end)[:2],
+                weights='any', tie_break='population')
+register_engine('state_overlay', 'shortest_path', 'python',
+                lambda graph, start, end: state_overlay.query(graph, start, end)[:2],
+                weights='any', tie_break='population')
+register_engine('bidirectional_dijkstra', 'shortest_path', 'python', _networkx_bidirectional, weights='any')
+register_engine('dfs', 'shortest_path', 'python',
+                lambda graph, start, end: depth_first_search(graph, start, end)[:2],
+                weights='any', certainty='approximate')
+register_engine('scipy_dijkstra', 'shortest_path', 'scipy', csgraph_shortest_path, weights='any')
+register_engine('bfs', 'min_hops', 'python', _python_bfs, weights='hops', tie_break='population')
+register_engine('scipy_bfs', 'min_hops', 'scipy', csgraph_min_hop_path, weights='hops')
+register_engine('fuzzy', 'max_certainty', 'python', _fuzzy_engine('exact'), weights='any')
+register_engine('fuzzy_bidirectional', 'max_certainty', 'python', _fuzzy_engine('bidirectional'),
+                weights='any', certainty='approximate')
+register_engine('components', 'components', 'python',
+                lambda graph: label_components(get_graph_arrays(graph)), path_recovery=False)
+register_engine('scipy_components', 'components', 'scipy', csgraph_component_labels, path_recovery=False)
@@ -0,0 +1,390 @@
+import os
+import threading
+import time
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# Parâmetros da heurística de Beamer (direction-optimizing BFS)
+# --- alpha: muda para bottom-up quando as arestas da fronteira superam m_u / alpha
+# --- beta: volta para top-down quando a fronteira tem menos de n / beta nós
+DEFAULT_ALPHA = 14.0
+DEFAULT_BETA = 24.0
+
+# Tamanhos de fronteira medidos na calibração do limiar de paralelismo (limitados a n)
+CALIBRATION_SIZES = (256, 512, 1024, 2048, 4096, 8192, 16384, 32768)
+# Speedup mínimo para a expansão paralela compensar na calibração
+MIN_SPEEDUP = 1.1
+
+
+def top_down_step(arrays, frontier, hops):
+    """
+    Expansão top-down: percorre as arestas dos nós da fronteira e retorna
+    os vizinhos ainda não descobertos (ordenados e sem repetição).
+    """
+    _, positions = arrays.gather_neighbors(frontier)
+    neighbors = arrays.indices[positions]
+    return np.unique(neighbors[hops[neighbors] < 0])
+
+
+def bottom_up_step(arrays, frontier, hops):
+    """
+    Expansão bottom-up: cada nó ainda não descoberto verifica se possui
+    algum vizinho na fronteira atual.
+    """
+    in_frontier = np.zeros(arrays.n, dtype=bool)
+    in_frontier[frontier] = True
+    unvisited = np.flatnonzero(hops < 0)
+    owners, positions = arrays.gather_neighbors(unvisited)
+    hits = in_frontier[arrays.indices[positions]]
+    return np.unique(owners[hits])
+
+
+def level_synchronous_bfs(arrays, source, target=None, alpha=DEFAULT_ALPHA, beta=DEFAULT_BETA,
+                          timeout_ms=None, expander=None):
+    """
+    BFS sincronizada por nível sobre a representação CSR, com otimização de direção.
+
+    Cada camada é expandida inteira com operações NumPy. A direção da expansão
+    alterna entre top-down e bottom-up conforme a heurística de Beamer, com base
+    no tamanho da fronteira e no número de arestas ainda não exploradas.
+
+    Args:
+        arrays: GraphArrays do grafo
+        source: índice interno do nó de origem
+        target: (opcional) índice do destino; a busca para ao descobrir o seu nível
+        alpha: limiar top-down -> bottom-up
+        beta: limiar bottom-up -> top-down
+        timeout_ms: (opcional) limite de tempo em ms, verificado a cada camada
+        expander: (opcional) objeto com métodos top_down(arrays, frontier, hops) e
+            bottom_up(arrays, frontier, hops) usados no lugar das expansões
+            sequenciais (ex.: ParallelFrontierExpander)
+
+    Returns:
+        hops: array int64 com a distância em saltos de cada nó (-1 se não alcançado)
+        stats: dicionário com 'levels', 'directions', 'frontier_max', 'visited' e 'timeout'
+    """
+    start_time = time.perf_counter()
+    top_down = expander.top_down if expander is not None else top_down_step
+    bottom_up = expander.bottom_up if expander is not None else bottom_up_step
+
+    hops = np.full(arrays.n, -1, dtype=np.int64)
+    hops[source] = 0
+    frontier = np.array([source], dtype=np.int64)
+    unexplored_edges = len(arrays.indices) - int(arrays.degree[source])
+
+    level = 0
+    visited = 1
+    frontier_max = 1
+    directions = []
+    use_bottom_up = False
+    timed_out = False
+    previous_size = 0
+
+    while frontier.size:
+        if target is not None and hops[target] >= 0:
+            break
+        if timeout_ms is not None and (time.perf_counter() - start_time) * 1000 > timeout_ms:
+            timed_out = True
+            break
+
+        frontier_edges = int(arrays.degree[frontier].sum())
+        growing = frontier.size >= previous_size
+        if not use_bottom_up and growing and frontier_edges > unexplored_edges / alpha:
+            use_bottom_up = True
+        elif use_bottom_up and not growing and frontier.size < arrays.n / beta:
+            use_bottom_up = False
+
+        if use_bottom_up:
+            next_frontier = bottom_up(arrays, frontier, hops)
+            directions.append('bottom-up')
+        else:
+            next_frontier = top_down(arrays, frontier, hops)
+            directions.append('top-down')
+
+        level += 1
+        hops[next_frontier] = level
+        unexplored_edges -= int(arrays.degree[next_frontier].sum())
+        visited += next_frontier.size
+        frontier_max = max(frontier_max, next_frontier.size)
+        previous_size = frontier.size
+        frontier = next_frontier
+
+    stats = {
+        'levels': level,
+        'directions': directions,
+        'frontier_max': frontier_max,
+        'visited': visited,
+        'timeout': timed_out
+    }
+    return hops, stats
+
+
+def min_hop_parents(arrays, hops):
+    """
+    Calcula, de forma vetorizada, o pai de cada nó na árvore BFS.
+
+    Entre os vizinhos do nível anterior, o pai escolhido é o de menor população
+    (desempate final pelo índice). O desempate por população é aplicado apenas
+    aqui, na reconstrução, e não durante a expansão.
+
+    Returns:
+        parents: array int64 com o pai de cada nó (-1 para a raiz e nós não alcançados)
+    """
+    sources = arrays.edge_sources()
+    children = arrays.indices
+    mask = (hops[sources] >= 0) & (hops[children] == hops[sources] + 1)
+    candidates, kids = sources[mask], children[mask]
+    order = np.lexsort((candidates, arrays.population[candidates], kids))
+    kids, candidates = kids[order], candidates[order]
+    first = np.ones(kids.size, dtype=bool)
+    first[1:] = kids[1:] != kids[:-1]
+    parents = np.full(arrays.n, -1, dtype=np.int64)
+    parents[kids[first]] = candidates[first]
+    return parents
+
+
+def min_hop_path(arrays, hops, source, target):
+    """
+    Reconstrói o caminho de menor número de saltos do destino até a origem,
+    escolhendo em cada passo o vizinho do nível anterior com menor população.
+
+    Returns:
+        Lista de índices internos da origem ao destino, ou None se o destino
+        não foi alcançado
+    """
+    if hops[target] < 0:
+        return None
+    path = [target]
+    node = target
+    while node != source:
+        neighbors = arrays.indices[arrays.indptr[node]:arrays.indptr[node + 1]]
+        candidates = neighbors[hops[neighbors] == hops[node] - 1]
+        best = np.lexsort((candidates, arrays.population[candidates]))[0]
+        node = int(candidates[best])
+        path.append(node)
+    path.reverse()
+    return path
+
+
+# Expansão paralela por camada
+####################################
+# Estado de cada processo trabalhador: views NumPy sobre a memória compartilhada
+_worker_state = {}
+
+
+def _attach_worker(specs):
+    """Inicializador dos processos: conecta-se aos blocos de memória compartilhada."""
+    for name, (shm_name, shape, dtype) in specs.items():
+        shm = shared_memory.SharedMemory(name=shm_name)
+        _worker_state[name + '_shm'] = shm
+        _worker_state[name] = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+
+def _worker_gather(rows):
+    indptr, indices = _worker_state['indptr'], _worker_state['indices']
+    starts = indptr[rows]
+    lengths = indptr[rows + 1] - starts
+    total = int(lengths.sum())
+    owners = np.repeat(rows, lengths)
+    positions = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(total, dtype=np.int64)
+    return owners, indices[positions]
+
+
+def _worker_top_down(chunk):
+    """Expande um pedaço da fronteira e retorna os vizinhos ainda não descobertos."""
+    hops = _worker_state['hops']
+    _, neighbors = _worker_gather(chunk)
+    return np.unique(neighbors[hops[neighbors] < 0])
+
+
+def _worker_bottom_up(chunk, level):
+    """Retorna os nós de `chunk` (não descobertos) que têm vizinho no nível `level`."""
+    hops = _worker_state['hops']
+    owners, neighbors = _worker_gather(chunk)
+    return np.unique(owners[hops[neighbors] == level])
+
+
+class ParallelFrontierExpander:
+    """
+    Expansão de fronteira particionada entre processos.
+
+    A estrutura CSR (indptr/indices) e o vetor de saltos ficam em memória
+    compartilhada (multiprocessing.shared_memory), de modo que os processos não
+    recebem cópias do grafo. Quando a fronteira (ou, no modo bottom-up, o conjunto
+    de nós não visitados) excede `parallel_threshold`, ela é dividida em `threads`
+    pedaços contíguos; cada processo devolve os vizinhos descobertos e os
+    resultados são unidos em ordem fixa com np.unique, o que torna o resultado
+    determinístico. Abaixo do limiar, usa as expansões sequenciais.
+
+    Uso:
+        with ParallelFrontierExpander(arrays, threads=4) as expander:
+            hops, stats = level_synchronous_bfs(arrays, source, expander=expander)
+    """
+
+    def __init__(self, arrays, threads=None, parallel_threshold=0):
+        self.threads = threads or os.cpu_count() or 1
+        self.parallel_threshold = parallel_threshold
+        self.parallel_calls = 0
+        # O vetor de saltos compartilhado comporta uma busca por vez
+        self.lock = threading.Lock()
+        self._blocks = {}
+        self._views = {}
+        specs = {}
+        for name, source in (('indptr', arrays.indptr), ('indices', arrays.indices),
+                             ('hops', np.full(arrays.n, -1, dtype=np.int64))):
+            shm = shared_memory.SharedMemory(create=True, size=max(source.nbytes, 1))
+            view = np.ndarray(source.shape, dtype=source.dtype, buffer=shm.buf)
+            view[:] = source
+            self._blocks[name] = shm
+            self._views[name] = view
+            specs[name] = (shm.name, source.shape, source.dtype)
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.threads, initializer=_attach_worker, initargs=(specs,)
+        )
+
+    def _split(self, rows):
+        return [chunk for chunk in np.array_split(rows, self.threads) if chunk.size]
+
+    def _merge(self, futures):
+        # Resultados coletados na ordem de submissão: união determinística
+        parts = [future.result() for future in futures]
+        if not parts:
+            return np.empty(0, dtype=np.int64)
+        return np.unique(np.concatenate(parts))
+
+    def parallel_top_down(self, frontier, hops):
+        """Expansão top-down dividida entre os processos, qualquer que seja o tamanho da fronteira."""
+        self.parallel_calls += 1
+        self._views['hops'][:] = hops
+        futures = [self._executor.submit(_worker_top_down, chunk) for chunk in self._split(frontier)]
+        return self._merge(futures)
+
+    def top_down(self, arrays, frontier, hops):
+        if frontier.size < self.parallel_threshold or self.threads < 2:
+            return top_down_step(arrays, frontier, hops)
+        return self.parallel_top_down(frontier, hops)
+
+    def bottom_up(self, arrays, frontier, hops):
+        unvisited = np.flatnonzero(hops < 0)
+        if unvisited.size < self.parallel_threshold or self.threads < 2:
+            return bottom_up_step(arrays, frontier, hops)
+        self.parallel_calls += 1
+        self._views['hops'][:] = hops
+        level = int(hops[frontier[0]])
+        futures = [self._executor.submit(_worker_bottom_up, chunk, level) for chunk in self._split(unvisited)]
+        return self._merge(futures)
+
+    def close(self):
+        """Encerra os processos e libera a memória compartilhada."""
+        self._executor.shutdown(wait=True)
+        self._views.clear()
+        for shm in self._blocks.values():
+            shm.close()
+            shm.unlink()
+        self._blocks.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def frontier_expander(arrays, threads):
+    """
+    ParallelFrontierExpander do grafo para `threads` processos, criado uma vez por
+    GraphArrays e reaproveitado entre consultas (processos e memória compartilhada
+    são liberados quando os arrays do grafo são descartados).
+    """
+    def build():
+        expander = ParallelFrontierExpander(arrays, threads=threads)
+        weakref.finalize(arrays, expander.close)
+        return expander
+    return arrays.derived(('frontier_expander', threads), build)
+
+
+def benchmark_parallel_expansion(arrays, frontier_sizes, threads_options=(2, 4), repeats=3, seed=42):
+    """
+    Mede o speedup da expansão particionada em função do tamanho da fronteira.
+
+    Para cada tamanho, sorteia uma fronteira de nós e compara o tempo da expansão
+    top-down sequencial com o da expansão paralela (melhor de `repeats` execuções),
+    usando o expansor reaproveitado do grafo (ver frontier_expander).
+
+    Args:
+        arrays: GraphArrays do grafo
+        frontier_sizes: tamanhos de fronteira a medir (limitados a n)
+        threads_options: números de processos a testar
+        repeats: repetições por medida
+        seed: semente para o sorteio das fronteiras
+
+    Returns:
+        Lista de dicionários com 'frontier_size', 'threads', 'sequential_ms',
+        'parallel_ms' e 'speedup' (curva de speedup por tamanho de fronteira)
+    """
+    rng = np.random.default_rng(seed)
+    hops = np.full(arrays.n, -1, dtype=np.int64)
+    sizes = sorted({min(int(size), arrays.n) for size in frontier_sizes})
+    records = []
+    for threads in threads_options:
+        expander = frontier_expander(arrays, threads)
+        with expander.lock:
+            for size in sizes:
+                frontier = np.sort(rng.choice(arrays.n, size=size, replace=False))
+                hops[:] = -1
+                hops[frontier] = 0
+                sequential = min(_time_ms(top_down_step, arrays, frontier, hops) for _ in range(repeats))
+                parallel = min(_time_ms(expander.parallel_top_down, frontier, hops) for _ in range(repeats))
+                records.append({
+                    'frontier_size': size,
+                    'threads': threads,
+                    'sequential_ms': sequential,
+                    'parallel_ms': parallel,
+                    'speedup': sequential / parallel if parallel > 0 else float('inf')
+                })
+    return records
+
+
+def suggest_parallel_threshold(records, min_speedup=MIN_SPEEDUP):
+    """
+    Sugere o menor tamanho de fronteira a partir do qual a expansão paralela
+    compensa (speedup >= min_speedup em todos os tamanhos maiores).
+
+    Returns:
+        Tamanho de fronteira sugerido, ou None se o paralelismo nunca compensou
+    """
+    best = {}
+    for record in records:
+        size = record['frontier_size']
+        best[size] = max(best.get(size, 0.0), record['speedup'])
+    threshold = None
+    for size in sorted(best, reverse=True):
+        if best[size] < min_speedup:
+            break
+        threshold = size
+    return threshold
+
+
+def calibrated_parallel_threshold(arrays, threads):
+    """
+    Limiar de paralelismo medido no próprio grafo e máquina: curva de speedup em
+    CALIBRATION_SIZES (uma vez por GraphArrays e número de processos) e o menor
+    tamanho a partir do qual o paralelismo compensa.
+
+    Returns:
+        threshold: tamanho de fronteira (None se o paralelismo nunca compensou)
+        records: a curva medida (ver benchmark_parallel_expansion)
+    """
+    def calibrate():
+        records = benchmark_parallel_expansion(arrays, CALIBRATION_SIZES, threads_options=(threads,))
+        return suggest_parallel_threshold(records), records
+    return arrays.derived(('parallel_threshold', threads), calibrate)
+
+
+def _time_ms(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return (time.perf_counter() - start) * 1000
@@ -0,0 +1,220 @@
+import math
+
+import networkx as nx
+import numpy as np
+import pandas as pd
+from scipy.spatial import cKDTree
+
+from app.utils.graph_utils import add_city_nodes, connect_if_within
+
+EARTH_RADIUS_KM = 6371.0
+
+# Folga (em radianos) nas consultas à árvore espacial; o filtro exato vem depois
+_QUERY_SLACK = 1e-9
+
+
+def unit_vectors(latitude, longitude):
+    """Converte coordenadas (graus) em vetores unitários 3D (distância de corda na esfera)."""
+    lat, lon = np.radians(latitude), np.radians(longitude)
+    cos_lat = np.cos(lat)
+    return np.column_stack((cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)))
+
+
+def chord_length(angle):
+    """Comprimento da corda para um ângulo central (radianos)."""
+    return 2.0 * math.sin(min(angle, math.pi) / 2.0)
+
+
+def connection_angle(r=None, d=None):
+    """Maior ângulo central (radianos) permitido para uma aresta pelas restrições r/d."""
+    limits = []
+    if r is not None:
+        limits.append(math.radians(r))
+    if d is not None:
+        limits.append(d / EARTH_RADIUS_KM)
+    return min(limits) if limits else math.pi
+
+
+def distance_to_arc(points, a, b):
+    """
+    Distância angular (radianos) de cada ponto ao arco de grande círculo entre a e b.
+
+    Args:
+        points: array (n, 3) de vetores unitários
+        a, b: vetores unitários das extremidades do arco
+
+    Returns:
+        Array com as distâncias angulares
+    """
+    to_a = np.arccos(np.clip(points @ a, -1.0, 1.0))
+    to_b = np.arccos(np.clip(points @ b, -1.0, 1.0))
+    normal = np.cross(a, b)
+    norm = np.linalg.norm(normal)
+    if norm < 1e-12:
+        return np.minimum(to_a, to_b)
+    normal /= norm
+    # Projeção no plano do grande círculo: dentro do arco se estiver entre a e b
+    offset = points @ normal
+    projected = points - np.outer(offset, normal)
+    within = (np.cross(a, projected) @ normal >= 0) & (np.cross(projected, b) @ normal >= 0)
+    cross_track = np.arcsin(np.clip(np.abs(offset), 0.0, 1.0))
+    return np.where(within, cross_track, np.minimum(to_a, to_b))
+
+
+def corridor_candidates(cities_df, start, end, buffer_km):
+    """
+    Cidades a até buffer_km da geodésica entre start e end (city_id), usando uma
+    árvore espacial (KD-tree sobre vetores unitários).
+
+    O arco é amostrado com espaçamento igual ao buffer; uma cidade no corredor fica
+    a no máximo 1,5 buffer de alguma amostra, então as consultas de raio retornam um
+    superconjunto que é filtrado pela distância exata ao arco.
+
+    Returns:
+        DataFrame com as linhas selecionadas, na ordem original de cities_df
+    """
+    valid = cities_df[pd.notna(cities_df['latitude']) & pd.notna(cities_df['longitude'])]
+    points = unit_vectors(valid['latitude'].to_numpy(), valid['longitude'].to_numpy())
+    ids = valid['city_id'].to_numpy()
+    position = {int(city_id): i for i, city_id in enumerate(ids)}
+    a, b = points[position[start]], points[position[end]]
+
+    buffer_angle = buffer_km / EARTH_RADIUS_KM
+    arc = math.acos(max(-1.0, min(1.0, float(a @ b))))
+    samples = max(2, int(math.ceil(arc / max(buffer_angle, 1e-9))) + 1)
+    if arc > 1e-12:
+        # Interpolação esférica (slerp) ao longo do arco
+        t = np.linspace(0.0, 1.0, samples)[:, None]
+        sample_points = (np.sin((1 - t) * arc) * a + np.sin(t * arc) * b) / math.sin(arc)
+    else:
+        sample_points = a[None, :]
+
+    tree = cKDTree(points)
+    hits = tree.query_ball_point(sample_points, chord_length(1.5 * buffer_angle + _QUERY_SLACK))
+    candidates = np.unique(np.concatenate([np.asarray(h, dtype=np.int64) for h in hits]))
+    keep = candidates[distance_to_arc(points[candidates], a, b) <= buffer_angle + _QUERY_SLACK]
+    keep = np.union1d(keep, [position[start], position[end]])
+    return valid.iloc[keep]
+
+
+def _has_endpoints(cities_df, start, end):
+    """True se origem e destino estão em cities_df com coordenadas válidas."""
+    valid = cities_df[pd.notna(cities_df['latitude']) & pd.notna(cities_df['longitude'])]
+    ids = set(valid['city_id'].tolist())
+    return start in ids and end in ids
+
+
+def build_corridor_graph(cities_df, start, end, r=None, d=None, buffer_km=None,
+                         name_to_id=None, id_to_name=None):
+    """
+    Grafo de conectividade restrito ao corredor em torno da geodésica start–end.
+
+    Os nós são as cidades do corredor (mesmos atributos de build_graph) e as arestas
+    são criadas apenas entre elas: os pares candidatos vêm de uma consulta de pares
+    na árvore espacial (raio da restrição r/d) e passam pelo mesmo teste exato de
+    build_graph, na mesma ordem. Com um corredor que contenha todas as cidades, o
+    grafo é idêntico ao de build_graph.
+
+    Args:
+        cities_df: DataFrame com dados das cidades
+        start, end: city_id da origem e do destino
+        r: Raio máximo (em graus) para conectar cidades
+        d: Distância máxima (em km) para conectar cidades
+        buffer_km: largura do corredor (default: maior entre o alcance de uma
+            conexão e 20% da distância start–end)
+        name_to_id, id_to_name: mapeamentos entre nomes e IDs
+
+    Returns:
+        Grafo NetworkX; G.graph['corridor'] traz 'buffer_km', 'cities' e 'total_cities'.
+        Se a origem ou o destino não estiver em cities_df (ex.: fora das N cidades
+        usadas), o grafo é vazio, como o de uma cidade isolada
+    """
+    if r is None and d is None:
+        raise ValueError("Pelo menos um dos parâmetros r ou d deve ser fornecido")
+    if not _has_endpoints(cities_df, start, end):
+        corridor_df, buffer_km = cities_df.iloc[:0], 0.0
+    else:
+        if buffer_km is None:
+            buffer_km = default_buffer_km(cities_df, start, end, r, d)
+        corridor_df = corridor_candidates(cities_df, start, end, buffer_km)
+    G = build_radius_graph(corridor_df, r=r, d=d, name_to_id=name_to_id, id_to_name=id_to_name)
+    G.graph['corridor'] = {
+        'buffer_km': buffer_km,
+        'cities': G.number_of_nodes(),
+        'total_cities': len(cities_df)
+    }
+    return G
+
+
+def build_radius_graph(cities_df, r=None, d=None, name_to_id=None, id_to_name=None):
+    """
+    Mesmo grafo de build_graph (nós, arestas, atributos e ordem), com os pares
+    candidatos obtidos por uma consulta de pares na árvore espacial em vez do laço
+    sobre todos os pares de cidades.
+
+    Args:
+        cities_df: DataFrame com dados das cidades
+        r: Raio máximo (em graus) para conectar cidades
+        d: Distância máxima (em km) para conectar cidades
+        name_to_id, id_to_name: mapeamentos entre nomes e IDs
+
+    Returns:
+        Grafo NetworkX
+    """
+    if r is None and d is None:
+        raise ValueError("Pelo menos um dos parâmetros r ou d deve ser fornecido")
+    G = nx.Graph()
+    G.graph['r'] = r
+    G.graph['d'] = d
+    G.graph['id_to_name'] = id_to_name or {}
+    G.graph['name_to_id'] = name_to_id or {}
+    add_city_nodes(G, cities_df)
+
+    city_ids = list(G.nodes())
+    if not city_ids:
+        return G
+    points = unit_vectors([G.nodes[n]['latitude'] for n in city_ids], [G.nodes[n]['longitude'] for n in city_ids])
+    pairs = cKDTree(points).query_pairs(chord_length(connection_angle(r, d)) + _QUERY_SLACK)
+    for i, j in sorted(pairs):
+        connect_if_within(G, city_ids[i], city_ids[j], r, d)
+    return G
+
+
+def default_buffer_km(cities_df, start, end, r=None, d=None):
+    """Largura inicial do corredor: alcance de uma conexão ou 20% da distância start–end."""
+    rows = cities_df.set_index('city_id').loc[[start, end]]
+    points = unit_vectors(rows['latitude'].to_numpy(), rows['longitude'].to_numpy())
+    arc_km = math.acos(max(-1.0, min(1.0, float(points[0] @ points[1])))) * EARTH_RADIUS_KM
+    reach_km = connection_angle(r, d) * EARTH_RADIUS_KM
+    return max(min(reach_km, arc_km), 0.2 * arc_km, 1.0)
+
+
+def corridor_graph_with_path(cities_df, start, end, r=None, d=None, buffer_km=None,
+                             growth=2.0, max_widenings=8, name_to_id=None, id_to_name=None):
+    """
+    Constrói o grafo do corredor e alarga o buffer até existir caminho entre start e end.
+
+    O alargamento para quando há caminho, quando o corredor já contém todas as cidades
+    (resultado equivalente ao grafo completo) ou após max_widenings tentativas.
+
+    Returns:
+        Grafo NetworkX; G.graph['corridor'] inclui também 'widenings' e 'has_path'
+        (grafo vazio se a origem ou o destino não estiver em cities_df)
+    """
+    if not _has_endpoints(cities_df, start, end):
+        G = build_corridor_graph(cities_df, start, end, r=r, d=d, name_to_id=name_to_id, id_to_name=id_to_name)
+        G.graph['corridor'].update(widenings=0, has_path=False)
+        return G
+    if buffer_km is None:
+        buffer_km = default_buffer_km(cities_df, start, end, r, d)
+    widenings = 0
+    while True:
+        G = build_corridor_graph(cities_df, start, end, r=r, d=d, buffer_km=buffer_km,
+                                 name_to_id=name_to_id, id_to_name=id_to_name)
+        has_path = nx.has_path(G, start, end)
+        complete = G.graph['corridor']['cities'] >= len(cities_df)
+        if has_path or complete or widenings >= max_widenings:
+            G.graph['corridor'].update(widenings=widenings, has_path=has_path)
+            return G
+        buffer_km *= growth
+        widenings += 1
@@ -0,0 +1,94 @@
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+from app.utils.graph_arrays import get_graph_arrays
+
+# Atributos por cidade que penalizam a chegada a ela (somados ao peso da aresta)
+PENALTY_ATTRIBUTES = ('criminalidade', 'infraestrutura_ruim')
+
+
+def penalties_for_nodes(nodes, cities_df):
+    """
+    Penalidade de cada nó da lista, a partir das colunas/chaves de PENALTY_ATTRIBUTES.
+
+    Aceita o DataFrame das cidades (colunas opcionais, associadas pelo city_id) ou
+    um dicionário id -> dados da cidade. Valores ausentes ou não numéricos valem 0.
+    Penalidades negativas também valem 0: com elas o custo de uma aresta poderia
+    ficar abaixo da distância geométrica e a heurística de Haversine deixaria de
+    ser admissível.
+
+    Args:
+        nodes: ids dos nós, na ordem desejada
+        cities_df: DataFrame ou dicionário com informações das cidades
+
+    Returns:
+        Array float64 com uma penalidade por nó
+    """
+    penalties = np.zeros(len(nodes), dtype=np.float64)
+    if hasattr(cities_df, 'columns'):
+        columns = [c for c in PENALTY_ATTRIBUTES if c in cities_df.columns]
+        if columns and 'city_id' in cities_df.columns:
+            values = cities_df[columns].apply(pd.to_numeric, errors='coerce').fillna(0.0).sum(axis=1)
+            by_id = dict(zip(cities_df['city_id'].astype(int).tolist(), values.tolist()))
+            penalties = np.array([by_id.get(node, 0.0) for node in nodes], dtype=np.float64)
+    elif isinstance(cities_df, dict) and cities_df:
+        for i, node in enumerate(nodes):
+            info = cities_df.get(node)
+            if info:
+                penalties[i] = sum(float(info[a]) for a in PENALTY_ATTRIBUTES if a in info)
+    return np.maximum(np.nan_to_num(penalties), 0.0)
+
+
+def node_penalties(arrays, cities_df):
+    """Penalidade de cada nó do grafo, na ordem de GraphArrays.nodes (ver penalties_for_nodes)."""
+    return penalties_for_nodes(arrays.nodes, cities_df)
+
+
+class EdgeCostModel:
+    """
+    Custo de cada aresta já com as penalidades, alinhado com a estrutura CSR.
+
+    O custo de (u, v) é weight(u, v) + penalidade(v), como no custo padrão do A*.
+
+    Attributes:
+        arrays: GraphArrays do grafo
+        penalties: penalidade de cada nó (array)
+        costs: custo de cada posição de `indices` (array)
+        has_penalties: True se algum nó tem penalidade
+        indptr_list, indices_list, costs_list: as mesmas informações em listas
+            Python, para os laços de relaxação
+    """
+
+    def __init__(self, arrays, penalties):
+        self.arrays = arrays
+        self.penalties = penalties
+        self.has_penalties = bool(np.any(penalties > 0))
+        indptr, indices, weights, _ = arrays.adjacency_lists()
+        self.indptr_list, self.indices_list = indptr, indices
+        if self.has_penalties:
+            self.costs = arrays.weights + penalties[arrays.indices]
+            self.costs_list = self.costs.tolist()
+        else:
+            self.costs, self.costs_list = arrays.weights, weights
+
+
+def get_edge_cost_model(graph, cities_df, penalties=None):
+    """
+    Retorna o modelo de custos das arestas, compilado uma vez por grafo e conjunto
+    de penalidades (o hash das penalidades identifica o conjunto de dados).
+
+    Args:
+        graph: Grafo NetworkX
+        cities_df: DataFrame ou dicionário com informações das cidades
+        penalties: penalidades já calculadas com node_penalties (opcional)
+
+    Returns:
+        EdgeCostModel armazenado junto aos arrays do grafo
+    """
+    arrays = get_graph_arrays(graph)
+    if penalties is None:
+        penalties = node_penalties(arrays, cities_df)
+    key = ('edge_costs', hashlib.sha1(penalties.tobytes()).hexdigest())
+    return arrays.derived(key, lambda: EdgeCostModel(arrays, penalties))
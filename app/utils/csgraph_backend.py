@@ -0,0 +1,71 @@
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import breadth_first_order, connected_components, dijkstra
+
+from app.utils.graph_arrays import get_graph_arrays
+from app.utils.sssp_cache import walk_parents
+
+
+def csr_export(arrays):
+    """
+    Matriz esparsa scipy (n x n) com os pesos das arestas, montada uma vez por grafo
+    diretamente sobre a estrutura CSR (os dois sentidos de cada aresta já estão nela).
+    Zeros explícitos continuam sendo arestas para o scipy.sparse.csgraph.
+    """
+    return arrays.derived(
+        'csgraph_matrix',
+        lambda: csr_matrix((arrays.weights, arrays.indices, arrays.indptr), shape=(arrays.n, arrays.n))
+    )
+
+
+def _recover(arrays, predecessors, source, target):
+    """Caminho (ids originais) a partir dos predecessores do scipy (-9999 na raiz e inalcançáveis)."""
+    if target != source and predecessors[target] < 0:
+        return None
+    path = walk_parents(predecessors, target)
+    path.reverse()
+    return arrays.path_to_nodes(path)
+
+
+def csgraph_shortest_path(graph, start, end):
+    """
+    Menor caminho por soma de pesos com o Dijkstra em C do scipy (árvore completa
+    a partir da origem). Entre rotas de mesma distância, fica a que o scipy
+    encontrar primeiro (sem desempate por população).
+
+    Returns:
+        path: lista de nós (ids originais) ou None
+        total_dist: distância da rota (inf se não existir)
+    """
+    arrays = get_graph_arrays(graph)
+    s, t = arrays.index[start], arrays.index[end]
+    dist, predecessors = dijkstra(csr_export(arrays), directed=True, indices=s, return_predecessors=True)
+    if not np.isfinite(dist[t]):
+        return None, float('inf')
+    return _recover(arrays, predecessors, s, t), float(dist[t])
+
+
+def csgraph_min_hop_path(graph, start, end):
+    """
+    Rota com o menor número de saltos pela BFS em C do scipy (breadth_first_order).
+    Entre rotas com o mesmo número de saltos, fica a da árvore BFS do scipy (sem
+    desempate por população). A distância é a soma dos pesos da rota encontrada.
+
+    Returns:
+        path: lista de nós (ids originais) ou None
+        total_dist: soma dos pesos das arestas da rota (inf se não existir)
+    """
+    arrays = get_graph_arrays(graph)
+    s, t = arrays.index[start], arrays.index[end]
+    _, predecessors = breadth_first_order(csr_export(arrays), s, directed=True, return_predecessors=True)
+    path = _recover(arrays, predecessors, s, t)
+    if path is None:
+        return None, float('inf')
+    return path, arrays.path_weight([arrays.index[node] for node in path])
+
+
+def csgraph_component_labels(graph):
+    """Rótulo do componente conexo de cada nó (na ordem de GraphArrays.nodes), pelo scipy."""
+    arrays = get_graph_arrays(graph)
+    _, labels = connected_components(csr_export(arrays), directed=False)
+    return labels.astype(np.int64)
@@ -0,0 +1,159 @@
+import time
+
+import networkx as nx
+import numpy as np
+
+from app.utils.graph_arrays import get_graph_arrays
+
+
+def dominated_edge_mask(arrays):
+    """
+    Marca as arestas dominadas: (u, v) tal que existe w com w(u,w) + w(w,v) <= w(u,v).
+
+    Apenas arestas de peso positivo servem de desvio. Assim as duas arestas do desvio
+    são estritamente mais curtas que (u, v) e, por indução no peso, remover todas as
+    arestas dominadas ao mesmo tempo preserva exatamente as distâncias mínimas.
+
+    Para cada nó u, o menor desvio até cada vizinho é min_w D[u,w] + D[w,v] sobre a
+    submatriz de adjacência dos vizinhos de u (produto min-plus vetorizado).
+
+    Args:
+        arrays: GraphArrays do grafo
+
+    Returns:
+        Array booleano alinhado com `indices` (True = aresta dominada); como a matriz
+        é simétrica, (u, v) e (v, u) recebem a mesma decisão
+    """
+    n = arrays.n
+    # Matriz de pesos densa; inf onde não há aresta ou o peso não é positivo
+    detour = np.full((n, n), np.inf)
+    sources = arrays.edge_sources()
+    positive = arrays.weights > 0
+    detour[sources[positive], arrays.indices[positive]] = arrays.weights[positive]
+
+    mask = np.zeros(len(arrays.indices), dtype=bool)
+    for u in range(n):
+        start, end = arrays.indptr[u], arrays.indptr[u + 1]
+        if end - start < 2:
+            continue
+        neighbors = arrays.indices[start:end]
+        via = (detour[u, neighbors][:, None] + detour[np.ix_(neighbors, neighbors)]).min(axis=0)
+        mask[start:end] = via <= arrays.weights[start:end]
+    return mask
+
+
+def stretch_dominated_edge_mask(arrays, stretch):
+    """
+    Marca as arestas com desvio de dois saltos de custo até stretch * w(u, v).
+
+    As arestas são processadas em ordem crescente de peso, e o desvio só pode usar
+    arestas já mantidas (que nunca são removidas depois). Assim cada aresta removida
+    tem um substituto definitivo e o alongamento de qualquer caminho fica limitado a
+    `stretch`, sem acúmulo entre remoções.
+
+    Returns:
+        Array booleano alinhado com `indices` (True = aresta removida)
+    """
+    n = arrays.n
+    kept = np.full((n, n), np.inf)
+    sources = arrays.edge_sources()
+    upper = np.flatnonzero(sources < arrays.indices)
+    order = upper[np.argsort(arrays.weights[upper], kind='stable')]
+    removed = np.zeros(len(arrays.indices), dtype=bool)
+    for pos in order:
+        u, v, weight = sources[pos], arrays.indices[pos], arrays.weights[pos]
+        if np.min(kept[u] + kept[v]) <= stretch * weight:
+            removed[pos] = True
+        else:
+            kept[u, v] = kept[v, u] = weight
+    # Espelha a decisão para a direção (v, u)
+    reverse = arrays.indptr[arrays.indices[upper]] + np.array(
+        [np.searchsorted(arrays.indices[arrays.indptr[v]:arrays.indptr[v + 1]], u)
+         for u, v in zip(sources[upper], arrays.indices[upper])], dtype=np.int64)
+    removed[reverse] = removed[upper]
+    return removed
+
+
+def prune_dominated_edges(graph, stretch=1.0):
+    """
+    Remove as arestas dominadas do grafo.
+
+    Com stretch=1.0 a remoção é exata e preserva todas as distâncias mínimas. Como os
+    pesos são distâncias de grande círculo, a desigualdade triangular só vira igualdade
+    para cidades exatamente alinhadas, então no grafo geométrico puro quase nenhuma
+    aresta é dominada. Com stretch > 1, uma aresta (u, v) também é removida quando um
+    desvio de dois saltos por arestas mantidas custa no máximo stretch * w(u, v); as
+    distâncias passam a ser preservadas dentro desse fator.
+
+    O grafo original fica em G.graph['full_graph'], apenas para visualização.
+
+    Args:
+        graph: Grafo NetworkX (pesos em 'weight')
+        stretch: fator máximo de alongamento permitido (1.0 = exato)
+
+    Returns:
+        Novo grafo NetworkX com os mesmos nós e atributos; G.graph['edge_pruning']
+        traz 'edges_before', 'edges_after', 'removed', 'reduction' (fração removida)
+        e 'stretch'
+    """
+    arrays = get_graph_arrays(graph)
+    mask = dominated_edge_mask(arrays) if stretch <= 1.0 else stretch_dominated_edge_mask(arrays, stretch)
+
+    pruned = nx.Graph()
+    pruned.graph.update(graph.graph)
+    pruned.add_nodes_from(graph.nodes(data=True))
+    sources = arrays.edge_sources()
+    nodes = arrays.nodes
+    for u, v, dominated in zip(sources.tolist(), arrays.indices.tolist(), mask.tolist()):
+        if u < v and not dominated:
+            pruned.add_edge(nodes[u], nodes[v], **graph.get_edge_data(nodes[u], nodes[v]))
+
+    edges_before = graph.number_of_edges()
+    edges_after = pruned.number_of_edges()
+    pruned.graph['full_graph'] = graph
+    pruned.graph['edge_pruning'] = {
+        'edges_before': edges_before,
+        'edges_after': edges_after,
+        'removed': edges_before - edges_after,
+        'reduction': (edges_before - edges_after) / edges_before if edges_before else 0.0,
+        'stretch': stretch
+    }
+    return pruned
+
+
+def benchmark_edge_pruning(graph, pruned, searches, pairs, warmup=True):
+    """
+    Compara o tempo das buscas no grafo completo e no grafo sem arestas dominadas.
+    Com warmup, cada busca roda uma vez sem medição em cada grafo, para que a
+    construção única dos arrays CSR não entre no tempo.
+
+    Args:
+        graph: grafo completo
+        pruned: grafo retornado por prune_dominated_edges
+        searches: dicionário nome -> função (grafo, start, end) que executa a busca
+        pairs: lista de tuplas (start, end)
+        warmup: executa uma rodada sem medição antes de medir
+
+    Returns:
+        Lista de dicionários com 'algorithm', 'full_ms', 'pruned_ms', 'speedup',
+        'edges_before' e 'edges_after'
+    """
+    records = []
+    for name, search in searches.items():
+        timings = {}
+        for label, g in (('full_ms', graph), ('pruned_ms', pruned)):
+            if warmup and pairs:
+                search(g, *pairs[0])
+            begin = time.perf_counter()
+            for start, end in pairs:
+                search(g, start, end)
+            timings[label] = (time.perf_counter() - begin) * 1000
+        records.append({
+            'algorithm': name,
+            'full_ms': timings['full_ms'],
+            'pruned_ms': timings['pruned_ms'],
+            'speedup': timings['full_ms'] / timings['pruned_ms'] if timings['pruned_ms'] > 0 else float('inf'),
+            'edges_before': graph.number_of_edges(),
+            'edges_after': pruned.number_of_edges()
+        })
+    return records
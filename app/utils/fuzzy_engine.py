@@ -0,0 +1,265 @@
+import numpy as np
+
+from app.utils.graph_arrays import get_graph_arrays
+from app.utils.priority_queues import make_queue_factory
+
+# Parâmetros padrão da função de pertinência fuzzy
+DEFAULT_FUZZY_PARAMS = {
+    'alpha': 3.0,         # Limiar para certeza máxima (max_distance/alpha)
+    'min_certainty': 0.1,  # Valor mínimo de certeza
+    'decay_factor': 0.9   # Fator de decaimento na interpolação
+}
+
+
+def membership_values(edge_dist, max_distance, alpha, min_certainty, decay_factor):
+    """
+    Função de pertinência fuzzy vetorizada (mesma regra de fuzzy_search).
+
+    Args:
+        edge_dist: array com a distância de cada aresta
+        max_distance: distância máxima (na mesma unidade de edge_dist)
+        alpha, min_certainty, decay_factor: parâmetros da função de pertinência
+
+    Returns:
+        Array com a certeza de cada aresta
+    """
+    edge_dist = np.asarray(edge_dist, dtype=np.float64)
+    return np.select(
+        [edge_dist <= max_distance / alpha, edge_dist >= max_distance],
+        [1.0, min_certainty],
+        default=1.0 - (edge_dist / max_distance) * decay_factor
+    )
+
+
+class FuzzyEdgeModel:
+    """
+    Certeza fuzzy pré-calculada de cada aresta, alinhada com a estrutura CSR.
+
+    Attributes:
+        arrays: GraphArrays do grafo
+        distance_type: 'angular', 'km' ou 'weight'
+        max_distance: distância máxima usada na normalização
+        edge_dist: distância de cada aresta conforme o tipo (array)
+        certainty: certeza de cada aresta (array)
+        edge_dist_list, certainty_list, indices_list, indptr_list: as mesmas
+            informações em listas Python, para os laços de relaxação
+    """
+
+    def __init__(self, arrays, r=None, d=None, params=None):
+        params = {**DEFAULT_FUZZY_PARAMS, **(params or {})}
+        self.arrays = arrays
+        self.params = params
+
+        # Determinar a distância máxima permitida e tipo de distância
+        if r is not None:
+            self.max_distance = r
+            self.distance_type = 'angular'
+            edge_dist = np.where(np.isnan(arrays.angular_dist), arrays.weights, arrays.angular_dist)
+        elif d is not None:
+            self.max_distance = d
+            self.distance_type = 'km'
+            edge_dist = np.where(np.isnan(arrays.km_dist), arrays.weights, arrays.km_dist)
+        else:
+            self.max_distance = float(arrays.weights.max()) if arrays.weights.size else 10.0
+            self.distance_type = 'weight'
+            edge_dist = arrays.weights
+
+        # Distâncias das arestas e distância máxima na mesma unidade (graus com r, km com d)
+        self.edge_dist = edge_dist
+        self.certainty = membership_values(
+            edge_dist, self.max_distance,
+            params['alpha'], params['min_certainty'], params['decay_factor']
+        )
+
+        self.edge_dist_list = self.edge_dist.tolist()
+        self.certainty_list = self.certainty.tolist()
+        self.indices_list = arrays.indices.tolist()
+        self.indptr_list = arrays.indptr.tolist()
+
+
+def get_fuzzy_edge_model(graph, r=None, d=None, params=None):
+    """
+    Retorna o modelo de certezas das arestas, calculado uma vez por grafo e
+    conjunto de parâmetros (alpha, min_certainty, decay_factor, r, d).
+
+    Args:
+        graph: Grafo NetworkX
+        r: Raio máximo de conexão em graus (opcional)
+        d: Distância máxima em km (opcional)
+        params: dicionário com parâmetros da função de pertinência (opcional)
+
+    Returns:
+        FuzzyEdgeModel armazenado junto aos arrays do grafo
+    """
+    arrays = get_graph_arrays(graph)
+    merged = {**DEFAULT_FUZZY_PARAMS, **(params or {})}
+    key = ('fuzzy', r, d, merged['alpha'], merged['min_certainty'], merged['decay_factor'])
+    return arrays.derived(key, lambda: FuzzyEdgeModel(arrays, r=r, d=d, params=merged))
+
+
+class WidestPathOracle:
+    """
+    Oráculo exato de certeza máxima (caminho mais largo / max-min) entre dois nós.
+
+    A certeza de um caminho é a menor certeza entre suas arestas. A maior certeza
+    alcançável entre quaisquer dois nós é o gargalo do caminho entre eles em uma
+    árvore geradora máxima (floresta, se o grafo for desconexo) sobre as certezas.
+    A árvore é construída uma vez por grafo e parâmetros; as consultas usam LCA
+    por binary lifting, com o mínimo de certeza acumulado em cada salto: O(log n).
+
+    Attributes:
+        model: FuzzyEdgeModel de onde vêm as certezas
+        component: rótulo da componente conexa de cada nó
+        depth: profundidade de cada nó na árvore
+        up: tabela de ancestrais (up[k][v] = ancestral 2^k de v)
+        min_up: menor certeza no trecho v -> up[k][v]
+    """
+
+    def __init__(self, model):
+        from scipy.sparse import csr_matrix
+        from scipy.sparse.csgraph import connected_components, minimum_spanning_tree
+
+        self.model = model
+        arrays = model.arrays
+        n = arrays.n
+
+        # Árvore geradora máxima sobre certezas = mínima sobre (2 - certeza) > 0
+        sources = arrays.edge_sources()
+        upper = sources < arrays.indices
+        matrix = csr_matrix(
+            (2.0 - model.certainty[upper], (sources[upper], arrays.indices[upper])), shape=(n, n)
+        )
+        tree = minimum_spanning_tree(matrix).tocoo()
+        tree_u, tree_v = tree.row.astype(np.int64), tree.col.astype(np.int64)
+        # Recuperar as certezas originais (2 - (2 - c) pode diferir de c no último bit)
+        tree_c = np.array(
+            [model.certainty[arrays.edge_position(u, v)] for u, v in zip(tree_u, tree_v)], dtype=np.float64
+        )
+
+        _, self.component = connected_components(matrix, directed=False)
+
+        # Enraizar cada árvore da floresta (BFS) para obter pai, certeza da aresta e profundidade
+        adjacency = [[] for _ in range(n)]
+        for u, v, c in zip(tree_u.tolist(), tree_v.tolist(), tree_c.tolist()):
+            adjacency[u].append((v, c))
+            adjacency[v].append((u, c))
+        parent = np.arange(n, dtype=np.int64)
+        parent_certainty = np.ones(n, dtype=np.float64)
+        depth = np.zeros(n, dtype=np.int64)
+        seen = np.zeros(n, dtype=bool)
+        for root in range(n):
+            if seen[root]:
+                continue
+            seen[root] = True
+            queue = [root]
+            for node in queue:
+                for neighbor, certainty in adjacency[node]:
+                    if not seen[neighbor]:
+                        seen[neighbor] = True
+                        parent[neighbor] = node
+                        parent_certainty[neighbor] = certainty
+                        depth[neighbor] = depth[node] + 1
+                        queue.append(neighbor)
+        self.depth = depth
+
+        # Binary lifting vetorizado
+        levels = max(1, int(depth.max()).bit_length())
+        self.up = [parent]
+        self.min_up = [parent_certainty]
+        for k in range(1, levels):
+            previous, previous_min = self.up[k - 1], self.min_up[k - 1]
+            self.up.append(previous[previous])
+            self.min_up.append(np.minimum(previous_min, previous_min[previous]))
+
+    def best_certainty(self, a, b):
+        """
+        Maior certeza alcançável entre os índices internos a e b.
+
+        Returns:
+            Certeza do caminho mais largo (1.0 se a == b, 0.0 se não houver caminho)
+        """
+        if a == b:
+            return 1.0
+        if self.component[a] != self.component[b]:
+            return 0.0
+        best = 1.0
+        if self.depth[a] < self.depth[b]:
+            a, b = b, a
+        diff = int(self.depth[a] - self.depth[b])
+        k = 0
+        while diff:
+            if diff & 1:
+                best = min(best, self.min_up[k][a])
+                a = self.up[k][a]
+            diff >>= 1
+            k += 1
+        if a == b:
+            return float(best)
+        for k in range(len(self.up) - 1, -1, -1):
+            if self.up[k][a] != self.up[k][b]:
+                best = min(best, self.min_up[k][a], self.min_up[k][b])
+                a, b = self.up[k][a], self.up[k][b]
+        best = min(best, self.min_up[0][a], self.min_up[0][b])
+        return float(best)
+
+
+def get_widest_path_oracle(graph, r=None, d=None, params=None):
+    """Retorna o WidestPathOracle do grafo, construído uma vez por grafo e parâmetros."""
+    model = get_fuzzy_edge_model(graph, r=r, d=d, params=params)
+    key = ('widest_path', r, d) + tuple(sorted(model.params.items()))
+    return model.arrays.derived(key, lambda: WidestPathOracle(model))
+
+
+def certainty_restricted_path(model, source, target, min_certainty, queue=None):
+    """
+    Dijkstra sobre a distância das arestas, usando apenas arestas com certeza
+    >= min_certainty (desempate por menor população).
+
+    Args:
+        model: FuzzyEdgeModel
+        source, target: índices internos
+        min_certainty: certeza mínima exigida de cada aresta
+        queue: fila de prioridade ('heapq', 'radix', 'dary', ou fábrica); default: heapq
+
+    Returns:
+        (lista de índices do caminho, distância acumulada) ou (None, inf)
+    """
+    indptr, indices = model.indptr_list, model.indices_list
+    edge_dists, edge_certainties = model.edge_dist_list, model.certainty_list
+    populations = model.arrays.population.tolist()
+    n = model.arrays.n
+
+    distances = [float('inf')] * n
+    predecessors = [None] * n
+    settled = [False] * n
+    distances[source] = 0.0
+    counter = 0
+    heap = make_queue_factory(queue)()
+    heap.push((0.0, populations[source], counter, source))
+    while heap:
+        dist, _, _, node = heap.pop()
+        if settled[node]:
+            continue
+        settled[node] = True
+        if node == target:
+            break
+        for pos in range(indptr[node], indptr[node + 1]):
+            if edge_certainties[pos] < min_certainty:
+                continue
+            neighbor = indices[pos]
+            alt = dist + edge_dists[pos]
+            if alt < distances[neighbor]:
+                distances[neighbor] = alt
+                predecessors[neighbor] = node
+                counter += 1
+                heap.push((alt, populations[neighbor], counter, neighbor))
+
+    if not settled[target]:
+        return None, float('inf')
+    path = []
+    node = target
+    while node is not None:
+        path.append(node)
+        node = predecessors[node]
+    path.reverse()
+    return path, distances[target]
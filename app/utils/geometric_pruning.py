@@ -0,0 +1,164 @@
+import heapq
+
+import numpy as np
+
+from app.utils.graph_arrays import get_graph_arrays
+from app.utils.graph_utils import haversine_distances
+
+EARTH_RADIUS_KM = 6371.0
+
+# Folga relativa na comparação com o limite superior (arredondamento de ponto flutuante)
+_TOLERANCE = 1e-9
+
+
+def distance_lower_bounds(arrays, node):
+    """
+    Limite inferior da distância de `node` a todos os nós, nas unidades dos pesos do grafo.
+
+    Os pesos das arestas são distâncias de grande círculo entre as cidades (km quando
+    o grafo foi construído com d, graus quando apenas com r), então a distância de
+    grande círculo entre dois nós nunca excede o custo de uma rota entre eles.
+
+    Args:
+        arrays: GraphArrays do grafo
+        node: índice interno do nó de referência
+
+    Returns:
+        Array float64 de tamanho n
+    """
+    km = haversine_distances(arrays.latitude, arrays.longitude,
+                             arrays.latitude[node], arrays.longitude[node])
+    if arrays.d is None:
+        return np.degrees(km / EARTH_RADIUS_KM)
+    return km
+
+
+def greedy_upper_bound(arrays, source, target, h_to_target, edge_cost=None):
+    """
+    Rota viável rápida por busca gulosa (best-first pela distância em linha reta ao destino).
+
+    Args:
+        arrays: GraphArrays do grafo
+        source, target: índices internos
+        h_to_target: limites inferiores até o destino (lista ou array)
+        edge_cost: função (u, v, pos) -> custo da aresta, com u e v índices internos e
+            pos a posição da aresta na estrutura CSR; default: peso da aresta
+
+    Returns:
+        (caminho de índices, custo) ou (None, inf) se o destino for inalcançável
+    """
+    indptr, indices, weights, _ = arrays.adjacency_lists()
+    parent = {source: None}
+    cost = {source: 0.0}
+    heap = [(h_to_target[source], source)]
+    while heap:
+        _, node = heapq.heappop(heap)
+        if node == target:
+            path = []
+            while node is not None:
+                path.append(node)
+                node = parent[node]
+            path.reverse()
+            return path, cost[target]
+        for pos in range(indptr[node], indptr[node + 1]):
+            neighbor = indices[pos]
+            if neighbor not in parent:
+                parent[neighbor] = node
+                cost[neighbor] = cost[node] + (weights[pos] if edge_cost is None else edge_cost(node, neighbor, pos))
+                heapq.heappush(heap, (h_to_target[neighbor], neighbor))
+    return None, float('inf')
+
+
+class EllipsePruner:
+    """
+    Poda geométrica (elipse) para buscas ponto a ponto.
+
+    Um nó n só pode estar em uma rota ótima se dist(start, n) + dist(n, end) <= U,
+    onde dist é a distância de grande círculo (limite inferior do custo) e U é o
+    custo de qualquer rota viável. Os nós fora dessa elipse são ignorados na
+    relaxação. U começa no custo de uma rota gulosa (ou no valor informado) e é
+    reduzido com tighten() à medida que as buscas encontram soluções melhores.
+
+    Só é válida quando o custo das arestas é pelo menos a distância geométrica e
+    U é medido com o mesmo custo que a busca relaxa: com penalidades (custo maior
+    que o peso), informe edge_cost; com os pesos, U é menor que o custo de qualquer
+    rota e a busca descarta todas.
+
+    Attributes:
+        upper_bound: limite superior atual (U)
+        initial_upper_bound: U no início da consulta
+        through: limite inferior do custo de uma rota start -> n -> end, por nó
+        to_end: limite inferior do custo de n até end, por nó
+        skipped: relaxações descartadas pela poda
+    """
+
+    def __init__(self, graph, start, end, upper_bound=None, edge_cost=None):
+        arrays = get_graph_arrays(graph)
+        self.arrays = arrays
+        self._index = arrays.index
+        s, t = arrays.index[start], arrays.index[end]
+        to_start = distance_lower_bounds(arrays, s)
+        to_end = distance_lower_bounds(arrays, t)
+        self.to_end = to_end
+        self.through = to_start + to_end
+        self._through_list = self.through.tolist()
+        self._to_end_list = to_end.tolist()
+
+        if upper_bound is None:
+            _, upper_bound = greedy_upper_bound(arrays, s, t, to_end.tolist(), edge_cost)
+        self.initial_upper_bound = float(upper_bound)
+        self.upper_bound = float(upper_bound)
+        self._limit = self.upper_bound * (1 + _TOLERANCE)
+        self.skipped = 0
+
+    def tighten(self, value):
+        """Reduz U quando uma rota de custo `value` é encontrada."""
+        if value < self.upper_bound:
+            self.upper_bound = float(value)
+            self._limit = self.upper_bound * (1 + _TOLERANCE)
+
+    def allows(self, node, cost=None):
+        """
+        True se o nó (id original) ainda pode estar em uma rota ótima.
+
+        Com `cost` (custo já percorrido de start até o nó), exige também
+        cost + dist(n, end) <= U, que é mais restritivo que a elipse.
+        """
+        i = self._index[node]
+        if self._through_list[i] <= self._limit and \
+                (cost is None or cost + self._to_end_list[i] <= self._limit):
+            return True
+        self.skipped += 1
+        return False
+
+    def stats(self):
+        """Métricas da poda: limites inicial e final, nós podados e fração podada."""
+        pruned = int(np.count_nonzero(self.through > self._limit))
+        return {
+            'initial_upper_bound': self.initial_upper_bound,
+            'upper_bound': self.upper_bound,
+            'pruned_nodes': pruned,
+            'pruned_fraction': pruned / self.arrays.n if self.arrays.n else 0.0,
+            'skipped_relaxations': self.skipped
+        }
+
+
+def make_pruner(graph, start, end, pruning, edge_cost=None):
+    """
+    Normaliza o parâmetro de poda das buscas.
+
+    Args:
+        pruning: None/False (sem poda), True (cria um EllipsePruner) ou um
+            EllipsePruner já criado (para consultar stats() depois da busca)
+        edge_cost: custo das arestas relaxado pela busca, para o limite superior
+            do EllipsePruner criado (ver greedy_upper_bound); default: peso
+
+    Returns:
+        EllipsePruner ou None
+    """
+    if not pruning:
+        return None
+    if pruning is True:
+        return EllipsePruner(graph, start, end, edge_cost=edge_cost)
+    return pruning
+
@@ -0,0 +1,224 @@
+import hashlib
+import weakref
+
+import numpy as np
+
+# Cache de representações em arrays, indexado pelo próprio objeto do grafo.
+# --- Usa referência fraca: quando o grafo é descartado, a entrada some junto.
+# --- Se o grafo sofrer mutação (nº de nós/arestas mudar), a entrada é reconstruída.
+_arrays_cache = weakref.WeakKeyDictionary()
+
+# Arestas conferidas a cada acesso ao cache (amostra fixa espalhada pela CSR)
+_PROBE_EDGES = 64
+
+
+class GraphArrays:
+    """
+    Representação CSR (compressed sparse row) de um grafo NetworkX não direcionado.
+
+    Cada nó recebe um índice inteiro contíguo (0..n-1). As listas de adjacência
+    ficam concatenadas em `indices`, com `indptr[i]:indptr[i+1]` delimitando os
+    vizinhos do nó i. Os atributos das arestas (weight, km_dist, angular_dist)
+    ficam alinhados com `indices`, e os atributos dos nós (população, coordenadas,
+    estado) em arrays de tamanho n.
+
+    Attributes:
+        nodes: lista com os identificadores originais dos nós (city_id)
+        index: dicionário nó -> índice inteiro
+        indptr, indices: estrutura CSR (int64)
+        weights, km_dist, angular_dist: atributos das arestas (float64)
+        population: população de cada nó (int64)
+        latitude, longitude: coordenadas de cada nó (float64)
+        state: estado de cada nó (array de objetos)
+        fingerprint: hash do conteúdo do grafo, estável entre execuções
+    """
+
+    def __init__(self, graph):
+        self.nodes = list(graph.nodes())
+        self.index = {node: i for i, node in enumerate(self.nodes)}
+        self.n = len(self.nodes)
+
+        nodes_data = graph.nodes
+        self.population = np.array(
+            [int(nodes_data[n].get('population', 0) or 0) for n in self.nodes], dtype=np.int64
+        )
+        self.latitude = np.array(
+            [float(nodes_data[n].get('latitude', np.nan)) for n in self.nodes], dtype=np.float64
+        )
+        self.longitude = np.array(
+            [float(nodes_data[n].get('longitude', np.nan)) for n in self.nodes], dtype=np.float64
+        )
+        self.state = np.array([nodes_data[n].get('state', '') for n in self.nodes], dtype=object)
+
+        # Montar a estrutura CSR com vizinhos ordenados por índice (determinístico)
+        indptr = np.zeros(self.n + 1, dtype=np.int64)
+        indices, weights, km_dist, angular_dist = [], [], [], []
+        index = self.index
+        for i, node in enumerate(self.nodes):
+            neighbors = sorted(graph[node].items(), key=lambda item: index[item[0]])
+            for neighbor, data in neighbors:
+                indices.append(index[neighbor])
+                weights.append(data.get('weight', 1.0))
+                km_dist.append(data.get('km_dist', np.nan))
+                angular_dist.append(data.get('angular_dist', np.nan))
+            indptr[i + 1] = len(indices)
+
+        self.indptr = indptr
+        self.indices = np.array(indices, dtype=np.int64)
+        self.weights = np.array(weights, dtype=np.float64)
+        self.km_dist = np.array(km_dist, dtype=np.float64)
+        self.angular_dist = np.array(angular_dist, dtype=np.float64)
+        self.degree = np.diff(indptr)
+
+        self.r = graph.graph.get('r')
+        self.d = graph.graph.get('d')
+        self.fingerprint = self._compute_fingerprint()
+
+        # Arrays derivados (ex.: certezas fuzzy, custos compilados), guardados ao lado dos pesos
+        self._derived = {}
+
+        # Amostra (u, v, peso) conferida contra o grafo antes de reaproveitar os arrays
+        positions = np.unique(np.linspace(0, len(self.indices) - 1, min(_PROBE_EDGES, len(self.indices)),
+                                          dtype=np.int64))
+        sources = self.edge_sources()[positions]
+        self._probe = [
+            (self.nodes[u], self.nodes[v], w)
+            for u, v, w in zip(sources.tolist(), self.indices[positions].tolist(), self.weights[positions].tolist())
+        ]
+
+    @property
+    def num_edges(self):
+        """Número de arestas não direcionadas."""
+        return len(self.indices) // 2
+
+    def _compute_fingerprint(self):
+        digest = hashlib.sha1()
+        digest.update(repr((self.nodes, self.r, self.d)).encode())
+        for array in (self.indptr, self.indices, self.weights):
+            digest.update(array.tobytes())
+        return digest.hexdigest()
+
+    def matches(self, graph):
+        """
+        Conferência barata de que os arrays ainda correspondem ao grafo: grau de
+        cada nó (pega religações com o mesmo número de arestas) e os pesos de uma
+        amostra fixa de arestas (pega a troca de pesos de todo o grafo). A troca
+        in place do peso de arestas isoladas exige invalidate_graph_arrays.
+        """
+        # Dicionário interno de adjacência do NetworkX: sem as views, a conferência custa ~0,1 ms
+        adjacency = getattr(graph, '_adj', None)
+        if adjacency is None:
+            # Grafo implícito: as arestas dependem só dos nós e de r/d, já conferidos no stamp
+            return True
+        degrees = np.fromiter(map(len, adjacency.values()), dtype=np.int64, count=self.n)
+        if not np.array_equal(degrees, self.degree):
+            return False
+        for u, v, weight in self._probe:
+            data = adjacency.get(u, {}).get(v)
+            if data is None or data.get('weight', 1.0) != weight:
+                return False
+        return True
+
+    def derived(self, key, builder):
+        """
+        Retorna um array (ou estrutura) derivado do grafo, calculando-o apenas uma vez.
+
+        Args:
+            key: chave hashable que identifica o dado derivado e seus parâmetros
+            builder: função sem argumentos que calcula o valor na primeira chamada
+        """
+        if key not in self._derived:
+            self._derived[key] = builder()
+        return self._derived[key]
+
+    def adjacency_lists(self):
+        """
+        indptr, indices, weights e população como listas Python (calculadas uma vez),
+        para os laços de relaxação com heapq, onde o acesso a listas é mais rápido.
+        """
+        return self.derived('adjacency_lists', lambda: (
+            self.indptr.tolist(), self.indices.tolist(), self.weights.tolist(), self.population.tolist()
+        ))
+
+    def edge_sources(self):
+        """Array com o nó de origem de cada posição de `indices` (forma COO)."""
+        return np.repeat(np.arange(self.n, dtype=np.int64), self.degree)
+
+    def gather_neighbors(self, rows):
+        """
+        Concatena, de forma vetorizada, as listas de adjacência dos nós em `rows`.
+
+        Args:
+            rows: array de índices de nós
+
+        Returns:
+            owners: para cada posição, o nó de `rows` ao qual o vizinho pertence
+            positions: posições correspondentes em `indices`/`weights`
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        starts = self.indptr[rows]
+        lengths = self.indptr[rows + 1] - starts
+        total = int(lengths.sum())
+        if total == 0:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty
+        owners = np.repeat(rows, lengths)
+        offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+        positions = offsets + np.arange(total, dtype=np.int64)
+        return owners, positions
+
+    def edge_position(self, u, v):
+        """Posição da aresta (u, v) em `indices`, ou -1 se não existir (índices inteiros)."""
+        start, end = self.indptr[u], self.indptr[u + 1]
+        pos = start + np.searchsorted(self.indices[start:end], v)
+        if pos < end and self.indices[pos] == v:
+            return int(pos)
+        return -1
+
+    def path_to_nodes(self, path_indices):
+        """Converte uma lista de índices internos para os identificadores originais."""
+        return [self.nodes[i] for i in path_indices]
+
+    def path_weight(self, path_indices):
+        """Soma dos pesos ('weight') ao longo de um caminho de índices internos."""
+        total = 0.0
+        for u, v in zip(path_indices, path_indices[1:]):
+            total += self.weights[self.edge_position(u, v)]
+        return total
+
+
+def get_graph_arrays(graph):
+    """
+    Retorna a representação CSR do grafo, construindo-a apenas uma vez por grafo.
+
+    Os arrays são reconstruídos quando mudam o número de nós, r/d,
+    o grau de algum nó ou o peso de uma das arestas da amostra (ver
+    GraphArrays.matches). Quem altera in place o peso de arestas específicas deve
+    chamar invalidate_graph_arrays(graph) em seguida: sem isso, os arrays e o
+    fingerprint (chave dos caches de árvores, sobreposição e modelos de custo)
+    podem continuar os antigos.
+
+    Args:
+        graph: Grafo NetworkX
+
+    Returns:
+        Objeto GraphArrays correspondente ao estado atual do grafo
+    """
+    # O número de arestas é conferido pelo grau de cada nó em GraphArrays.matches
+    stamp = (graph.number_of_nodes(), graph.graph.get('r'), graph.graph.get('d'))
+    cached = _arrays_cache.get(graph)
+    if cached is not None and cached[0] == stamp and cached[1].matches(graph):
+        return cached[1]
+    arrays = GraphArrays(graph)
+    _arrays_cache[graph] = (stamp, arrays)
+    return arrays
+
+
+def invalidate_graph_arrays(graph):
+    """Descarta os arrays do grafo (obrigatório após alterar pesos de arestas in place)."""
+    _arrays_cache.pop(graph, None)
+
+
+def graph_fingerprint(graph):
+    """Hash do conteúdo do grafo (nós, arestas, pesos e parâmetros r/d)."""
+    return get_graph_arrays(graph).fingerprint
@@ -1,8 +1,10 @@
 import networkx as nx
 import math
+import numpy as np
 import pandas as pd
 
-def build_graph(cities_df, r=None, d=None, name_to_id=None, id_to_name=None):
+def build_graph(cities_df, r=None, d=None, name_to_id=None, id_to_name=None, mode='radius',
+                cones=None, stretch=1.5, k=6, mutual=False):
     """Constrói o grafo a partir dos dados das cidades,
     conectando cidades apenas se as distâncias entre elas respeitarem
     TODAS as restrições definidas (r e/ou d).
@@ -13,12 +15,29 @@ def build_graph(cities_df, r=None, d=None, name_to_id=None, id_to_name=None):
         d: Distância máxima (em km) para conectar cidades
         name_to_id: Dicionário de mapeamento de nome da cidade para ID
         id_to_name: Dicionário de mapeamento de ID para nome da cidade
+        mode: 'radius' (todas as conexões dentro de r/d), 'yao' (t-spanner: apenas a
+            cidade mais próxima em cada um dos k cones ao redor de cada cidade) ou
+            'knn' (k vizinhos mais próximos; r/d opcionais, como restrição adicional)
+        cones: número de cones no modo 'yao' (default: calculado a partir de stretch)
+        stretch: alongamento máximo desejado no modo 'yao'
+        k: número de vizinhos no modo 'knn'
+        mutual: no modo 'knn', exige que a vizinhança seja mútua
         
     Returns:
         Um grafo NetworkX com as cidades como nós e conexões que respeitam os critérios
     """
+    if mode == 'knn':
+        from app.utils.knn_graph import build_knn_graph
+        return build_knn_graph(cities_df, k=k, r=r, d=d, mutual=mutual,
+                               name_to_id=name_to_id, id_to_name=id_to_name)
     if r is None and d is None:
         raise ValueError("Pelo menos um dos parâmetros r ou d deve ser fornecido")
+    if mode == 'yao':
+        from app.utils.spanner_graph import build_yao_graph
+        return build_yao_graph(cities_df, r=r, d=d, cones=cones, stretch=stretch,
+                               name_to_id=name_to_id, id_to_name=id_to_name)
+    if mode != 'radius':
+        raise ValueError(f"Modo de construção desconhecido: {mode}")
     
     G = nx.Graph()
     G.graph['r'] = r
@@ -29,6 +48,18 @@ def build_graph(cities_df, r=None, d=None, name_to_id=None, id_to_name=None):
     G.graph['name_to_id'] = name_to_id or {}
     
     # Primeiro passo: Adicionar nós ao grafo (apenas com latitude e longitude válidas)
+    add_city_nodes(G, cities_df)
+    
+    # Para cada par de cidades distintas
+    city_ids = list(G.nodes())
+    for i in range(len(city_ids)):
+        for j in range(i+1, len(city_ids)):
+            connect_if_within(G, city_ids[i], city_ids[j], r, d)
+    
+    return G
+
+def add_city_nodes(G, cities_df):
+    """Adiciona ao grafo as cidades com latitude e longitude válidas (id = city_id)."""
     for _, row in cities_df.iterrows():
         if pd.notna(row.get('latitude')) and pd.notna(row.get('longitude')):
             # Usar city_id como identificador único em vez do nome da cidade
@@ -42,37 +73,39 @@ def build_graph(cities_df, r=None, d=None, name_to_id=None, id_to_name=None):
                 latitude=row['latitude'],
                 longitude=row['longitude']
             )
+
+def connect_if_within(G, city1_id, city2_id, r=None, d=None):
+    """
+    Conecta duas cidades do grafo se a distância entre elas respeitar TODAS as
+    restrições (r em graus e/ou d em km). O peso é a distância em km quando d é
+    informado, senão a distância angular.
+
+    Returns:
+        True se a aresta foi criada
+    """
+    # Obter atributos dos nós
+    city1_attrs = G.nodes[city1_id]
+    city2_attrs = G.nodes[city2_id]
     
-    # Para cada par de cidades distintas
-    city_ids = list(G.nodes())
-    for i in range(len(city_ids)):
-        for j in range(i+1, len(city_ids)):
-            city1_id = city_ids[i]
-            city2_id = city_ids[j]
-            
-            # Obter atributos dos nós
-            city1_attrs = G.nodes[city1_id]
-            city2_attrs = G.nodes[city2_id]
-            
-            # Calcular distâncias
-            angular_dist = calculate_angular_distance(city1_attrs, city2_attrs)
-            km_dist = calculate_haversine_distance(city1_attrs, city2_attrs)
-            
-            # Verificar se as restrições são atendidas
-            atende_raio = (r is None) or (angular_dist <= r)
-            atende_dist_km = (d is None) or (km_dist <= d)
-            
-            # Se TODAS as restrições forem atendidas, as cidades devem estar conectadas
-            if atende_raio and atende_dist_km:
-                weight = km_dist if d is not None else angular_dist
-                G.add_edge(
-                    city1_id, city2_id,
-                    weight=weight,
-                    angular_dist=angular_dist,
-                    km_dist=km_dist
-                )
+    # Calcular distâncias
+    angular_dist = calculate_angular_distance(city1_attrs, city2_attrs)
+    km_dist = calculate_haversine_distance(city1_attrs, city2_attrs)
     
-    return G
+    # Verificar se as restrições são atendidas
+    atende_raio = (r is None) or (angular_dist <= r)
+    atende_dist_km = (d is None) or (km_dist <= d)
+    
+    # Se TODAS as restrições forem atendidas, as cidades devem estar conectadas
+    if atende_raio and atende_dist_km:
+        weight = km_dist if d is not None else angular_dist
+        G.add_edge(
+            city1_id, city2_id,
+            weight=weight,
+            angular_dist=angular_dist,
+            km_dist=km_dist
+        )
+        return True
+    return False
 
 def build_graph_from_df(cities_df, r=None, d=None, name_to_id=None, id_to_name=None):
     """Wrapper para build_graph que facilita a construção do grafo a partir de um DataFrame.
@@ -136,6 +169,24 @@ def calculate_haversine_distance(city1, city2):
     
     return distance
 
+def haversine_distances(lat1, lon1, lat2, lon2):
+    """
+    Versão vetorizada de calculate_haversine_distance (com broadcasting NumPy).
+
+    Args:
+        lat1, lon1: latitudes e longitudes (graus) do primeiro conjunto de pontos
+        lat2, lon2: latitudes e longitudes (graus) do segundo conjunto de pontos
+    Returns:
+        Array com as distâncias em quilômetros
+    """
+    R = 6371.0
+    lat1_rad, lon1_rad = np.radians(lat1), np.radians(lon1)
+    lat2_rad, lon2_rad = np.radians(lat2), np.radians(lon2)
+    dlat = lat2_rad - lat1_rad
+    dlon = lon2_rad - lon1_rad
+    a = np.sin(dlat / 2)**2 + np.cos(lat1_rad) * np.cos(lat2_rad) * np.sin(dlon / 2)**2
+    return R * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
 def calculate_angular_distance(city1, city2):
     """Calcula a distância angular (em graus) entre duas cidades."""
     lat1, lon1 = city1['latitude'], city1['longitude']
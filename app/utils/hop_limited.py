@@ -0,0 +1,113 @@
+import time
+
+import numpy as np
+
+from app.utils.graph_arrays import get_graph_arrays
+
+
+def layered_bellman_ford(arrays, source, max_edges, frontier=True):
+    """
+    Bellman-Ford em camadas sobre a estrutura CSR: após a camada k, dist[v] é o
+    menor custo de source a v usando no máximo k arestas.
+
+    Cada camada relaxa as arestas de uma vez com NumPy a partir das distâncias da
+    camada anterior (e não das já atualizadas na própria camada, o que permitiria
+    caminhos com mais de k arestas). Na variante com fronteira, só são relaxadas
+    as arestas que saem dos nós melhorados na camada anterior: os demais já
+    propagaram a mesma distância antes. A busca termina cedo quando nenhuma
+    distância melhora.
+
+    Args:
+        arrays: GraphArrays do grafo
+        source: índice interno da origem
+        max_edges: número máximo de arestas (camadas)
+        frontier: relaxar apenas a partir da fronteira (False: todas as arestas)
+
+    Returns:
+        dist: array float64 com a menor distância usando até max_edges arestas
+        parents: lista com o array de predecessores de cada camada (parents[k])
+        layers: lista de dicionários por camada com 'layer', 'frontier' (nós de
+            origem das relaxações), 'relaxed' (arestas), 'improved' e 'ms'
+    """
+    dist = np.full(arrays.n, np.inf)
+    dist[source] = 0.0
+    parent = np.full(arrays.n, -1, dtype=np.int32)
+    parents = [parent]
+    layers = []
+    active = np.array([source], dtype=np.int64)
+    all_sources = None if frontier else arrays.edge_sources()
+
+    for layer in range(1, max_edges + 1):
+        stage = time.perf_counter()
+        if frontier:
+            owners, positions = arrays.gather_neighbors(active)
+            targets, weights = arrays.indices[positions], arrays.weights[positions]
+        else:
+            owners, targets, weights = all_sources, arrays.indices, arrays.weights
+        expanded = len(active) if frontier else arrays.n
+        relaxed = len(owners)
+
+        candidates = dist[owners] + weights
+        better = candidates < dist[targets]
+        owners, targets, candidates = owners[better], targets[better], candidates[better]
+
+        updated = dist.copy()
+        np.minimum.at(updated, targets, candidates)
+        winners = candidates == updated[targets]
+        parent = parent.copy()
+        parent[targets[winners]] = owners[winners]
+
+        active = np.unique(targets)
+        dist = updated
+        parents.append(parent)
+        layers.append({
+            'layer': layer,
+            'frontier': int(expanded),
+            'relaxed': relaxed,
+            'improved': int(len(active)),
+            'ms': (time.perf_counter() - stage) * 1000
+        })
+        if len(active) == 0:
+            break
+    return dist, parents, layers
+
+
+def path_within_hops(parents, target):
+    """
+    Caminho (índices internos) até `target` com no máximo len(parents) - 1 arestas,
+    descendo uma camada a cada aresta percorrida.
+    """
+    path = [target]
+    node = target
+    for layer in range(len(parents) - 1, 0, -1):
+        previous = int(parents[layer][node])
+        if previous < 0:
+            break
+        node = previous
+        path.append(node)
+    path.reverse()
+    return path
+
+
+def hop_limited_path(graph, start, end, max_edges, frontier=True):
+    """
+    Rota mais barata de start a end com no máximo `max_edges` arestas.
+
+    Args:
+        graph: Grafo NetworkX
+        start: origem
+        end: destino
+        max_edges: número máximo de arestas da rota
+        frontier: usar a variante restrita à fronteira (ver layered_bellman_ford)
+
+    Returns:
+        path: lista de nós (ids originais) ou None se não houver rota com até max_edges arestas
+        total_dist: distância da rota (inf se não existir)
+        layers: métricas por camada (ver layered_bellman_ford)
+    """
+    arrays = get_graph_arrays(graph)
+    s, t = arrays.index[start], arrays.index[end]
+    dist, parents, layers = layered_bellman_ford(arrays, s, max_edges, frontier=frontier)
+    if not np.isfinite(dist[t]):
+        return None, float('inf'), layers
+    return arrays.path_to_nodes(path_within_hops(parents, t)), float(dist[t]), layers
@@ -0,0 +1,238 @@
+import hashlib
+from collections import OrderedDict
+
+import networkx as nx
+import numpy as np
+from scipy.spatial import cKDTree
+
+from app.utils.corridor_graph import EARTH_RADIUS_KM, chord_length, connection_angle, unit_vectors
+from app.utils.graph_utils import add_city_nodes, calculate_angular_distance, calculate_haversine_distance
+
+# Folga (em unidades de corda) nas consultas de raio; o teste exato vem depois
+_QUERY_SLACK = 1e-9
+
+# Distâncias vetorizadas a menos dessa fração do limite são conferidas com o teste escalar
+_BOUNDARY_TOLERANCE = 1e-9
+
+
+class _DegreeView:
+    """Grau calculado sob demanda: graph.degree[n] ou graph.degree(n)."""
+
+    def __init__(self, graph):
+        self._graph = graph
+
+    def __getitem__(self, node):
+        return len(self._graph.neighbor_indices(self._graph.index[node]))
+
+    def __call__(self, node=None):
+        if node is None:
+            return ((n, self[n]) for n in self._graph)
+        return self[node]
+
+
+class _EdgeView:
+    """
+    Arestas geradas sob demanda (u < v na ordem dos nós), sem materializá-las.
+
+    A representação textual é a descrição do grafo, e não a lista de arestas, para que
+    hashes como get_graph_hash continuem determinísticos sem percorrer todas as arestas.
+    """
+
+    def __init__(self, graph, data=False):
+        self._graph = graph
+        self._data = data
+
+    def __iter__(self):
+        graph = self._graph
+        for i, u in enumerate(graph.node_ids):
+            for j in graph.neighbor_indices(i):
+                if j > i:
+                    v = graph.node_ids[j]
+                    yield (u, v, graph.edge_data_by_index(i, j)) if self._data else (u, v)
+
+    def __call__(self, data=False):
+        return _EdgeView(self._graph, data=data)
+
+    def __len__(self):
+        return self._graph.number_of_edges()
+
+    def __repr__(self):
+        return f"ImplicitEdges({self._graph.description}, data={self._data})"
+
+
+class ImplicitGeometricGraph:
+    """
+    Grafo geométrico implícito: as arestas nunca são materializadas.
+
+    Duas cidades são vizinhas quando respeitam as mesmas restrições de build_graph
+    (r em graus e/ou d em km). A enumeração de vizinhos é uma consulta de raio em
+    uma KD-tree (vetores unitários 3D) seguida do mesmo teste exato de build_graph,
+    e os dados da aresta (weight, angular_dist, km_dist) são calculados na hora.
+    A memória é O(n) mais um cache LRU limitado de listas de vizinhos, qualquer que
+    seja d.
+
+    Expõe a parte da interface do NetworkX usada pelas buscas (nodes, neighbors,
+    get_edge_data, degree, graph[node], edges, number_of_edges, graph.graph),
+    com a mesma ordem de vizinhos de build_graph, de modo que todas as buscas
+    retornam os mesmos resultados do grafo materializado. Os motores sobre arrays
+    (BFS, fuzzy, cache de árvores) constroem a partir dele a representação CSR
+    compacta, como fazem com o grafo materializado.
+    """
+
+    def __init__(self, cities_df, r=None, d=None, name_to_id=None, id_to_name=None, cache_size=2048):
+        if r is None and d is None:
+            raise ValueError("Pelo menos um dos parâmetros r ou d deve ser fornecido")
+        self.r = r
+        self.d = d
+
+        # Apenas os nós são armazenados (mesmos atributos e ordem de build_graph)
+        self._nodes_graph = nx.Graph()
+        add_city_nodes(self._nodes_graph, cities_df)
+        self.nodes = self._nodes_graph.nodes
+        self.node_ids = list(self._nodes_graph.nodes())
+        self.index = {node: i for i, node in enumerate(self.node_ids)}
+
+        self.graph = {
+            'r': r,
+            'd': d,
+            'id_to_name': id_to_name or {},
+            'name_to_id': name_to_id or {},
+            'implicit': True
+        }
+
+        latitude = np.array([self.nodes[n]['latitude'] for n in self.node_ids], dtype=np.float64)
+        longitude = np.array([self.nodes[n]['longitude'] for n in self.node_ids], dtype=np.float64)
+        self._lat_rad, self._lon_rad = np.radians(latitude), np.radians(longitude)
+        self._points = unit_vectors(latitude, longitude)
+        self._tree = cKDTree(self._points) if self.node_ids else None
+        self._radius = chord_length(connection_angle(r, d)) + _QUERY_SLACK
+
+        self.cache_size = cache_size
+        self._neighbor_cache = OrderedDict()
+        self._num_edges = None
+        self.degree = _DegreeView(self)
+
+        digest = hashlib.sha1()
+        digest.update(repr((self.node_ids, r, d)).encode())
+        digest.update(self._points.tobytes())
+        self.description = f"n={len(self.node_ids)}, r={r}, d={d}, coords={digest.hexdigest()[:16]}"
+
+    # Vizinhança e arestas (sob demanda)
+    def neighbor_indices(self, i):
+        """Índices dos vizinhos do nó de índice i, em ordem crescente (cache LRU)."""
+        cached = self._neighbor_cache.get(i)
+        if cached is not None:
+            self._neighbor_cache.move_to_end(i)
+            return cached
+        neighbors = self._filter_candidates(i, self._tree.query_ball_point(self._points[i], self._radius))
+        self._neighbor_cache[i] = neighbors
+        if len(self._neighbor_cache) > self.cache_size:
+            self._neighbor_cache.popitem(last=False)
+        return neighbors
+
+    def _filter_candidates(self, i, candidates):
+        """
+        Aplica as restrições r/d aos candidatos da consulta espacial (vetorizado).
+
+        Os casos a menos de _BOUNDARY_TOLERANCE do limite são decididos pelo teste
+        escalar de build_graph, para que o resultado seja idêntico ao materializado.
+        """
+        candidates = np.sort(np.asarray(candidates, dtype=np.int64))
+        candidates = candidates[candidates != i]
+        lat, lon = self._lat_rad[candidates], self._lon_rad[candidates]
+        a = np.sin((lat - self._lat_rad[i]) / 2)**2 + \
+            np.cos(self._lat_rad[i]) * np.cos(lat) * np.sin((lon - self._lon_rad[i]) / 2)**2
+        central = 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+        keep = np.ones(len(candidates), dtype=bool)
+        boundary = np.zeros(len(candidates), dtype=bool)
+        for value, limit in ((np.degrees(central), self.r), (central * EARTH_RADIUS_KM, self.d)):
+            if limit is not None:
+                keep &= value <= limit
+                boundary |= np.abs(value - limit) <= _BOUNDARY_TOLERANCE * max(limit, 1.0)
+        if boundary.any():
+            u_attrs = self.nodes[self.node_ids[i]]
+            for k in np.flatnonzero(boundary):
+                keep[k] = self._within(u_attrs, self.nodes[self.node_ids[candidates[k]]]) is not None
+        return candidates[keep].tolist()
+
+    def _within(self, u_attrs, v_attrs):
+        # Mesmo teste (e mesmos cálculos) de connect_if_within
+        angular_dist = calculate_angular_distance(u_attrs, v_attrs)
+        km_dist = calculate_haversine_distance(u_attrs, v_attrs)
+        if (self.r is None or angular_dist <= self.r) and (self.d is None or km_dist <= self.d):
+            weight = km_dist if self.d is not None else angular_dist
+            return {'weight': weight, 'angular_dist': angular_dist, 'km_dist': km_dist}
+        return None
+
+    def edge_data_by_index(self, i, j):
+        return self._within(self.nodes[self.node_ids[i]], self.nodes[self.node_ids[j]])
+
+    def neighbors(self, node):
+        return iter([self.node_ids[j] for j in self.neighbor_indices(self.index[node])])
+
+    def get_edge_data(self, u, v, default=None):
+        if u == v or u not in self.index or v not in self.index:
+            return default
+        data = self._within(self.nodes[u], self.nodes[v])
+        return data if data is not None else default
+
+    def has_edge(self, u, v):
+        return self.get_edge_data(u, v) is not None
+
+    def __getitem__(self, node):
+        """Vizinhos do nó com os dados das arestas (equivalente a graph[node] no NetworkX)."""
+        i = self.index[node]
+        return dict(
+            (self.node_ids[j], self.edge_data_by_index(i, j)) for j in self.neighbor_indices(i)
+        )
+
+    @property
+    def edges(self):
+        return _EdgeView(self)
+
+    # Contagens e pertinência
+    def number_of_nodes(self):
+        return len(self.node_ids)
+
+    def number_of_edges(self):
+        """Número de arestas (contado uma vez, sem materializá-las)."""
+        if self._num_edges is None:
+            total = 0
+            for i in range(len(self.node_ids)):
+                candidates = self._tree.query_ball_point(self._points[i], self._radius)
+                total += len(self._filter_candidates(i, [j for j in candidates if j > i]))
+            self._num_edges = total
+        return self._num_edges
+
+    def __contains__(self, node):
+        return node in self.index
+
+    def __iter__(self):
+        return iter(self.node_ids)
+
+    def __len__(self):
+        return len(self.node_ids)
+
+    def to_networkx(self):
+        """Materializa o grafo (por exemplo, para visualização); igual ao de build_graph."""
+        G = nx.Graph()
+        G.graph.update({k: v for k, v in self.graph.items() if k != 'implicit'})
+        G.add_nodes_from(self._nodes_graph.nodes(data=True))
+        G.add_edges_from(self.edges(data=True))
+        return G
+
+
+def build_implicit_graph(cities_df, r=None, d=None, name_to_id=None, id_to_name=None):
+    """
+    Equivalente implícito de build_graph: mesmas conexões, sem materializar arestas.
+
+    Args:
+        cities_df: DataFrame com dados das cidades
+        r: Raio máximo (em graus) para conectar cidades
+        d: Distância máxima (em km) para conectar cidades
+        name_to_id, id_to_name: mapeamentos entre nomes e IDs
+
+    Returns:
+        ImplicitGeometricGraph
+    """
+    return ImplicitGeometricGraph(cities_df, r=r, d=d, name_to_id=name_to_id, id_to_name=id_to_name)
@@ -0,0 +1,162 @@
+import heapq
+
+import numpy as np
+
+from app.utils.graph_arrays import get_graph_arrays
+from app.utils.sssp_cache import spt_cache
+
+
+class Isochrone:
+    """
+    Cidades alcançáveis a partir de uma origem com distância de rede até `budget`.
+
+    Attributes:
+        source: nó de origem (id original)
+        budget: distância máxima pela rede (unidade dos pesos do grafo)
+        indices: índices internos das cidades alcançáveis, em ordem de distância
+        distances: distância de rede de cada uma (array float64)
+        parents: índice interno do predecessor na árvore de caminhos mínimos (-1 na origem)
+        settled: nós estabilizados pela busca (0 quando respondida pelo cache de árvores)
+        from_cache: True se a resposta veio de uma árvore já calculada
+    """
+
+    def __init__(self, arrays, source, budget, indices, distances, parents, settled, from_cache):
+        self.arrays = arrays
+        self.source = source
+        self.budget = budget
+        self.indices = indices
+        self.distances = distances
+        self.parents = parents
+        self.settled = settled
+        self.from_cache = from_cache
+
+    @property
+    def nodes(self):
+        """Ids originais das cidades alcançáveis (mesma ordem de `distances`)."""
+        return self.arrays.path_to_nodes(self.indices.tolist())
+
+    def __len__(self):
+        return len(self.indices)
+
+
+def bounded_shortest_paths(arrays, source, budget):
+    """
+    Dijkstra a partir de `source` que para ao retirar do heap um nó além do orçamento.
+    Em caso de empate na distância, expande primeiro a cidade menos populosa (como
+    shortest_path_tree), então as distâncias e predecessores coincidem com a árvore
+    completa dentro do orçamento.
+
+    Returns:
+        order: índices estabilizados (distância <= budget), em ordem de distância
+        dist: lista com as distâncias correspondentes
+        parent: lista com os predecessores correspondentes (-1 na origem)
+    """
+    indptr, indices, weights, populations = arrays.adjacency_lists()
+    n = arrays.n
+    best = [float('inf')] * n
+    parent = [-1] * n
+    settled = [False] * n
+    best[source] = 0.0
+    order, dist, parents = [], [], []
+    counter = 0
+    heap = [(0.0, populations[source], counter, source)]
+    while heap:
+        d, _, _, node = heapq.heappop(heap)
+        if d > budget:
+            break
+        if settled[node]:
+            continue
+        settled[node] = True
+        order.append(node)
+        dist.append(d)
+        parents.append(parent[node])
+        for pos in range(indptr[node], indptr[node + 1]):
+            neighbor = indices[pos]
+            alt = d + weights[pos]
+            if alt <= budget and alt < best[neighbor]:
+                best[neighbor] = alt
+                parent[neighbor] = node
+                counter += 1
+                heapq.heappush(heap, (alt, populations[neighbor], counter, neighbor))
+    return order, dist, parents
+
+
+def reachable_within(graph, source, budget, cache=spt_cache):
+    """
+    Isócrona de rede: cidades a no máximo `budget` (km ou graus, conforme os pesos)
+    de `source` pelo grafo atual.
+
+    Se o cache de árvores já tiver a árvore de caminhos mínimos de `source`, a
+    resposta é um filtro vetorizado sobre ela. Caso contrário, uma busca limitada
+    pelo orçamento explora apenas a região alcançável (a árvore parcial não é
+    guardada no cache, que só armazena árvores completas).
+
+    Args:
+        graph: Grafo NetworkX
+        source: nó de origem
+        budget: distância máxima pela rede
+        cache: ShortestPathTreeCache consultado (None para não consultar)
+
+    Returns:
+        Isochrone
+    """
+    arrays = get_graph_arrays(graph)
+    s = arrays.index[source]
+
+    entry = cache.get(arrays.fingerprint, s) if cache is not None else None
+    if entry is not None:
+        dist, parent = entry
+        within = np.flatnonzero(dist <= budget)
+        order = within[np.argsort(dist[within], kind='stable')]
+        return Isochrone(arrays, source, budget, order, dist[order], parent[order].astype(np.int64),
+                         settled=0, from_cache=True)
+
+    order, dist, parents = bounded_shortest_paths(arrays, s, budget)
+    return Isochrone(arrays, source, budget, np.array(order, dtype=np.int64), np.array(dist, dtype=np.float64),
+                     np.array(parents, dtype=np.int64), settled=len(order), from_cache=False)
+
+
+def isochrone_geojson(graph, isochrone):
+    """
+    Isócrona como uma FeatureCollection GeoJSON: um ponto por cidade alcançável e
+    uma linha por aresta da árvore de caminhos mínimos (predecessor -> cidade).
+
+    Args:
+        graph: Grafo NetworkX (nomes das cidades)
+        isochrone: resultado de reachable_within
+
+    Returns:
+        Dicionário GeoJSON; as propriedades trazem 'kind' ('city' ou 'tree'),
+        'distance' e 'fraction' (distância / orçamento), e as cidades também 'city',
+        'state' e 'population'
+    """
+    arrays = isochrone.arrays
+    budget = isochrone.budget if isochrone.budget > 0 else 1.0
+    features = []
+    for i, distance, parent in zip(isochrone.indices.tolist(), isochrone.distances.tolist(),
+                                   isochrone.parents.tolist()):
+        lon, lat = float(arrays.longitude[i]), float(arrays.latitude[i])
+        node = arrays.nodes[i]
+        features.append({
+            'type': 'Feature',
+            'geometry': {'type': 'Point', 'coordinates': [lon, lat]},
+            'properties': {
+                'kind': 'city',
+                'node': node,
+                'city': graph.nodes[node].get('city', ''),
+                'state': str(arrays.state[i]),
+                'population': int(arrays.population[i]),
+                'distance': distance,
+                'fraction': min(distance / budget, 1.0)
+            }
+        })
+        if parent >= 0:
+            features.append({
+                'type': 'Feature',
+                'geometry': {
+                    'type': 'LineString',
+                    'coordinates': [[float(arrays.longitude[parent]), float(arrays.latitude[parent])], [lon, lat]]
+                },
+                'properties': {'kind': 'tree', 'distance': distance, 'fraction': min(distance / budget, 1.0)}
+            })
+    return {'type': 'FeatureCollection', 'features': features}
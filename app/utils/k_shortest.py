@@ -0,0 +1,164 @@
+import heapq
+import time
+
+import numpy as np
+
+from app.utils.graph_arrays import get_graph_arrays
+from app.utils.sssp_cache import spt_cache, walk_parents
+
+
+def _spur_search(arrays, spur, target, reverse_dist, reverse_parent, removed_edges, blocked_nodes):
+    """
+    Busca do desvio (spur) de Yen reaproveitando a árvore reversa do destino.
+
+    Se o caminho da árvore a partir de `spur` não usa arestas removidas nem nós
+    bloqueados, ele já é o desvio ótimo. Caso contrário, roda um A* cuja heurística
+    é a distância exata até o destino no grafo completo (limite inferior válido no
+    grafo restrito, pois remover arestas e nós só aumenta distâncias).
+
+    Returns:
+        (caminho de índices de spur até target, custo) ou (None, inf)
+    """
+    tree_path = walk_parents(reverse_parent, spur)
+    if tree_path[-1] == target and not any(node in blocked_nodes for node in tree_path) and \
+            not any((u, v) in removed_edges for u, v in zip(tree_path, tree_path[1:])):
+        return tree_path, float(reverse_dist[spur])
+
+    indptr, indices, weights, populations = arrays.adjacency_lists()
+    h = reverse_dist
+    g_score = {spur: 0.0}
+    predecessors = {spur: None}
+    closed = set()
+    counter = 0
+    heap = [(h[spur], populations[spur], counter, spur)]
+    while heap:
+        _, _, _, node = heapq.heappop(heap)
+        if node in closed:
+            continue
+        if node == target:
+            path = []
+            while node is not None:
+                path.append(node)
+                node = predecessors[node]
+            path.reverse()
+            return path, g_score[target]
+        closed.add(node)
+        g = g_score[node]
+        for pos in range(indptr[node], indptr[node + 1]):
+            neighbor = indices[pos]
+            if neighbor in blocked_nodes or neighbor in closed or (node, neighbor) in removed_edges:
+                continue
+            alt = g + weights[pos]
+            if alt < g_score.get(neighbor, float('inf')):
+                g_score[neighbor] = alt
+                predecessors[neighbor] = node
+                counter += 1
+                heapq.heappush(heap, (alt + h[neighbor], populations[neighbor], counter, neighbor))
+    return None, float('inf')
+
+
+def k_shortest_paths(graph, start, end, k=5, tree_cache=spt_cache):
+    """
+    k menores caminhos simples entre start e end (algoritmo de Yen com trabalho compartilhado).
+
+    A árvore de caminhos mínimos enraizada no destino (obtida do cache de árvores)
+    fornece o primeiro caminho e as distâncias reversas usadas por todas as buscas de
+    desvio, que por isso não recomeçam um Dijkstra do zero a cada desvio.
+
+    Args:
+        graph: Grafo NetworkX
+        start, end: nós de origem e destino
+        k: número de rotas desejadas
+        tree_cache: cache de árvores de caminhos mínimos (default: spt_cache global)
+
+    Returns:
+        Lista (até k itens) de dicionários com 'path' (ids originais), 'cost' e
+        'population' (soma das populações da rota), em ordem crescente de custo e,
+        em caso de empate, de população
+    """
+    if start not in graph or end not in graph:
+        return []
+    arrays = get_graph_arrays(graph)
+    s, t = arrays.index[start], arrays.index[end]
+    reverse_dist, reverse_parent = tree_cache.tree(arrays, t)
+    if not np.isfinite(reverse_dist[s]):
+        return []
+
+    def route_population(path):
+        return int(arrays.population[path].sum())
+
+    first = walk_parents(reverse_parent, s)
+    found = [(float(reverse_dist[s]), route_population(first), first)]
+    candidates = []
+    seen = {tuple(first)}
+    weights = arrays.adjacency_lists()[2]
+
+    while len(found) < k:
+        previous = found[-1][2]
+        # Custo acumulado da raiz até cada posição do caminho anterior
+        root_costs = [0.0]
+        for u, v in zip(previous, previous[1:]):
+            root_costs.append(root_costs[-1] + weights[arrays.edge_position(u, v)])
+
+        for j in range(len(previous) - 1):
+            spur = previous[j]
+            root = previous[:j + 1]
+            removed_edges = set()
+            for _, _, path in found:
+                if len(path) > j + 1 and path[:j + 1] == root:
+                    removed_edges.add((path[j], path[j + 1]))
+                    removed_edges.add((path[j + 1], path[j]))
+            blocked_nodes = set(root[:-1])
+
+            spur_path, spur_cost = _spur_search(
+                arrays, spur, t, reverse_dist, reverse_parent, removed_edges, blocked_nodes
+            )
+            if spur_path is None:
+                continue
+            candidate = root[:-1] + spur_path
+            key = tuple(candidate)
+            if key in seen:
+                continue
+            seen.add(key)
+            heapq.heappush(candidates, (root_costs[j] + spur_cost, route_population(candidate), candidate))
+
+        if not candidates:
+            break
+        found.append(heapq.heappop(candidates))
+
+    return [
+        {'path': arrays.path_to_nodes(path), 'cost': cost, 'population': population}
+        for cost, population, path in found
+    ]
+
+
+def benchmark_k_shortest(graph, pairs, k=5, tree_cache=None):
+    """
+    Mede a latência de k_shortest_paths para uma lista de pares (origem, destino).
+
+    Args:
+        graph: Grafo NetworkX
+        pairs: lista de tuplas (start, end)
+        k: número de rotas por consulta
+        tree_cache: cache de árvores (default: um cache novo, para medir a frio)
+
+    Returns:
+        Dicionário com 'k', 'queries', 'mean_ms', 'p50_ms', 'p95_ms' e 'max_ms'
+    """
+    from app.utils.sssp_cache import ShortestPathTreeCache
+
+    cache = tree_cache or ShortestPathTreeCache()
+    latencies = []
+    for start, end in pairs:
+        begin = time.perf_counter()
+        k_shortest_paths(graph, start, end, k=k, tree_cache=cache)
+        latencies.append((time.perf_counter() - begin) * 1000)
+    latencies = np.array(latencies)
+    return {
+        'k': k,
+        'queries': len(latencies),
+        'mean_ms': float(latencies.mean()) if latencies.size else 0.0,
+        'p50_ms': float(np.percentile(latencies, 50)) if latencies.size else 0.0,
+        'p95_ms': float(np.percentile(latencies, 95)) if latencies.size else 0.0,
+        'max_ms': float(latencies.max()) if latencies.size else 0.0
+    }
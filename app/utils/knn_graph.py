@@ -0,0 +1,90 @@
+import networkx as nx
+import numpy as np
+from scipy.spatial import cKDTree
+
+from app.utils.corridor_graph import unit_vectors
+from app.utils.graph_utils import add_city_nodes, connect_if_within
+
+
+def nearest_neighbor_indices(points, k):
+    """
+    Índices dos k vizinhos mais próximos de cada ponto (excluindo o próprio ponto).
+
+    A distância de corda entre vetores unitários é monotônica na distância de grande
+    círculo, então a consulta na KD-tree devolve os mesmos vizinhos da distância
+    geodésica, em O(n log n) no total.
+
+    Args:
+        points: array (n, 3) de vetores unitários
+        k: número de vizinhos por ponto
+
+    Returns:
+        Array (n, min(k, n-1)) de índices, do mais próximo para o mais distante
+    """
+    n = len(points)
+    k = min(k, n - 1)
+    if k <= 0:
+        return np.empty((n, 0), dtype=np.int64)
+    _, found = cKDTree(points).query(points, k=k + 1)
+    found = np.asarray(found, dtype=np.int64).reshape(n, k + 1)
+    # Remove o próprio ponto; com coordenadas repetidas ele pode não vir primeiro
+    neighbors = np.empty((n, k), dtype=np.int64)
+    for i in range(n):
+        row = found[i][found[i] != i]
+        neighbors[i] = row[:k]
+    return neighbors
+
+
+def build_knn_graph(cities_df, k=6, r=None, d=None, mutual=False, name_to_id=None, id_to_name=None):
+    """
+    Grafo de k vizinhos mais próximos: cada cidade é conectada às k cidades mais
+    próximas, independentemente da densidade da região.
+
+    Com mutual=True a aresta exige que cada cidade esteja entre os k vizinhos da
+    outra (grau máximo k); caso contrário basta uma das direções. Com r e/ou d, a
+    aresta também precisa respeitar as restrições de build_graph (kNN ∩ raio). Os
+    atributos das arestas seguem build_graph: peso em km quando d é informado, senão
+    a distância angular.
+
+    Args:
+        cities_df: DataFrame com dados das cidades
+        k: número de vizinhos por cidade
+        r: Raio máximo (em graus) para conectar cidades (opcional)
+        d: Distância máxima (em km) para conectar cidades (opcional)
+        mutual: exige vizinhança mútua
+        name_to_id, id_to_name: mapeamentos entre nomes e IDs
+
+    Returns:
+        Grafo NetworkX; G.graph['knn'] traz 'k', 'mutual', 'max_degree' e 'mean_degree'
+    """
+    if k < 1:
+        raise ValueError("k deve ser pelo menos 1")
+
+    G = nx.Graph()
+    G.graph['r'] = r
+    G.graph['d'] = d
+    G.graph['id_to_name'] = id_to_name or {}
+    G.graph['name_to_id'] = name_to_id or {}
+    add_city_nodes(G, cities_df)
+
+    city_ids = list(G.nodes())
+    points = unit_vectors([G.nodes[n]['latitude'] for n in city_ids], [G.nodes[n]['longitude'] for n in city_ids])
+    neighbors = nearest_neighbor_indices(points, k)
+
+    directed = {(i, j) for i, row in enumerate(neighbors.tolist()) for j in row}
+    if mutual:
+        pairs = {(i, j) for i, j in directed if i < j and (j, i) in directed}
+    else:
+        pairs = {(min(i, j), max(i, j)) for i, j in directed}
+
+    for i, j in sorted(pairs):
+        connect_if_within(G, city_ids[i], city_ids[j], r, d)
+
+    degrees = [degree for _, degree in G.degree()]
+    G.graph['knn'] = {
+        'k': k,
+        'mutual': mutual,
+        'max_degree': max(degrees) if degrees else 0,
+        'mean_degree': float(np.mean(degrees)) if degrees else 0.0
+    }
+    return G
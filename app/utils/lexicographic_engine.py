@@ -0,0 +1,118 @@
+import heapq
+
+import numpy as np
+
+from app.utils.graph_arrays import get_graph_arrays
+
+# Resolução padrão dos pesos em ponto fixo (1/1000 da unidade: metros quando em km)
+DEFAULT_SCALE = 1000
+
+_INT64_LIMIT = 2**63 - 1
+
+
+class LexicographicModel:
+    """
+    Custos lexicográficos (distância total, população total) empacotados em int64.
+
+    Cada peso vira um inteiro em ponto fixo (round(weight * scale)) e a chave de uma
+    aresta (u, v) é distância_fixa * radix + população(v), com radix maior que a
+    soma das populações de todas as cidades. Como a soma das populações ao longo de
+    qualquer caminho simples é menor que radix, a soma das chaves nunca "transborda"
+    da parte da população para a da distância: comparar as somas é comparar
+    (distância, população) lexicograficamente, com uma única comparação de inteiros
+    e empates exatos (sem acidentes de ponto flutuante).
+
+    A escala é reduzida (potências de 10) até que a maior chave de caminho possível,
+    (n - 1) * maior peso * radix, caiba em int64.
+
+    Attributes:
+        arrays: GraphArrays do grafo
+        scale: fator do ponto fixo efetivamente usado
+        radix: base da parte de população
+        fixed_weights: pesos em ponto fixo (array int64)
+        keys: chave empacotada de cada posição de `indices` (array int64)
+        indptr_list, indices_list, keys_list: listas Python para os laços de relaxação
+    """
+
+    def __init__(self, arrays, scale=None):
+        self.arrays = arrays
+        population = np.maximum(arrays.population, 0)
+        self.radix = int(population.sum()) + 1
+        max_weight = float(arrays.weights.max()) if arrays.weights.size else 0.0
+        if arrays.weights.size and arrays.weights.min() < 0:
+            raise ValueError("A busca lexicográfica exige pesos não negativos")
+
+        def fits(s):
+            return (max(arrays.n - 1, 1) * (round(max_weight * s) + 1) + 1) * self.radix <= _INT64_LIMIT
+
+        if scale is None:
+            scale = DEFAULT_SCALE
+            while scale > 1 and not fits(scale):
+                scale //= 10
+        if not fits(scale):
+            raise ValueError("Os custos empacotados não cabem em int64 com a escala informada")
+        self.scale = scale
+
+        self.fixed_weights = np.rint(arrays.weights * scale).astype(np.int64)
+        self.keys = self.fixed_weights * self.radix + population[arrays.indices]
+        self.indptr_list, self.indices_list, _, _ = arrays.adjacency_lists()
+        self.keys_list = self.keys.tolist()
+        self.population_list = population.tolist()
+
+    def unpack(self, key):
+        """Separa uma chave empacotada em (distância em ponto fixo, população)."""
+        return divmod(int(key), self.radix)
+
+
+def get_lexicographic_model(graph, scale=None):
+    """
+    Retorna o modelo lexicográfico do grafo, calculado uma vez por grafo e escala.
+
+    Args:
+        graph: Grafo NetworkX
+        scale: fator do ponto fixo (default: DEFAULT_SCALE, reduzido se necessário)
+
+    Returns:
+        LexicographicModel armazenado junto aos arrays do grafo
+    """
+    arrays = get_graph_arrays(graph)
+    return arrays.derived(('lexicographic', scale), lambda: LexicographicModel(arrays, scale=scale))
+
+
+def lexicographic_path(model, source, target):
+    """
+    Dijkstra sobre as chaves empacotadas: menor distância total e, entre as rotas
+    de mesma distância (em ponto fixo), menor população total.
+
+    Args:
+        model: LexicographicModel
+        source, target: índices internos
+
+    Returns:
+        (caminho de índices, chave empacotada da rota incluindo a origem) ou (None, None)
+    """
+    indptr, indices, keys = model.indptr_list, model.indices_list, model.keys_list
+    best = {source: 0}
+    parent = {source: -1}
+    settled = set()
+    heap = [(0, source)]
+    while heap:
+        key, node = heapq.heappop(heap)
+        if node in settled:
+            continue
+        settled.add(node)
+        if node == target:
+            path = [node]
+            while parent[node] >= 0:
+                node = parent[node]
+                path.append(node)
+            path.reverse()
+            return path, key + model.population_list[source]
+        for pos in range(indptr[node], indptr[node + 1]):
+            neighbor = indices[pos]
+            alt = key + keys[pos]
+            if alt < best.get(neighbor, _INT64_LIMIT + 1):
+                best[neighbor] = alt
+                parent[neighbor] = node
+                heapq.heappush(heap, (alt, neighbor))
+    return None, None
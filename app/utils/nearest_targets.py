@@ -0,0 +1,103 @@
+import heapq
+
+import numpy as np
+
+from app.utils.graph_arrays import get_graph_arrays
+from app.utils.sssp_cache import walk_parents
+
+
+def population_at_least(minimum):
+    """Predicado: cidades com população maior ou igual a `minimum`."""
+    return lambda arrays: arrays.population >= minimum
+
+
+def in_state(*states):
+    """Predicado: cidades em algum dos estados informados."""
+    return lambda arrays: np.isin(arrays.state, list(states))
+
+
+def all_of(*predicates):
+    """Predicado: cidades que satisfazem todos os predicados."""
+    def combined(arrays):
+        mask = np.ones(arrays.n, dtype=bool)
+        for predicate in predicates:
+            mask &= predicate_mask(arrays, predicate)
+        return mask
+    return combined
+
+
+def predicate_mask(arrays, predicate):
+    """
+    Avalia o predicado sobre os arrays de atributos dos nós.
+
+    Args:
+        arrays: GraphArrays do grafo
+        predicate: função (arrays) -> array booleano de tamanho n, ou o próprio
+            array booleano (na ordem de arrays.nodes)
+
+    Returns:
+        Array booleano de tamanho n
+    """
+    mask = predicate(arrays) if callable(predicate) else predicate
+    mask = np.asarray(mask, dtype=bool)
+    if mask.shape != (arrays.n,):
+        raise ValueError("O predicado deve produzir um valor booleano por nó")
+    return mask
+
+
+def nearest_matching(graph, start, predicate, k=1, include_start=False):
+    """
+    As k cidades alcançáveis mais próximas de `start` que satisfazem o predicado.
+
+    Um único Dijkstra a partir da origem (desempate pela menor população, como
+    shortest_path_tree) que para assim que a k-ésima cidade qualificada é
+    estabilizada: como os nós saem do heap em ordem de distância, as primeiras
+    qualificadas estabilizadas são as mais próximas.
+
+    Args:
+        graph: Grafo NetworkX
+        start: nó de origem
+        predicate: ver predicate_mask (ex.: population_at_least(500000))
+        k: número de cidades a retornar
+        include_start: se a própria origem pode ser um resultado
+
+    Returns:
+        Lista (ordenada pela distância) de dicionários com 'node', 'path' e 'distance';
+        pode ter menos de k itens se não houver cidades qualificadas alcançáveis
+    """
+    arrays = get_graph_arrays(graph)
+    if start not in arrays.index or k < 1:
+        return []
+    matches = predicate_mask(arrays, predicate).tolist()
+    indptr, indices, weights, populations = arrays.adjacency_lists()
+    source = arrays.index[start]
+
+    dist = {source: 0.0}
+    parent = {source: -1}
+    settled = set()
+    counter = 0
+    heap = [(0.0, populations[source], counter, source)]
+    found = []
+    while heap and len(found) < k:
+        d, _, _, node = heapq.heappop(heap)
+        if node in settled:
+            continue
+        settled.add(node)
+        if matches[node] and (include_start or node != source):
+            found.append((node, d))
+        for pos in range(indptr[node], indptr[node + 1]):
+            neighbor = indices[pos]
+            alt = d + weights[pos]
+            if alt < dist.get(neighbor, float('inf')):
+                dist[neighbor] = alt
+                parent[neighbor] = node
+                counter += 1
+                heapq.heappush(heap, (alt, populations[neighbor], counter, neighbor))
+
+    results = []
+    for node, distance in found:
+        path = walk_parents(parent, node)
+        path.reverse()
+        results.append({'node': arrays.nodes[node], 'path': arrays.path_to_nodes(path), 'distance': distance})
+    return results
+
@@ -0,0 +1,251 @@
+import heapq
+import math
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+from app.utils.corridor_graph import EARTH_RADIUS_KM, _QUERY_SLACK, chord_length, unit_vectors
+from app.utils.graph_utils import haversine_distances
+
+# Arestas verificadas de uma vez (NumPy) ao procurar a próxima que melhora uma distância
+_WINDOW = 2048
+
+
+def candidate_edges(cities_df, max_radius, unit='km'):
+    """
+    Todos os pares de cidades a no máximo `max_radius`, ordenados pelo comprimento.
+
+    O comprimento de uma aresta é o próprio peso que ela teria no grafo (km quando
+    a conexão é por d, graus quando é por r), e ela existe no grafo de raio ρ
+    exatamente quando comprimento <= ρ.
+
+    Args:
+        cities_df: DataFrame com dados das cidades (city_id, latitude, longitude)
+        max_radius: maior raio considerado
+        unit: 'km' ou 'graus'
+
+    Returns:
+        city_ids: lista de ids na ordem dos índices usados nas arestas
+        first, second: arrays de índices das extremidades
+        lengths: array com os comprimentos, em ordem crescente
+    """
+    city_ids = cities_df['city_id'].tolist()
+    latitude = cities_df['latitude'].to_numpy(dtype=np.float64)
+    longitude = cities_df['longitude'].to_numpy(dtype=np.float64)
+    angle = max_radius / EARTH_RADIUS_KM if unit == 'km' else math.radians(max_radius)
+    if len(city_ids) < 2:
+        empty = np.empty(0, dtype=np.int64)
+        return city_ids, empty, empty, np.empty(0)
+
+    pairs = cKDTree(unit_vectors(latitude, longitude)).query_pairs(
+        chord_length(angle) + _QUERY_SLACK, output_type='ndarray'
+    )
+    first, second = pairs[:, 0].astype(np.int64), pairs[:, 1].astype(np.int64)
+    lengths = haversine_distances(latitude[first], longitude[first], latitude[second], longitude[second])
+    if unit != 'km':
+        lengths = np.degrees(lengths / EARTH_RADIUS_KM)
+    keep = lengths <= max_radius
+    first, second, lengths = first[keep], second[keep], lengths[keep]
+    order = np.lexsort((second, first, lengths))
+    return city_ids, first[order], second[order], lengths[order]
+
+
+def straight_line(latitude, longitude, target, unit='km'):
+    """
+    Distância em linha reta (arco de círculo máximo) de cada cidade até `target`,
+    na unidade dos pesos; com uma pequena margem para baixo, é um limite inferior
+    da distância pela rede.
+    """
+    distance = haversine_distances(latitude, longitude, latitude[target], longitude[target])
+    if unit != 'km':
+        distance = np.degrees(distance / EARTH_RADIUS_KM)
+    # Margem para erros de arredondamento na desigualdade triangular
+    return distance * (1 - 1e-9)
+
+
+def _first_connection(n, first, second, s, t):
+    """
+    Número de arestas (prefixo da lista ordenada) a partir do qual s e t ficam
+    conectados, por união-busca; None se não se conectam.
+    """
+    root = list(range(n))
+
+    def find(x):
+        while root[x] != x:
+            root[x] = root[root[x]]
+            x = root[x]
+        return x
+
+    for count, (u, v) in enumerate(zip(first.tolist(), second.tolist()), start=1):
+        ru, rv = find(u), find(v)
+        if ru != rv:
+            root[ru] = rv
+            if find(s) == find(t):
+                return count
+    return None
+
+
+def radius_sweep(cities_df, start, end, max_radius, unit='km'):
+    """
+    Menor rota entre start e end como função do raio de conexão, de 0 a max_radius.
+
+    Em vez de reconstruir o grafo e refazer a busca para cada raio, as arestas
+    candidatas são inseridas em ordem crescente de comprimento:
+
+    1. União-busca sobre as arestas ordenadas dá o primeiro raio em que start e
+       end se conectam; um Dijkstra nesse grafo dá a primeira rota.
+    2. A partir daí, cada aresta nova que melhora a distância de uma extremidade
+       tem a melhora propagada por um Dijkstra local sobre as arestas já inseridas.
+       Só é propagada uma distância g se g + h(v) < distância atual até end, com
+       h a distância em linha reta até end (limite inferior, pois todo peso é
+       um comprimento geodésico): os demais nós não podem melhorar a rota. Pelo
+       mesmo motivo, arestas fora da elipse h_s(u) + w + h(v) < rota inicial são
+       descartadas de uma vez, de forma vetorizada.
+    3. A varredura para quando as arestas restantes são mais longas que a rota.
+
+    Args:
+        cities_df: DataFrame com dados das cidades
+        start: id da cidade de origem
+        end: id da cidade de destino
+        max_radius: maior raio considerado
+        unit: 'km' ou 'graus'
+
+    Returns:
+        Lista de pontos de quebra, em ordem crescente de raio; cada um é um dicionário
+        com 'radius' (a partir deste raio), 'distance', 'path' (ids) e 'edges' (arestas
+        no grafo nesse raio). Entre dois pontos consecutivos a rota não muda.
+    """
+    city_ids, first, second, lengths = candidate_edges(cities_df, max_radius, unit=unit)
+    position = {city_id: i for i, city_id in enumerate(city_ids)}
+    s, t = position[start], position[end]
+    n = len(city_ids)
+    if s == t:
+        return [{'radius': 0.0, 'distance': 0.0, 'path': [start], 'edges': 0}]
+
+    connected = _first_connection(n, first, second, s, t)
+    if connected is None:
+        return []
+    # Arestas de mesmo comprimento entram juntas
+    connected = int(np.searchsorted(lengths, lengths[connected - 1], side='right'))
+
+    latitude = cities_df['latitude'].to_numpy(dtype=np.float64)
+    longitude = cities_df['longitude'].to_numpy(dtype=np.float64)
+    from_start = straight_line(latitude, longitude, s, unit)
+    to_end = straight_line(latitude, longitude, t, unit)
+
+    # Rota no primeiro raio conectado (Dijkstra até estabilizar end)
+    indptr, neighbors, weights, order = _insertion_csr(n, first, second, lengths, np.arange(connected))
+    dist = [math.inf] * n
+    parent = [-1] * n
+    dist[s] = 0.0
+    heap = [(0.0, s)]
+    while heap:
+        d, node = heapq.heappop(heap)
+        if node == t:
+            break
+        if d > dist[node]:
+            continue
+        for pos in range(indptr[node], indptr[node + 1]):
+            alt = d + weights[pos]
+            if alt < dist[neighbors[pos]]:
+                dist[neighbors[pos]] = alt
+                parent[neighbors[pos]] = node
+                heapq.heappush(heap, (alt, neighbors[pos]))
+
+    def breakpoint(radius):
+        path = [t]
+        while parent[path[-1]] >= 0:
+            path.append(parent[path[-1]])
+        path.reverse()
+        return {'radius': radius, 'distance': dist[t], 'path': [city_ids[i] for i in path]}
+
+    breakpoints = [breakpoint(float(lengths[connected - 1]))]
+
+    # Só interessam arestas dentro da elipse h_s(u) + w + h(v) < rota inicial: as
+    # demais nunca fazem parte de uma rota melhor (e seriam podadas na propagação)
+    rest = np.arange(connected, len(lengths))
+    through = lengths[rest] + np.minimum(from_start[first[rest]] + to_end[second[rest]],
+                                         from_start[second[rest]] + to_end[first[rest]])
+    useful = rest[through < dist[t]]
+    kept = np.concatenate((np.arange(connected), useful))
+    # Lista de adjacência de todas as arestas mantidas, em ordem de inserção por nó:
+    # no passo j, os vizinhos de um nó são o prefixo com índice de inserção <= j
+    indptr, neighbors, weights, order = _insertion_csr(n, first, second, lengths, kept)
+    h = to_end.tolist()
+    u_all, v_all, w_all = first[useful], second[useful], lengths[useful]
+    h_u, h_v = to_end[u_all], to_end[v_all]
+
+    i = 0
+    while i < len(useful) and w_all[i] < dist[t]:
+        # Próxima aresta que melhora alguma extremidade, verificada em bloco
+        window = slice(i, i + _WINDOW)
+        current = np.array(dist)
+        du, dv, w = current[u_all[window]], current[v_all[window]], w_all[window]
+        improves = ((du + w < dv) & (du + w + h_v[window] < dist[t])) | \
+                   ((dv + w < du) & (dv + w + h_u[window] < dist[t]))
+        hits = np.flatnonzero(improves)
+        if len(hits) == 0:
+            i += _WINDOW
+            continue
+        j = i + int(hits[0])
+        i = j + 1
+        limit = int(useful[j])
+        u, v, w = int(u_all[j]), int(v_all[j]), float(w_all[j])
+
+        before = dist[t]
+        heap = []
+        for a, b in ((u, v), (v, u)):
+            alt = dist[a] + w
+            if alt < dist[b] and alt + h[b] < dist[t]:
+                dist[b] = alt
+                parent[b] = a
+                heapq.heappush(heap, (alt, b))
+        while heap:
+            d, node = heapq.heappop(heap)
+            if d > dist[node] or d + h[node] >= dist[t]:
+                continue
+            for pos in range(indptr[node], indptr[node + 1]):
+                if order[pos] > limit:
+                    break
+                neighbor = neighbors[pos]
+                alt = d + weights[pos]
+                if alt < dist[neighbor] and alt + h[neighbor] < dist[t]:
+                    dist[neighbor] = alt
+                    parent[neighbor] = node
+                    heapq.heappush(heap, (alt, neighbor))
+
+        if dist[t] < before:
+            if breakpoints[-1]['radius'] == w:
+                breakpoints[-1] = breakpoint(w)
+            else:
+                breakpoints.append(breakpoint(w))
+
+    for point in breakpoints:
+        # Arestas no grafo no raio do ponto de quebra (inclusive as de mesmo comprimento)
+        point['edges'] = int(np.searchsorted(lengths, point['radius'], side='right'))
+    return breakpoints
+
+
+def _insertion_csr(n, first, second, lengths, kept):
+    """
+    CSR (listas Python) das arestas `kept` nos dois sentidos, com os vizinhos de
+    cada nó em ordem de inserção; `order` guarda o índice de inserção de cada posição.
+    """
+    sources = np.concatenate((first[kept], second[kept]))
+    targets = np.concatenate((second[kept], first[kept]))
+    order = np.concatenate((kept, kept))
+    arrangement = np.lexsort((order, sources))
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(sources, minlength=n), out=indptr[1:])
+    return (indptr.tolist(), targets[arrangement].tolist(),
+            np.concatenate((lengths[kept], lengths[kept]))[arrangement].tolist(), order[arrangement].tolist())
+
+
+def route_at(breakpoints, radius):
+    """Ponto de quebra vigente no raio informado (None se ainda não há rota)."""
+    current = None
+    for point in breakpoints:
+        if point['radius'] > radius:
+            break
+        current = point
+    return current
@@ -0,0 +1,318 @@
+import heapq
+import time
+
+
+class HeapQueue:
+    """
+    Fila de prioridade baseada em heapq (implementação padrão das buscas).
+
+    As entradas são tuplas cujo primeiro elemento é a prioridade principal; os demais
+    elementos (população, contador, nó...) servem de desempate, como nas buscas originais.
+
+    Attributes:
+        pushes, pops: contadores de operações
+        peak_size: maior número de entradas armazenadas simultaneamente
+        stale_pops: remoções de itens (entry[-1]) que já tinham sido removidos antes,
+            ou seja, entradas obsoletas deixadas pela remoção preguiçosa (contadas
+            apenas com track_stale=True, para não pesar nas buscas comuns)
+    """
+
+    name = 'heapq'
+
+    def __init__(self, track_stale=False):
+        self._heap = []
+        self._popped = set() if track_stale else None
+        self.pushes = 0
+        self.pops = 0
+        self.peak_size = 0
+        self.stale_pops = 0
+
+    def push(self, entry):
+        heapq.heappush(self._heap, entry)
+        self.pushes += 1
+        if len(self._heap) > self.peak_size:
+            self.peak_size = len(self._heap)
+
+    def pop(self):
+        self.pops += 1
+        entry = heapq.heappop(self._heap)
+        if self._popped is not None:
+            _count_stale(self, entry[-1])
+        return entry
+
+    def peek(self):
+        return self._heap[0]
+
+    def __len__(self):
+        return len(self._heap)
+
+    def __bool__(self):
+        return bool(self._heap)
+
+
+class RadixHeapQueue:
+    """
+    Radix heap monótona sobre a prioridade principal quantizada em ponto fixo.
+
+    A prioridade principal (entry[0]) é convertida para inteiro com `scale` casas
+    por unidade, relativa à primeira prioridade inserida. Cada entrada vai para o
+    balde dado pelo bit mais significativo em que sua chave difere da última chave
+    removida; assim, cada entrada é redistribuída no máximo O(log C) vezes e não há
+    comparações de tuplas fora do balde 0.
+
+    O balde 0 (chave igual à última removida) é mantido como heap das tuplas
+    completas, o que preserva exatamente a ordem de desempate (população, contador)
+    entre entradas com a mesma chave quantizada. Chaves menores que a última removida
+    (heurística inconsistente, por exemplo) também vão para o balde 0, de modo que a
+    fila continua correta mesmo sem monotonicidade; só perde eficiência.
+    """
+
+    name = 'radix'
+
+    def __init__(self, scale=1e6, track_stale=False):
+        self.scale = scale
+        self._origin = None
+        self._last = 0
+        self._bucket0 = []
+        self._buckets = [[] for _ in range(65)]
+        self._size = 0
+        self._popped = set() if track_stale else None
+        self.pushes = 0
+        self.pops = 0
+        self.peak_size = 0
+        self.stale_pops = 0
+
+    def _quantize(self, value):
+        if self._origin is None:
+            self._origin = value
+        key = int((value - self._origin) * self.scale)
+        return key if key > self._last else self._last
+
+    def _place(self, key, entry):
+        if key == self._last:
+            heapq.heappush(self._bucket0, entry)
+            return
+        index = (key ^ self._last).bit_length()
+        while index >= len(self._buckets):
+            self._buckets.append([])
+        self._buckets[index].append((key, entry))
+
+    def push(self, entry):
+        self._place(self._quantize(entry[0]), entry)
+        self._size += 1
+        self.pushes += 1
+        if self._size > self.peak_size:
+            self.peak_size = self._size
+
+    def _refill(self):
+        # Encontra o primeiro balde não vazio e redistribui a partir da sua menor chave
+        for bucket in self._buckets:
+            if bucket:
+                break
+        else:
+            raise IndexError("pop from an empty priority queue")
+        self._last = min(key for key, _ in bucket)
+        items = bucket[:]
+        bucket.clear()
+        for key, entry in items:
+            self._place(key, entry)
+
+    def pop(self):
+        if not self._bucket0:
+            self._refill()
+        self._size -= 1
+        self.pops += 1
+        entry = heapq.heappop(self._bucket0)
+        if self._popped is not None:
+            _count_stale(self, entry[-1])
+        return entry
+
+    def peek(self):
+        if not self._bucket0:
+            self._refill()
+        return self._bucket0[0]
+
+    def __len__(self):
+        return self._size
+
+    def __bool__(self):
+        return self._size > 0
+
+
+class IndexedDaryHeap:
+    """
+    Heap 4-ária indexada com decrease-key verdadeiro.
+
+    Cada item (entry[-1], o nó nas buscas) ocupa no máximo uma posição na heap; um
+    mapa de posições permite localizar a entrada do item e reduzir sua prioridade no
+    lugar, em vez de inserir uma nova tupla e descartar a antiga depois. Com isso o
+    open set nunca passa de V entradas e não há remoções obsoletas. Uma inserção com
+    prioridade pior que a atual do item é ignorada.
+
+    A aridade 4 reduz a altura da árvore (menos trocas no sift-up do decrease-key) ao
+    custo de mais comparações no sift-down, o que favorece buscas com muitas relaxações.
+    """
+
+    name = 'dary'
+    arity = 4
+
+    def __init__(self, track_stale=False):
+        self._heap = []
+        self._position = {}
+        self._popped = set() if track_stale else None
+        self.pushes = 0
+        self.pops = 0
+        self.decrease_keys = 0
+        self.peak_size = 0
+        self.stale_pops = 0
+
+    def _sift_up(self, i):
+        heap, position = self._heap, self._position
+        entry = heap[i]
+        while i > 0:
+            parent = (i - 1) // self.arity
+            if not entry < heap[parent]:
+                break
+            heap[i] = heap[parent]
+            position[heap[i][-1]] = i
+            i = parent
+        heap[i] = entry
+        position[entry[-1]] = i
+
+    def _sift_down(self, i):
+        heap, position = self._heap, self._position
+        size = len(heap)
+        entry = heap[i]
+        while True:
+            first = self.arity * i + 1
+            if first >= size:
+                break
+            best = first
+            for child in range(first + 1, min(first + self.arity, size)):
+                if heap[child] < heap[best]:
+                    best = child
+            if not heap[best] < entry:
+                break
+            heap[i] = heap[best]
+            position[heap[i][-1]] = i
+            i = best
+        heap[i] = entry
+        position[entry[-1]] = i
+
+    def push(self, entry):
+        item = entry[-1]
+        i = self._position.get(item)
+        if i is not None:
+            if entry < self._heap[i]:
+                self._heap[i] = entry
+                self._sift_up(i)
+                self.decrease_keys += 1
+            return
+        self._heap.append(entry)
+        self._sift_up(len(self._heap) - 1)
+        self.pushes += 1
+        if len(self._heap) > self.peak_size:
+            self.peak_size = len(self._heap)
+
+    def pop(self):
+        heap = self._heap
+        top = heap[0]
+        last = heap.pop()
+        del self._position[top[-1]]
+        if heap:
+            heap[0] = last
+            self._sift_down(0)
+        self.pops += 1
+        if self._popped is not None:
+            _count_stale(self, top[-1])
+        return top
+
+    def peek(self):
+        return self._heap[0]
+
+    def __contains__(self, item):
+        return item in self._position
+
+    def __len__(self):
+        return len(self._heap)
+
+    def __bool__(self):
+        return bool(self._heap)
+
+
+def _count_stale(queue, item):
+    if item in queue._popped:
+        queue.stale_pops += 1
+    else:
+        queue._popped.add(item)
+
+
+# Registro das implementações de fila disponíveis para as buscas
+PRIORITY_QUEUES = {
+    'heapq': HeapQueue,
+    'radix': RadixHeapQueue,
+    'dary': IndexedDaryHeap,
+}
+
+
+def make_queue_factory(queue):
+    """
+    Normaliza o parâmetro de fila das buscas.
+
+    Args:
+        queue: None (heapq), nome registrado em PRIORITY_QUEUES, classe ou função
+            sem argumentos que cria uma fila
+
+    Returns:
+        Função sem argumentos que cria uma nova fila
+    """
+    if queue is None:
+        return HeapQueue
+    if isinstance(queue, str):
+        if queue not in PRIORITY_QUEUES:
+            raise ValueError(f"Fila de prioridade desconhecida: {queue}. "
+                             f"Opções: {', '.join(PRIORITY_QUEUES)}")
+        return PRIORITY_QUEUES[queue]
+    return queue
+
+
+def benchmark_priority_queues(search_fn, pairs, queues=('heapq', 'radix')):
+    """
+    Compara implementações de fila em uma busca, medindo pushes por segundo e
+    tamanho máximo da fila.
+
+    Args:
+        search_fn: função (start, end, queue_factory) que executa a busca
+        pairs: lista de tuplas (start, end)
+        queues: nomes das filas registradas a comparar
+
+    Returns:
+        Lista de dicionários com 'queue', 'pushes', 'pops', 'elapsed_ms',
+        'pushes_per_sec', 'peak_size' (maior pico entre as consultas) e
+        'stale_pops' (total de remoções obsoletas; as filas do benchmark são
+        criadas com track_stale=True)
+    """
+    records = []
+    for name in queues:
+        created = []
+
+        def factory(cls=PRIORITY_QUEUES[name]):
+            queue = cls(track_stale=True)
+            created.append(queue)
+            return queue
+
+        start_time = time.perf_counter()
+        for start, end in pairs:
+            search_fn(start, end, factory)
+        elapsed = time.perf_counter() - start_time
+        pushes = sum(q.pushes for q in created)
+        records.append({
+            'queue': name,
+            'pushes': pushes,
+            'pops': sum(q.pops for q in created),
+            'elapsed_ms': elapsed * 1000,
+            'pushes_per_sec': pushes / elapsed if elapsed > 0 else float('inf'),
+            'peak_size': max((q.peak_size for q in created), default=0),
+            'stale_pops': sum(q.stale_pops for q in created)
+        })
+    return records
@@ -0,0 +1,242 @@
+import threading
+import time
+from collections import Counter, deque
+
+import numpy as np
+
+from app.utils.graph_arrays import get_graph_arrays
+from app.utils.sssp_cache import spt_cache
+from app.utils.state_overlay import state_overlay
+
+# Grau médio a partir do qual o grafo é considerado denso (A* antes do Dijkstra bidirecional)
+DENSE_MEAN_DEGREE = 12.0
+# Consultas recentes com a mesma cidade para calcular sua árvore completa
+HOT_SOURCE_QUERIES = 3
+# Amostras de latência por motor antes de a escolha passar a ser pelo histórico
+MIN_SAMPLES = 3
+# A cada quantas consultas genéricas o motor com menos amostras é experimentado
+EXPLORE_EVERY = 10
+# Peso da latência mais recente na média móvel exponencial
+LATENCY_ALPHA = 0.3
+
+
+def label_components(arrays):
+    """Rótulo do componente conexo de cada nó (array int64) por buscas em profundidade em Python."""
+    indptr, indices, _, _ = arrays.adjacency_lists()
+    labels = [-1] * arrays.n
+    for root in range(arrays.n):
+        if labels[root] >= 0:
+            continue
+        labels[root] = root
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            for pos in range(indptr[node], indptr[node + 1]):
+                neighbor = indices[pos]
+                if labels[neighbor] < 0:
+                    labels[neighbor] = root
+                    stack.append(neighbor)
+    return np.array(labels, dtype=np.int64)
+
+
+def component_labels(arrays):
+    """Rótulos de label_components, calculados uma vez por grafo."""
+    return arrays.derived('component_labels', lambda: label_components(arrays))
+
+
+def weight_unit(arrays):
+    """
+    'km' ou 'graus' se todo peso de aresta é o comprimento geodésico da conexão
+    (grafos de build_graph), ou None para pesos arbitrários. Com pesos geodésicos,
+    a distância em linha reta é um limite inferior da distância pela rede.
+    """
+    def detect():
+        if arrays.num_edges == 0:
+            return None
+        if np.allclose(arrays.weights, arrays.km_dist, rtol=1e-9, atol=1e-9):
+            return 'km'
+        if np.allclose(arrays.weights, arrays.angular_dist, rtol=1e-9, atol=1e-12):
+            return 'graus'
+        return None
+    return arrays.derived('weight_unit', detect)
+
+
+# Motor de ENGINE_REGISTRY (app.utils.algorithms) que executa cada decisão do
+# planejador; None nos atalhos, em que a própria decisão já responde a consulta
+PLAN_ENGINES = {
+    'trivial': None,
+    'components': None,
+    'direct': None,
+    'tree_cache': 'tree_cache',
+    'overlay': 'state_overlay',
+    'hot_source': 'tree_cache',
+    'astar': 'a_star',
+    'bidirectional': 'bidirectional_dijkstra',
+}
+
+
+def _shortcut(decision, graph, start, end):
+    if decision == 'trivial':
+        return [start], 0.0
+    if decision == 'components':
+        return None, float('inf')
+    return [start, end], graph[start][end]['weight']
+
+
+def _execute(engine, graph, start, end):
+    """Executa uma decisão do planejador (ou um motor do registro) e devolve (path, total_dist)."""
+    if engine in PLAN_ENGINES and PLAN_ENGINES[engine] is None:
+        return _shortcut(engine, graph, start, end)
+    # Importação tardia: algorithms importa este módulo para registrar os motores
+    from app.utils.algorithms import ENGINE_REGISTRY
+
+    name = PLAN_ENGINES.get(engine, engine)
+    if name not in ENGINE_REGISTRY:
+        raise ValueError(f"Motor desconhecido: {engine}. Opções: {', '.join(PLAN_ENGINES)}")
+    return ENGINE_REGISTRY[name].run(graph, start, end)
+
+
+class QueryPlanner:
+    """
+    Escolhe, para cada consulta origem -> destino, o motor exato mais barato.
+
+    Regras, na ordem:
+        'trivial': origem igual ao destino
+        'components': rótulos de componente diferentes (não há rota, sem busca)
+        'direct': aresta direta com pesos geodésicos (nenhuma rota é mais curta
+            que a linha reta)
+        'tree_cache': árvore da origem ou do destino já está no cache de árvores
+        'overlay': sobreposição por estados já pré-processada para o grafo
+        'hot_source': origem ou destino frequente nas consultas recentes; a árvore
+            completa da cidade frequente é calculada e fica no cache para as próximas
+        'astar' / 'bidirectional': A* (heurística em linha reta, só com pesos
+            geodésicos) ou Dijkstra bidirecional. Com poucas amostras, decide a
+            densidade do grafo; depois, a menor latência média recente por motor e
+            densidade, experimentando periodicamente o motor menos amostrado.
+
+    Fora dos atalhos, cada decisão é executada pelo motor correspondente em
+    ENGINE_REGISTRY (ver PLAN_ENGINES).
+    """
+
+    def __init__(self, history_size=200):
+        self.history = deque(maxlen=history_size)
+        self._latency = {}
+        self._samples = Counter()
+        self._generic_queries = 0
+        self._lock = threading.Lock()
+
+    def plan(self, graph, start, end):
+        """
+        Motor escolhido para a consulta, sem executá-la.
+
+        Returns:
+            Dicionário com 'engine', 'reason', 'density' (grau médio do grafo) e, em
+            'hot_source', 'reverse' (True se a consulta roda a partir do destino)
+        """
+        arrays = get_graph_arrays(graph)
+        density = float(arrays.degree.mean()) if arrays.n else 0.0
+        unit = weight_unit(arrays)
+
+        def decision(engine, reason):
+            return {'engine': engine, 'reason': reason, 'density': density}
+
+        if start == end:
+            return decision('trivial', "origem igual ao destino")
+        labels = component_labels(arrays)
+        if labels[arrays.index[start]] != labels[arrays.index[end]]:
+            return decision('components', "origem e destino em componentes diferentes")
+        if unit is not None and graph.has_edge(start, end):
+            return decision('direct', "conexão direta (pesos geodésicos)")
+        s, t = arrays.index[start], arrays.index[end]
+        if spt_cache.get(arrays.fingerprint, s) is not None or spt_cache.get(arrays.fingerprint, t) is not None:
+            return decision('tree_cache', "árvore de caminhos mínimos em cache")
+        if state_overlay.is_prepared(graph):
+            return decision('overlay', "sobreposição por estados pré-processada")
+
+        with self._lock:
+            recent = Counter()
+            for record in self.history:
+                recent[record['start']] += 1
+                recent[record['end']] += 1
+            hot = max(recent[start], recent[end])
+            if hot + 1 >= HOT_SOURCE_QUERIES:
+                plan = decision('hot_source', f"cidade frequente ({hot} consultas recentes)")
+                # A árvore é enraizada na cidade frequente (a rota é invertida no final)
+                plan['reverse'] = recent[end] > recent[start]
+                return plan
+
+            candidates = ['astar', 'bidirectional'] if unit is not None else ['bidirectional']
+            bucket = 'dense' if density >= DENSE_MEAN_DEGREE else 'sparse'
+            self._generic_queries += 1
+            samples = {engine: self._samples[(engine, bucket)] for engine in candidates}
+            if len(candidates) > 1 and self._generic_queries % EXPLORE_EVERY == 0:
+                engine = min(candidates, key=lambda e: samples[e])
+                return decision(engine, "exploração periódica do motor menos amostrado")
+            if all(count >= MIN_SAMPLES for count in samples.values()):
+                engine = min(candidates, key=lambda e: self._latency[(e, bucket)])
+                return decision(engine, f"menor latência média recente ({self._latency[(engine, bucket)]:.2f} ms)")
+        if len(candidates) > 1 and bucket == 'dense':
+            return decision('astar', f"grafo denso (grau médio {density:.1f})")
+        if unit is None:
+            return decision('bidirectional', "pesos não geodésicos (sem heurística admissível)")
+        return decision('bidirectional', f"grafo esparso (grau médio {density:.1f})")
+
+    def run(self, graph, start, end, engine=None):
+        """
+        Planeja (ou usa o motor informado) e executa a consulta, registrando a
+        latência no histórico. As buscas rodam pelos motores de ENGINE_REGISTRY.
+
+        Args:
+            engine: decisão de PLAN_ENGINES ou nome de um motor de ENGINE_REGISTRY
+                para a tarefa 'shortest_path' (None: o planejador decide)
+
+        Returns:
+            path: lista de nós ou None
+            total_dist: distância da rota (inf se não existir)
+            record: dicionário com o plano ('engine', 'reason', 'density'), 'start',
+                'end', 'ms' (planejamento + execução) e 'found'
+        """
+        begin = time.perf_counter()
+        decision = self.plan(graph, start, end) if engine is None else \
+            {'engine': engine, 'reason': "motor escolhido pelo usuário",
+             'density': float(get_graph_arrays(graph).degree.mean())}
+        if decision.get('reverse'):
+            path, total_dist = _execute(decision['engine'], graph, end, start)
+            path = path[::-1] if path is not None else None
+        else:
+            path, total_dist = _execute(decision['engine'], graph, start, end)
+        elapsed = (time.perf_counter() - begin) * 1000
+        record = dict(decision, start=start, end=end, ms=elapsed, found=path is not None)
+        with self._lock:
+            self.history.append(record)
+            key = (decision['engine'], 'dense' if decision['density'] >= DENSE_MEAN_DEGREE else 'sparse')
+            previous = self._latency.get(key)
+            self._latency[key] = elapsed if previous is None else \
+                LATENCY_ALPHA * elapsed + (1 - LATENCY_ALPHA) * previous
+            self._samples[key] += 1
+        return path, total_dist, record
+
+    def stats(self):
+        """Consultas por motor e latência média (ms) de cada um no histórico recente."""
+        with self._lock:
+            records = list(self.history)
+        by_engine = {}
+        for record in records:
+            entry = by_engine.setdefault(record['engine'], {'queries': 0, 'total_ms': 0.0})
+            entry['queries'] += 1
+            entry['total_ms'] += record['ms']
+        return {
+            engine: {'queries': entry['queries'], 'mean_ms': entry['total_ms'] / entry['queries']}
+            for engine, entry in by_engine.items()
+        }
+
+    def clear(self):
+        with self._lock:
+            self.history.clear()
+            self._latency.clear()
+            self._samples.clear()
+            self._generic_queries = 0
+
+
+# Planejador global compartilhado pelas consultas da aplicação
+query_planner = QueryPlanner()
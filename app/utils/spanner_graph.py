@@ -0,0 +1,151 @@
+import math
+
+import networkx as nx
+import numpy as np
+from scipy.spatial import cKDTree
+
+from app.utils.corridor_graph import chord_length, connection_angle, unit_vectors
+from app.utils.graph_arrays import get_graph_arrays
+from app.utils.graph_utils import add_city_nodes, connect_if_within
+from app.utils.sssp_cache import shortest_path_tree
+
+# Folga (em unidades de corda) nas consultas de raio; o teste exato vem depois
+_QUERY_SLACK = 1e-9
+
+
+def cones_for_stretch(stretch):
+    """
+    Número de cones do grafo de Yao que garante o alongamento desejado.
+
+    Para cones de abertura θ < π/3, o grafo de Yao é um t-spanner com
+    t = 1 / (1 - 2 sen(θ/2)); isolando θ para o t pedido obtém-se k = ⌈2π/θ⌉.
+
+    Args:
+        stretch: alongamento máximo desejado (t > 1)
+
+    Returns:
+        Número de cones k (no mínimo 7, para que θ < π/3)
+    """
+    if stretch <= 1.0:
+        raise ValueError("O alongamento deve ser maior que 1")
+    theta = 2 * math.asin((1 - 1 / stretch) / 2)
+    return max(7, int(math.ceil(2 * math.pi / theta)))
+
+
+def initial_bearings(lat1, lon1, lat2, lon2):
+    """Rumo inicial, em radianos no intervalo [0, 2π), de (lat1, lon1) para cada (lat2, lon2) (radianos)."""
+    dlon = lon2 - lon1
+    x = np.sin(dlon) * np.cos(lat2)
+    y = np.cos(lat1) * np.sin(lat2) - np.sin(lat1) * np.cos(lat2) * np.cos(dlon)
+    return np.mod(np.arctan2(x, y), 2 * np.pi)
+
+
+def build_yao_graph(cities_df, r=None, d=None, cones=None, stretch=1.5, name_to_id=None, id_to_name=None):
+    """
+    Grafo de Yao restrito ao raio: em cada cidade, o espaço ao redor é dividido em k
+    cones (pelo rumo inicial) e apenas a cidade mais próxima de cada cone, dentre as
+    que respeitam r/d, é conectada. O número de arestas cai de O(n²) para O(kn) e,
+    para cones com abertura menor que π/3, as distâncias mínimas do grafo de raio
+    crescem no máximo pelo fator `stretch` (aproximadamente, pois os cones são
+    definidos no plano tangente de cada cidade).
+
+    As arestas têm os mesmos atributos de build_graph (weight, angular_dist, km_dist).
+
+    Args:
+        cities_df: DataFrame com dados das cidades
+        r: Raio máximo (em graus) para conectar cidades
+        d: Distância máxima (em km) para conectar cidades
+        cones: número de cones por cidade (default: calculado a partir de stretch)
+        stretch: alongamento máximo desejado, usado quando cones não é informado
+        name_to_id, id_to_name: mapeamentos entre nomes e IDs
+
+    Returns:
+        Grafo NetworkX; G.graph['spanner'] traz 'cones' e 'stretch_target'
+    """
+    if r is None and d is None:
+        raise ValueError("Pelo menos um dos parâmetros r ou d deve ser fornecido")
+    if cones is None:
+        cones = cones_for_stretch(stretch)
+
+    G = nx.Graph()
+    G.graph['r'] = r
+    G.graph['d'] = d
+    G.graph['id_to_name'] = id_to_name or {}
+    G.graph['name_to_id'] = name_to_id or {}
+    add_city_nodes(G, cities_df)
+
+    city_ids = list(G.nodes())
+    latitude_deg = np.array([G.nodes[n]['latitude'] for n in city_ids], dtype=np.float64)
+    longitude_deg = np.array([G.nodes[n]['longitude'] for n in city_ids], dtype=np.float64)
+    latitude, longitude = np.radians(latitude_deg), np.radians(longitude_deg)
+    points = unit_vectors(latitude_deg, longitude_deg)
+    tree = cKDTree(points)
+    limit = connection_angle(r, d)
+    radius = chord_length(limit) + _QUERY_SLACK
+
+    pairs = set()
+    for i, candidates in enumerate(tree.query_ball_point(points, radius)):
+        candidates = np.asarray(candidates, dtype=np.int64)
+        candidates = candidates[candidates != i]
+        if candidates.size == 0:
+            continue
+        central = np.arccos(np.clip(points[candidates] @ points[i], -1.0, 1.0))
+        inside = central <= limit * (1 + 1e-12)
+        candidates, central = candidates[inside], central[inside]
+        if candidates.size == 0:
+            continue
+        cone = (initial_bearings(latitude[i], longitude[i], latitude[candidates], longitude[candidates])
+                / (2 * np.pi) * cones).astype(np.int64) % cones
+        # Mais próximo de cada cone (desempate pelo menor índice)
+        order = np.lexsort((candidates, central, cone))
+        first = np.ones(order.size, dtype=bool)
+        first[1:] = cone[order][1:] != cone[order][:-1]
+        for j in candidates[order][first].tolist():
+            pairs.add((min(i, j), max(i, j)))
+
+    for i, j in sorted(pairs):
+        connect_if_within(G, city_ids[i], city_ids[j], r, d)
+
+    G.graph['spanner'] = {'cones': cones, 'stretch_target': stretch}
+    return G
+
+
+def measure_stretch(full_graph, spanner, sources):
+    """
+    Alongamento medido do spanner em relação ao grafo de raio completo.
+
+    Args:
+        full_graph: grafo de raio (referência)
+        spanner: grafo com os mesmos nós e subconjunto das arestas
+        sources: nós de origem usados na amostra (todas as distâncias a partir deles)
+
+    Returns:
+        Dicionário com 'max_stretch', 'mean_stretch', 'pairs' (pares comparados),
+        'disconnected' (pares alcançáveis só no grafo completo), 'edges_full' e
+        'edges_spanner'
+    """
+    full_arrays = get_graph_arrays(full_graph)
+    spanner_arrays = get_graph_arrays(spanner)
+    # Mapeia os índices do spanner para a ordem de nós do grafo completo
+    to_full = np.array([full_arrays.index[node] for node in spanner_arrays.nodes], dtype=np.int64)
+
+    ratios = []
+    disconnected = 0
+    for source in sources:
+        full_dist, _ = shortest_path_tree(full_arrays, full_arrays.index[source])
+        spanner_dist = np.full(full_arrays.n, np.inf)
+        spanner_dist[to_full] = shortest_path_tree(spanner_arrays, spanner_arrays.index[source])[0]
+        reachable = np.isfinite(full_dist) & (full_dist > 0)
+        disconnected += int(np.count_nonzero(reachable & ~np.isfinite(spanner_dist)))
+        valid = reachable & np.isfinite(spanner_dist)
+        ratios.append(spanner_dist[valid] / full_dist[valid])
+
+    ratios = np.concatenate(ratios) if ratios else np.empty(0)
+    return {
+        'max_stretch': float(ratios.max()) if ratios.size else 1.0,
+        'mean_stretch': float(ratios.mean()) if ratios.size else 1.0,
+        'pairs': int(ratios.size),
+        'disconnected': disconnected,
+        'edges_full': full_graph.number_of_edges(),
+        'edges_spanner': spanner.number_of_edges()
+    }
@@ -0,0 +1,172 @@
+import heapq
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from app.utils.graph_arrays import get_graph_arrays
+
+
+def shortest_path_tree(arrays, source):
+    """
+    Dijkstra completo a partir de `source` sobre a estrutura CSR.
+    Em caso de empate na distância, expande primeiro a cidade menos populosa.
+
+    Args:
+        arrays: GraphArrays do grafo
+        source: índice interno da origem
+
+    Returns:
+        dist: array float64 com a distância até cada nó (inf se inalcançável)
+        parent: array int32 com o predecessor de cada nó (-1 para a raiz e inalcançáveis)
+    """
+    indptr, indices, weights, populations = arrays.adjacency_lists()
+    n = arrays.n
+
+    dist = [float('inf')] * n
+    parent = [-1] * n
+    settled = [False] * n
+    dist[source] = 0.0
+    counter = 0
+    heap = [(0.0, populations[source], counter, source)]
+    while heap:
+        d, _, _, node = heapq.heappop(heap)
+        if settled[node]:
+            continue
+        settled[node] = True
+        for pos in range(indptr[node], indptr[node + 1]):
+            neighbor = indices[pos]
+            alt = d + weights[pos]
+            if alt < dist[neighbor]:
+                dist[neighbor] = alt
+                parent[neighbor] = node
+                counter += 1
+                heapq.heappush(heap, (alt, populations[neighbor], counter, neighbor))
+
+    return np.array(dist, dtype=np.float64), np.array(parent, dtype=np.int32)
+
+
+def walk_parents(parent, node):
+    """Sobe pela árvore de predecessores a partir de `node` até a raiz (lista de índices)."""
+    path = [node]
+    while parent[node] >= 0:
+        node = int(parent[node])
+        path.append(node)
+    return path
+
+
+class ShortestPathTreeCache:
+    """
+    Cache LRU de árvores de caminhos mínimos (distâncias e predecessores) por origem.
+
+    As entradas são indexadas por (fingerprint do grafo, origem), de modo que grafos
+    reconstruídos com o mesmo conteúdo reaproveitam as árvores. A remoção ocorre pelo
+    critério LRU quando o número de entradas ou o total de bytes excede o limite.
+    Como o grafo é não direcionado, uma árvore enraizada em X responde tanto consultas
+    partindo de X quanto consultas com destino X.
+    """
+
+    def __init__(self, max_entries=256, max_bytes=64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes_used = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, fingerprint, source):
+        """Retorna (dist, parent) da árvore em cache, ou None."""
+        with self._lock:
+            entry = self._entries.get((fingerprint, source))
+            if entry is not None:
+                self._entries.move_to_end((fingerprint, source))
+            return entry
+
+    def put(self, fingerprint, source, dist, parent):
+        """Armazena uma árvore e aplica a política de remoção LRU por contagem e bytes."""
+        size = dist.nbytes + parent.nbytes
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            key = (fingerprint, source)
+            if key in self._entries:
+                old_dist, old_parent = self._entries.pop(key)
+                self.bytes_used -= old_dist.nbytes + old_parent.nbytes
+            self._entries[key] = (dist, parent)
+            self.bytes_used += size
+            while len(self._entries) > self.max_entries or self.bytes_used > self.max_bytes:
+                _, (old_dist, old_parent) = self._entries.popitem(last=False)
+                self.bytes_used -= old_dist.nbytes + old_parent.nbytes
+                self.evictions += 1
+
+    def tree(self, arrays, source):
+        """Árvore enraizada em `source` (índice interno), calculando-a se necessário."""
+        entry = self.get(arrays.fingerprint, source)
+        if entry is None:
+            entry = shortest_path_tree(arrays, source)
+            self.put(arrays.fingerprint, source, *entry)
+        return entry
+
+    def query(self, graph, start, end):
+        """
+        Caminho mínimo entre start e end usando árvores em cache.
+
+        Procura primeiro uma árvore enraizada em start e depois uma enraizada em end
+        (o caminho é percorrido de trás para frente). Sem nenhuma das duas, calcula
+        e armazena a árvore de start.
+
+        Returns:
+            path: lista de nós (ids originais) ou None
+            total_dist: distância do caminho (inf se não existir)
+            hit: True se a consulta foi respondida pelo cache
+        """
+        arrays = get_graph_arrays(graph)
+        s, t = arrays.index[start], arrays.index[end]
+
+        entry = self.get(arrays.fingerprint, s)
+        reverse = False
+        if entry is None:
+            entry = self.get(arrays.fingerprint, t)
+            reverse = entry is not None
+        hit = entry is not None
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if entry is None:
+            entry = shortest_path_tree(arrays, s)
+            self.put(arrays.fingerprint, s, *entry)
+
+        dist, parent = entry
+        target = s if reverse else t
+        if not np.isfinite(dist[target]):
+            return None, float('inf'), hit
+        path = walk_parents(parent, target)
+        if not reverse:
+            path.reverse()
+        return arrays.path_to_nodes(path), float(dist[target]), hit
+
+    def stats(self):
+        """Métricas do cache: entradas, memória (bytes), acertos, falhas, taxa de acerto e remoções."""
+        total = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'bytes': self.bytes_used,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'evictions': self.evictions
+        }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes_used = 0
+            self.hits = self.misses = self.evictions = 0
+
+
+# Cache global de árvores compartilhado pelas consultas da aplicação
+spt_cache = ShortestPathTreeCache()
@@ -0,0 +1,300 @@
+import hashlib
+import heapq
+import threading
+import time
+
+import numpy as np
+
+from app.utils.graph_arrays import get_graph_arrays
+
+
+class StateCell:
+    """
+    Pré-processamento de um estado (célula) do roteamento em dois níveis.
+
+    Guarda, para cada cidade de fronteira do estado (com aresta para outro estado),
+    a árvore de caminhos mínimos restrita às cidades do próprio estado. Tudo é
+    indexado pelos ids originais, para que a célula possa ser reaproveitada em um
+    grafo reconstruído cujo estado não mudou.
+
+    Attributes:
+        state: nome do estado
+        fingerprint: hash das cidades do estado e de todas as suas arestas
+        nodes: ids das cidades do estado (ordem local)
+        border: ids das cidades de fronteira
+        distances: matriz (fronteira x fronteira) de distâncias dentro do estado
+        parents: matriz (fronteira x cidades) de predecessores locais (-1 na raiz)
+        shortcuts: matriz booleana (fronteira x fronteira) dos atalhos necessários
+    """
+
+    def __init__(self, state, fingerprint, nodes, border, distances, parents, shortcuts):
+        self.state = state
+        self.fingerprint = fingerprint
+        self.nodes = nodes
+        self.border = border
+        self.distances = distances
+        self.parents = parents
+        self.shortcuts = shortcuts
+        self._local = {node: i for i, node in enumerate(nodes)}
+        self._border_row = {node: i for i, node in enumerate(border)}
+
+    def unpack(self, source, target):
+        """Caminho (ids) dentro do estado entre duas cidades de fronteira."""
+        parent = self.parents[self._border_row[source]]
+        node = self._local[target]
+        path = [node]
+        while parent[node] >= 0:
+            node = int(parent[node])
+            path.append(node)
+        path.reverse()
+        return [self.nodes[i] for i in path]
+
+
+def _state_members(arrays):
+    """Dicionário estado -> índices globais das cidades do estado (ordem crescente)."""
+    members = {}
+    for i, state in enumerate(arrays.state.tolist()):
+        members.setdefault(state, []).append(i)
+    return members
+
+
+def cell_fingerprint(arrays, members):
+    """
+    Hash de um estado: ids e populações das cidades e todas as arestas incidentes
+    (vizinho, estado do vizinho e peso). Só muda se algo no estado ou na sua
+    fronteira mudar.
+    """
+    indptr, indices, weights, populations = arrays.adjacency_lists()
+    nodes, states = arrays.nodes, arrays.state
+    digest = hashlib.sha1()
+    for i in sorted(members, key=lambda i: nodes[i]):
+        neighbors = sorted(
+            (nodes[indices[pos]], states[indices[pos]], weights[pos]) for pos in range(indptr[i], indptr[i + 1])
+        )
+        digest.update(repr((nodes[i], populations[i], neighbors)).encode())
+    return digest.hexdigest()
+
+
+def build_state_cell(arrays, state, members, fingerprint):
+    """
+    Calcula a célula de um estado: Dijkstra restrito ao estado a partir de cada
+    cidade de fronteira (desempate pela menor população, como shortest_path_tree).
+    """
+    indptr, indices, weights, populations = arrays.adjacency_lists()
+    states = arrays.state
+    local = {g: i for i, g in enumerate(members)}
+    border_local = [local[g] for g in members
+                    if any(states[indices[pos]] != state for pos in range(indptr[g], indptr[g + 1]))]
+
+    # Adjacência local (apenas arestas internas ao estado)
+    adjacency = [[(local[indices[pos]], weights[pos]) for pos in range(indptr[g], indptr[g + 1])
+                  if indices[pos] in local] for g in members]
+    local_population = [populations[g] for g in members]
+
+    n = len(members)
+    distances = np.full((len(border_local), len(border_local)), np.inf)
+    parents = np.full((len(border_local), n), -1, dtype=np.int32)
+    for row, source in enumerate(border_local):
+        dist = [float('inf')] * n
+        parent = [-1] * n
+        settled = [False] * n
+        dist[source] = 0.0
+        counter = 0
+        heap = [(0.0, local_population[source], counter, source)]
+        while heap:
+            d, _, _, node = heapq.heappop(heap)
+            if settled[node]:
+                continue
+            settled[node] = True
+            for neighbor, weight in adjacency[node]:
+                alt = d + weight
+                if alt < dist[neighbor]:
+                    dist[neighbor] = alt
+                    parent[neighbor] = node
+                    counter += 1
+                    heapq.heappush(heap, (alt, local_population[neighbor], counter, neighbor))
+        distances[row] = [dist[b] for b in border_local]
+        parents[row] = parent
+
+    # Um atalho a -> b é dispensável se o caminho interno passa por outra cidade de
+    # fronteira c: os atalhos a -> c e c -> b já o cobrem (com custo nunca maior)
+    is_border = np.zeros(n, dtype=bool)
+    is_border[border_local] = True
+    shortcuts = np.isfinite(distances)
+    np.fill_diagonal(shortcuts, False)
+    for row, source in enumerate(border_local):
+        parent = parents[row]
+        for col, target in enumerate(border_local):
+            if not shortcuts[row, col]:
+                continue
+            node = parent[target]
+            while node != source:
+                if is_border[node]:
+                    shortcuts[row, col] = False
+                    break
+                node = parent[node]
+
+    node_ids = [arrays.nodes[g] for g in members]
+    return StateCell(state, fingerprint, node_ids, [node_ids[b] for b in border_local],
+                     distances, parents, shortcuts)
+
+
+class StateOverlay:
+    """
+    Roteamento em dois níveis pelos estados (células) das cidades.
+
+    O pré-processamento calcula, por estado, as distâncias entre as suas cidades de
+    fronteira sem sair do estado. O grafo de sobreposição tem como nós as cidades de
+    fronteira, com as arestas entre estados (pesos originais) e as distâncias
+    internas de cada estado. Uma consulta percorre o estado de origem e o de destino
+    por completo e os demais apenas pela sobreposição, o que preserva exatamente as
+    distâncias mínimas: todo trecho de rota dentro de outro estado liga duas
+    cidades de fronteira e é substituído pela distância interna, nunca maior.
+
+    O pré-processamento é incremental: as células são guardadas por estado junto com
+    o hash do seu conteúdo, e apenas os estados cujo hash mudou são recalculados.
+    """
+
+    def __init__(self):
+        self._cells = {}
+        self._prepared = None
+        self._lock = threading.Lock()
+        self.cells_built = 0
+        self.cells_reused = 0
+        self.last_preprocess_ms = 0.0
+
+    def prepare(self, graph):
+        """
+        Atualiza as células para o grafo e monta o grafo de sobreposição.
+
+        Returns:
+            GraphArrays do grafo
+        """
+        arrays = get_graph_arrays(graph)
+        with self._lock:
+            if self._prepared is not None and self._prepared[0] == arrays.fingerprint:
+                return arrays
+            begin = time.perf_counter()
+            members = _state_members(arrays)
+            cells = {}
+            for state, state_members in members.items():
+                fingerprint = cell_fingerprint(arrays, state_members)
+                cell = self._cells.get(state)
+                if cell is not None and cell.fingerprint == fingerprint:
+                    self.cells_reused += 1
+                else:
+                    cell = build_state_cell(arrays, state, state_members, fingerprint)
+                    self.cells_built += 1
+                cells[state] = cell
+            self._cells = cells
+            self._prepared = (arrays.fingerprint, self._build_overlay(arrays))
+            self.last_preprocess_ms = (time.perf_counter() - begin) * 1000
+        return arrays
+
+    def is_prepared(self, graph):
+        """True se a sobreposição já está montada para este grafo (sem pré-processar)."""
+        prepared = self._prepared
+        return prepared is not None and prepared[0] == get_graph_arrays(graph).fingerprint
+
+    def _build_overlay(self, arrays):
+        """
+        Movimentos de cada cidade de fronteira no grafo de sobreposição (índices
+        globais): arestas para outros estados e atalhos internos do seu estado, como
+        tuplas (vizinho, peso, estado do atalho ou None).
+        """
+        indptr, indices, weights, _ = arrays.adjacency_lists()
+        states = arrays.state
+        moves = {}
+        for cell in self._cells.values():
+            border = [arrays.index[node] for node in cell.border]
+            for row, u in enumerate(border):
+                crossing = [(indices[pos], weights[pos], None) for pos in range(indptr[u], indptr[u + 1])
+                            if states[indices[pos]] != cell.state]
+                inner = [(border[col], float(cell.distances[row, col]), cell.state)
+                         for col in np.flatnonzero(cell.shortcuts[row]).tolist()]
+                moves[u] = crossing + inner
+        return moves
+
+    def query(self, graph, start, end):
+        """
+        Caminho mínimo entre start e end: busca local no estado de origem, busca na
+        sobreposição e busca local no estado de destino (uma única busca de Dijkstra
+        sobre essa união). Os atalhos de estado são expandidos no caminho final.
+
+        Returns:
+            path: lista de nós (ids originais) ou None
+            total_dist: distância do caminho (inf se não existir)
+            settled: número de nós estabilizados na busca
+        """
+        arrays = self.prepare(graph)
+        overlay_moves = self._prepared[1]
+        indptr, indices, weights, populations = arrays.adjacency_lists()
+        states = arrays.state
+        s, t = arrays.index[start], arrays.index[end]
+        local_states = {states[s], states[t]}
+
+        dist = {s: 0.0}
+        parent = {s: (None, None)}
+        settled = set()
+        counter = 0
+        heap = [(0.0, populations[s], counter, s)]
+        while heap:
+            d, _, _, node = heapq.heappop(heap)
+            if node in settled:
+                continue
+            settled.add(node)
+            if node == t:
+                break
+            if states[node] in local_states:
+                # Estado de origem ou destino: todas as arestas originais
+                moves = [(indices[pos], weights[pos], None) for pos in range(indptr[node], indptr[node + 1])]
+            else:
+                # Demais estados: apenas a sobreposição (só cidades de fronteira são alcançadas)
+                moves = overlay_moves.get(node, ())
+            for neighbor, weight, via in moves:
+                alt = d + weight
+                if alt < dist.get(neighbor, float('inf')):
+                    dist[neighbor] = alt
+                    parent[neighbor] = (node, via)
+                    counter += 1
+                    heapq.heappush(heap, (alt, populations[neighbor], counter, neighbor))
+
+        if t not in settled:
+            return None, float('inf'), len(settled)
+
+        # Reconstrói o caminho expandindo os atalhos
+        path = [arrays.nodes[t]]
+        node = t
+        while parent[node][0] is not None:
+            previous, via = parent[node]
+            if via is None:
+                path.append(arrays.nodes[previous])
+            else:
+                inner = self._cells[via].unpack(arrays.nodes[previous], arrays.nodes[node])
+                path.extend(reversed(inner[:-1]))
+            node = previous
+        path.reverse()
+        path_indices = [arrays.index[n] for n in path]
+        return path, arrays.path_weight(path_indices), len(settled)
+
+    def stats(self):
+        """Métricas do pré-processamento: estados, cidades de fronteira, atalhos e reaproveitamento."""
+        return {
+            'states': len(self._cells),
+            'border_nodes': sum(len(cell.border) for cell in self._cells.values()),
+            'shortcuts': int(sum(np.count_nonzero(cell.shortcuts) for cell in self._cells.values())) // 2,
+            'cells_built': self.cells_built,
+            'cells_reused': self.cells_reused,
+            'preprocess_ms': self.last_preprocess_ms
+        }
+
+    def clear(self):
+        with self._lock:
+            self._cells = {}
+            self._prepared = None
+            self.cells_built = self.cells_reused = 0
+            self.last_preprocess_ms = 0.0
+
+
+# Sobreposição global por estados compartilhada pelas consultas da aplicação
+state_overlay = StateOverlay()
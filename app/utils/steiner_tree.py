@@ -0,0 +1,175 @@
+import heapq
+import time
+
+import numpy as np
+
+from app.utils.graph_arrays import get_graph_arrays
+
+
+def largest_city_per_state(cities_df):
+    """Ids da cidade mais populosa de cada estado (conjunto de terminais de referência)."""
+    rows = cities_df.loc[cities_df.groupby('state')['population'].idxmax()]
+    return rows['city_id'].tolist()
+
+
+def voronoi_regions(arrays, sources):
+    """
+    Dijkstra com várias origens simultâneas: cada nó fica na região (célula de
+    Voronoi da rede) da origem mais próxima. Em caso de empate na distância,
+    expande primeiro a cidade menos populosa, como shortest_path_tree.
+
+    Args:
+        arrays: GraphArrays do grafo
+        sources: índices internos das origens
+
+    Returns:
+        dist: array float64 com a distância até a origem mais próxima (inf se inalcançável)
+        base: array int64 com a origem mais próxima de cada nó (-1 se inalcançável)
+        parent: array int64 com o predecessor na floresta de caminhos mínimos (-1 nas origens)
+    """
+    indptr, indices, weights, populations = arrays.adjacency_lists()
+    n = arrays.n
+    dist = [float('inf')] * n
+    base = [-1] * n
+    parent = [-1] * n
+    settled = [False] * n
+    heap = []
+    for counter, source in enumerate(sources):
+        dist[source] = 0.0
+        base[source] = source
+        heap.append((0.0, populations[source], counter, source))
+    heapq.heapify(heap)
+    counter = len(heap)
+    while heap:
+        d, _, _, node = heapq.heappop(heap)
+        if settled[node]:
+            continue
+        settled[node] = True
+        for pos in range(indptr[node], indptr[node + 1]):
+            neighbor = indices[pos]
+            alt = d + weights[pos]
+            if alt < dist[neighbor]:
+                dist[neighbor] = alt
+                base[neighbor] = base[node]
+                parent[neighbor] = node
+                counter += 1
+                heapq.heappush(heap, (alt, populations[neighbor], counter, neighbor))
+    return (np.array(dist, dtype=np.float64), np.array(base, dtype=np.int64),
+            np.array(parent, dtype=np.int64))
+
+
+def _kruskal(n, first, second, costs):
+    """Posições (em ordem crescente de custo) das arestas de uma floresta geradora mínima."""
+    root = list(range(n))
+
+    def find(x):
+        while root[x] != x:
+            root[x] = root[root[x]]
+            x = root[x]
+        return x
+
+    chosen = []
+    for pos in np.argsort(costs, kind='stable').tolist():
+        ru, rv = find(int(first[pos])), find(int(second[pos]))
+        if ru != rv:
+            root[ru] = rv
+            chosen.append(pos)
+    return chosen
+
+
+def steiner_tree(graph, terminals):
+    """
+    Árvore de Steiner aproximada (algoritmo de Mehlhorn, fator 2(1 - 1/t)) ligando
+    as cidades `terminals` pelo grafo.
+
+    Etapas (tempos em ms no resultado):
+        'voronoi': um único Dijkstra com todos os terminais como origens
+        'bridges': para cada aresta (u, v) entre regiões diferentes, o custo
+            dist(u) + w + dist(v) liga os terminais das duas regiões; fica o menor
+            por par de terminais (vetorizado sobre a estrutura CSR)
+        'mst': árvore geradora mínima desse grafo de terminais (mesmo peso que a
+            do fecho métrico, sem calcular as distâncias entre todos os pares)
+        'expand': cada ligação vira o caminho real terminal -> u -> v -> terminal
+        'prune': árvore geradora mínima do subgrafo obtido e remoção das folhas
+            que não são terminais
+
+    Args:
+        graph: Grafo NetworkX
+        terminals: cidades a conectar (ids originais; repetições são ignoradas)
+
+    Returns:
+        Dicionário com 'edges' (lista de pares (u, v) de ids originais), 'cost',
+        'terminals', 'steiner_nodes' (cidades intermediárias usadas), 'components'
+        (componentes em que os terminais ficaram; 1 se todos estão conectados) e
+        'timings'
+    """
+    arrays = get_graph_arrays(graph)
+    points = list(dict.fromkeys(arrays.index[node] for node in terminals))
+    timings = {}
+    result = {'edges': [], 'cost': 0.0, 'terminals': arrays.path_to_nodes(points), 'steiner_nodes': [],
+              'components': len(points), 'timings': timings}
+    if not points:
+        result['components'] = 0
+        return result
+
+    stage = time.perf_counter()
+    dist, base, parent = voronoi_regions(arrays, points)
+    timings['voronoi'] = (time.perf_counter() - stage) * 1000
+
+    stage = time.perf_counter()
+    sources, targets = arrays.edge_sources(), arrays.indices
+    crossing = (base[sources] != base[targets]) & (base[sources] >= 0) & (base[targets] >= 0)
+    sources, targets = sources[crossing], targets[crossing]
+    costs = dist[sources] + arrays.weights[crossing] + dist[targets]
+    low = np.minimum(base[sources], base[targets])
+    high = np.maximum(base[sources], base[targets])
+    order = np.lexsort((costs, high, low))
+    low, high = low[order], high[order]
+    first_of_pair = np.ones(len(order), dtype=bool)
+    first_of_pair[1:] = (low[1:] != low[:-1]) | (high[1:] != high[:-1])
+    bridges = order[first_of_pair]
+    timings['bridges'] = (time.perf_counter() - stage) * 1000
+
+    stage = time.perf_counter()
+    chosen = bridges[_kruskal(arrays.n, base[sources[bridges]], base[targets[bridges]], costs[bridges])]
+    timings['mst'] = (time.perf_counter() - stage) * 1000
+
+    stage = time.perf_counter()
+    edges = set()
+    for u, v in zip(sources[chosen].tolist(), targets[chosen].tolist()):
+        edges.add((min(u, v), max(u, v)))
+        for node in (u, v):
+            while parent[node] >= 0:
+                edges.add((min(node, int(parent[node])), max(node, int(parent[node]))))
+                node = int(parent[node])
+    timings['expand'] = (time.perf_counter() - stage) * 1000
+
+    stage = time.perf_counter()
+    edges = sorted(edges)
+    first = np.array([u for u, _ in edges], dtype=np.int64)
+    second = np.array([v for _, v in edges], dtype=np.int64)
+    weights = np.array([arrays.weights[arrays.edge_position(u, v)] for u, v in edges], dtype=np.float64)
+    tree = [edges[pos] for pos in _kruskal(arrays.n, first, second, weights)]
+    tree_weight = dict(zip(edges, weights.tolist()))
+
+    neighbors = {}
+    for u, v in tree:
+        neighbors.setdefault(u, set()).add(v)
+        neighbors.setdefault(v, set()).add(u)
+    required = set(points)
+    leaves = [node for node, adjacent in neighbors.items() if len(adjacent) == 1 and node not in required]
+    while leaves:
+        leaf = leaves.pop()
+        for other in neighbors.pop(leaf):
+            neighbors[other].discard(leaf)
+            if len(neighbors[other]) == 1 and other not in required:
+                leaves.append(other)
+    tree = [(u, v) for u, v in tree if v in neighbors.get(u, ())]
+    timings['prune'] = (time.perf_counter() - stage) * 1000
+
+    result['edges'] = [(arrays.nodes[u], arrays.nodes[v]) for u, v in tree]
+    result['cost'] = float(sum(tree_weight[edge] for edge in tree))
+    result['steiner_nodes'] = arrays.path_to_nodes(sorted(set(neighbors) - required))
+    # Floresta: componentes = vértices - arestas (terminais isolados contam como componentes)
+    result['components'] = len(set(neighbors) | required) - len(tree)
+    return result
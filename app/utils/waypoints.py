@@ -0,0 +1,199 @@
+import time
+
+import numpy as np
+
+from app.utils.graph_arrays import get_graph_arrays
+from app.utils.sssp_cache import spt_cache, walk_parents
+
+# Acima deste número de paradas intermediárias a ordem é obtida por 2-opt
+# (Held-Karp usa O(2^m · m) de memória e O(2^m · m²) operações)
+EXACT_LIMIT = 12
+
+
+def leg_matrix(arrays, points, cache=spt_cache):
+    """
+    Matriz de distâncias de rede entre os pontos da rota.
+
+    Uma árvore de caminhos mínimos por ponto (exceto o último, obtido por simetria
+    do grafo não direcionado) responde de uma vez todas as distâncias a partir
+    dele; as árvores ficam no cache e são reaproveitadas na montagem dos trechos.
+
+    Args:
+        arrays: GraphArrays do grafo
+        points: índices internos [origem, paradas..., destino]
+        cache: ShortestPathTreeCache usado para calcular/guardar as árvores
+
+    Returns:
+        matrix: array (p, p) float64 (inf entre pontos desconectados)
+        trees: dicionário índice -> (dist, parent) das árvores calculadas
+    """
+    p = len(points)
+    targets = np.asarray(points, dtype=np.int64)
+    matrix = np.zeros((p, p), dtype=np.float64)
+    trees = {}
+    for row, point in enumerate(points[:-1]):
+        trees[point] = cache.tree(arrays, point)
+        matrix[row] = trees[point][0][targets]
+    matrix[-1] = matrix[:, -1]
+    matrix[-1, -1] = 0.0
+    return matrix, trees
+
+
+def held_karp(matrix):
+    """
+    Ordem ótima de visita das paradas (programação dinâmica de Held-Karp).
+
+    O caminho parte do ponto 0, visita todos os pontos 1..m e termina no ponto
+    m + 1. Os subconjuntos são processados por camadas de mesma cardinalidade;
+    em cada camada, para cada última parada j, o custo de todos os subconjuntos
+    que contêm j é calculado de uma vez com NumPy.
+
+    Args:
+        matrix: array (m + 2, m + 2) com as distâncias entre os pontos
+
+    Returns:
+        order: índices das paradas (1..m) na ordem de visita
+        cost: custo total (inf se não houver rota que visite todas)
+    """
+    m = len(matrix) - 2
+    if m == 0:
+        return [], float(matrix[0, 1])
+    stops = matrix[1:m + 1, 1:m + 1]
+    full = (1 << m) - 1
+    dp = np.full((1 << m, m), np.inf)
+    parent = np.full((1 << m, m), -1, dtype=np.int16)
+    for j in range(m):
+        dp[1 << j, j] = matrix[0, j + 1]
+
+    masks = np.arange(1 << m)
+    popcount = np.zeros(1 << m, dtype=np.int8)
+    for j in range(m):
+        popcount += ((masks >> j) & 1).astype(np.int8)
+
+    for size in range(2, m + 1):
+        layer = masks[popcount == size]
+        for j in range(m):
+            with_j = layer[(layer >> j) & 1 == 1]
+            previous = with_j ^ (1 << j)
+            candidates = dp[previous] + stops[:, j]
+            best = np.argmin(candidates, axis=1)
+            dp[with_j, j] = candidates[np.arange(len(with_j)), best]
+            parent[with_j, j] = best
+
+    closing = dp[full] + matrix[1:m + 1, m + 1]
+    last = int(np.argmin(closing))
+    cost = float(closing[last])
+    if not np.isfinite(cost):
+        return None, float('inf')
+
+    order = []
+    mask = full
+    while last >= 0:
+        order.append(last + 1)
+        previous = int(parent[mask, last])
+        mask ^= 1 << last
+        last = previous
+    order.reverse()
+    return order, cost
+
+
+def two_opt(matrix, order=None):
+    """
+    Ordem de visita aproximada: vizinho mais próximo seguido de melhorias 2-opt.
+
+    A cada passo, o ganho de inverter cada trecho seq[i..k] (com origem e destino
+    fixos) é avaliado de uma vez com NumPy e a melhor inversão é aplicada, até
+    nenhuma inversão reduzir o custo.
+
+    Args:
+        matrix: array (m + 2, m + 2) com as distâncias entre os pontos
+        order: ordem inicial das paradas (1..m); None usa o vizinho mais próximo
+
+    Returns:
+        order: índices das paradas (1..m) na ordem de visita
+        cost: custo total (inf se não houver rota que visite todas)
+    """
+    m = len(matrix) - 2
+    if order is None:
+        order, current, remaining = [], 0, set(range(1, m + 1))
+        while remaining:
+            current = min(remaining, key=lambda j: matrix[current, j])
+            order.append(current)
+            remaining.remove(current)
+
+    seq = np.array([0] + list(order) + [m + 1], dtype=np.int64)
+    finite = np.where(np.isfinite(matrix), matrix, 1e18)
+    i, k = np.triu_indices(len(seq) - 1, k=1)
+    keep = i >= 1
+    i, k = i[keep], k[keep]
+    while len(i):
+        a, b, c, d = seq[i - 1], seq[i], seq[k], seq[k + 1]
+        delta = finite[a, c] + finite[b, d] - finite[a, b] - finite[c, d]
+        best = int(np.argmin(delta))
+        if delta[best] >= -1e-9:
+            break
+        seq[i[best]:k[best] + 1] = seq[i[best]:k[best] + 1][::-1].copy()
+
+    cost = float(matrix[seq[:-1], seq[1:]].sum())
+    if not np.isfinite(cost):
+        return None, float('inf')
+    return seq[1:-1].tolist(), cost
+
+
+def plan_route(graph, start, end, waypoints, exact_limit=EXACT_LIMIT, cache=spt_cache):
+    """
+    Rota de start a end passando por todas as paradas, na melhor ordem de visita.
+
+    Etapas (tempos em ms no resultado):
+        'matrix': distâncias entre os pontos (uma árvore por ponto, via cache)
+        'order': ordem de visita (Held-Karp até exact_limit paradas, senão 2-opt)
+        'stitch': junção dos trechos a partir das árvores já calculadas
+
+    Args:
+        graph: Grafo NetworkX
+        start: origem
+        end: destino
+        waypoints: paradas intermediárias (repetições, origem e destino são ignorados)
+        exact_limit: máximo de paradas resolvido de forma exata
+        cache: ShortestPathTreeCache das árvores
+
+    Returns:
+        Dicionário com 'path' (None se alguma parada for inalcançável), 'distance',
+        'stops' (paradas na ordem de visita), 'legs' (distância de cada trecho),
+        'exact' (True se a ordem é ótima) e 'timings'
+    """
+    arrays = get_graph_arrays(graph)
+    stops = []
+    for node in waypoints:
+        if node not in (start, end) and node not in stops:
+            stops.append(node)
+    points = [arrays.index[node] for node in [start] + stops + [end]]
+    timings = {}
+
+    stage = time.perf_counter()
+    matrix, trees = leg_matrix(arrays, points, cache=cache)
+    timings['matrix'] = (time.perf_counter() - stage) * 1000
+
+    stage = time.perf_counter()
+    exact = len(stops) <= exact_limit
+    order, cost = held_karp(matrix) if exact else two_opt(matrix)
+    timings['order'] = (time.perf_counter() - stage) * 1000
+
+    result = {'path': None, 'distance': float('inf'), 'stops': [], 'legs': [], 'exact': exact,
+              'timings': timings}
+    if order is None:
+        timings['stitch'] = 0.0
+        return result
+
+    stage = time.perf_counter()
+    sequence = [0] + order + [len(points) - 1]
+    path = [points[0]]
+    for a, b in zip(sequence[:-1], sequence[1:]):
+        leg = walk_parents(trees[points[a]][1], points[b])
+        leg.reverse()
+        path.extend(leg[1:])
+        result['legs'].append(float(matrix[a, b]))
+    timings['stitch'] = (time.perf_counter() - stage) * 1000
+
+    result.update(path=arrays.path_to_nodes(path), distance=cost, stops=[stops[j - 1] for j in order])
+    return result